@@ -4,14 +4,56 @@ Backend-Frontend Sync Verification Script
 Runs a small set of connectivity and functionality checks against the backend.
 """
 
+from collections import Counter
 from typing import Optional, Dict
 import json
+import os
+import socket
+import sys
 from pathlib import Path
+from urllib.parse import urlsplit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # optional: faster JSON parsing/pretty-printing
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps_indent(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:  # pragma: no cover - stdlib fallback
+    _loads = json.loads
+
+    def _dumps_indent(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+
+try:  # optional: stream multipart bodies straight off disk
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:  # pragma: no cover - fall back to requests' buffered multipart
+    MultipartEncoder = None
 
 
 # Configuration
 BACKEND_URL = "http://localhost:5000"
+AUDIO_EXTS = {".mp3", ".wav", ".flac"}
+
+# Shared keep-alive session so every check reuses the same connection.
+# Idempotent methods retry transient gateway errors; POSTs are never retried
+# so uploads/processing requests are not duplicated.
+SESSION = requests.Session()
+_RETRY = Retry(
+    total=2,
+    backoff_factor=0.2,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=frozenset(["GET", "OPTIONS"]),
+)
+_ADAPTER = HTTPAdapter(max_retries=_RETRY, pool_connections=4, pool_maxsize=16)
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
 
 
 class Colors:
@@ -22,41 +64,49 @@ class Colors:
     END = "\033[0m"
 
 
+# Prefixes/suffixes built once; each helper is a single write
+_RULE = "=" * 60
+_HEADER_OPEN = "\n" + Colors.BLUE + _RULE + "\n  "
+_HEADER_CLOSE = "\n" + _RULE + Colors.END + "\n\n"
+_OK_PREFIX = Colors.GREEN + "✓ "
+_ERR_PREFIX = Colors.RED + "✗ "
+_WARN_PREFIX = Colors.YELLOW + "⚠ "
+_END = Colors.END + "\n"
+
+
 def print_header(text: str) -> None:
-    print("\n" + Colors.BLUE + "=" * 60)
-    print("  " + text)
-    print("" + "=" * 60 + Colors.END + "\n")
+    sys.stdout.write(f"{_HEADER_OPEN}{text}{_HEADER_CLOSE}")
 
 
 def print_success(text: str) -> None:
-    print(Colors.GREEN + "✓ " + str(text) + Colors.END)
+    sys.stdout.write(f"{_OK_PREFIX}{text}{_END}")
 
 
 def print_error(text: str) -> None:
-    print(Colors.RED + "✗ " + str(text) + Colors.END)
+    sys.stdout.write(f"{_ERR_PREFIX}{text}{_END}")
 
 
 def print_warning(text: str) -> None:
-    print(Colors.YELLOW + "⚠ " + str(text) + Colors.END)
+    sys.stdout.write(f"{_WARN_PREFIX}{text}{_END}")
 
 
 def print_info(text: str) -> None:
-    print("  " + str(text))
+    sys.stdout.write(f"  {text}\n")
 
 
 def test_health_check() -> bool:
     print_header("Test 1: Health Check")
 
     try:
-        response = requests.get(f"{BACKEND_URL}/health", timeout=5)
+        response = SESSION.get(f"{BACKEND_URL}/health", timeout=5)
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             print_success("Health endpoint responded with 200")
             print_info("Server version/info: " + str(data.get("version", "N/A")))
             return True
         print_error("Health endpoint returned {}".format(response.status_code))
         return False
-    except requests.exceptions.RequestException as exc:
+    except (requests.exceptions.RequestException, ValueError) as exc:
         print_error("Health check failed: {}".format(exc))
         return False
 
@@ -65,9 +115,9 @@ def test_list_models() -> bool:
     print_header("Test 2: List Models")
 
     try:
-        response = requests.get(f"{BACKEND_URL}/models", timeout=5)
+        response = SESSION.get(f"{BACKEND_URL}/models", timeout=5)
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             models = data.get("models", {})
             print_success("Found {} models".format(len(models)))
             for model_name in models:
@@ -75,7 +125,7 @@ def test_list_models() -> bool:
             return True
         print_error("Failed to list models: {}".format(response.status_code))
         return False
-    except requests.exceptions.RequestException as exc:
+    except (requests.exceptions.RequestException, ValueError) as exc:
         print_error("Error listing models: {}".format(exc))
         return False
 
@@ -84,14 +134,16 @@ def find_test_audio() -> Optional[Path]:
     test_paths = [Path("uploads"), Path("test_upload.html").parent]
 
     for path in test_paths:
-        if path.exists():
-            audio_files = (
-                list(path.glob("*.mp3"))
-                + list(path.glob("*.wav"))
-                + list(path.glob("*.flac"))
-            )
-            if audio_files:
-                return audio_files[0]
+        if not path.exists():
+            continue
+        # one directory pass, stop at the first audio file
+        with os.scandir(path) as it:
+            for entry in it:
+                if (
+                    entry.is_file()
+                    and os.path.splitext(entry.name)[1].lower() in AUDIO_EXTS
+                ):
+                    return Path(entry.path)
 
     return None
 
@@ -108,11 +160,20 @@ def test_file_upload() -> Optional[str]:
 
     try:
         with open(audio_file, "rb") as f:
-            files = {"file": f}
-            response = requests.post(f"{BACKEND_URL}/upload", files=files)
+            if MultipartEncoder is not None:
+                encoder = MultipartEncoder(
+                    fields={"file": (audio_file.name, f, "application/octet-stream")}
+                )
+                response = SESSION.post(
+                    f"{BACKEND_URL}/upload",
+                    data=encoder,
+                    headers={"Content-Type": encoder.content_type},
+                )
+            else:
+                response = SESSION.post(f"{BACKEND_URL}/upload", files={"file": f})
 
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             file_id = data.get("file_id")
             print_success("File uploaded successfully")
             print_info("File ID: " + str(file_id))
@@ -120,7 +181,7 @@ def test_file_upload() -> Optional[str]:
         print_error("Upload failed: {}".format(response.status_code))
         print_info("Response: {}".format(response.text))
         return None
-    except (requests.exceptions.RequestException, OSError) as exc:
+    except (requests.exceptions.RequestException, OSError, ValueError) as exc:
         print_error("Upload error: {}".format(exc))
         return None
 
@@ -135,12 +196,12 @@ def test_pitch_analysis(file_id: str) -> bool:
 
     try:
         payload = {"model_variant": "enhanced_chroma"}
-        response = requests.post(
+        response = SESSION.post(
             f"{BACKEND_URL}/process/pitch_analysis/{file_id}", json=payload
         )
 
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             result = data.get("result", {})
             print_success("Pitch analysis completed")
             print_info("Detected Key: {}".format(result.get("detected_key", "N/A")))
@@ -149,7 +210,7 @@ def test_pitch_analysis(file_id: str) -> bool:
             return True
         print_error("Pitch analysis failed: {}".format(response.status_code))
         return False
-    except requests.exceptions.RequestException as exc:
+    except (requests.exceptions.RequestException, ValueError) as exc:
         print_error("Pitch analysis error: {}".format(exc))
         return False
 
@@ -169,7 +230,7 @@ def test_other_models(file_id: str) -> None:
 
     for model_name, payload in models_to_test:
         try:
-            response = requests.post(
+            response = SESSION.post(
                 f"{BACKEND_URL}/process/{model_name}/{file_id}", json=payload, timeout=5
             )
 
@@ -193,16 +254,16 @@ def test_status(file_id: str) -> bool:
         return False
 
     try:
-        response = requests.get(f"{BACKEND_URL}/status/{file_id}")
+        response = SESSION.get(f"{BACKEND_URL}/status/{file_id}")
 
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             print_success("Status endpoint working")
-            print_info("Status data: {}".format(json.dumps(data, indent=2)))
+            print_info("Status data: {}".format(_dumps_indent(data)))
             return True
         print_warning("Status endpoint returned {}".format(response.status_code))
         return False
-    except requests.exceptions.RequestException as exc:
+    except (requests.exceptions.RequestException, ValueError) as exc:
         print_error("Status check error: {}".format(exc))
         return False
 
@@ -211,7 +272,7 @@ def test_cors() -> bool:
     print_header("Test 8: CORS Headers")
 
     try:
-        response = requests.options(f"{BACKEND_URL}/process/demucs/test")
+        response = SESSION.options(f"{BACKEND_URL}/health")
 
         cors_headers = {
             "Access-Control-Allow-Origin": response.headers.get("Access-Control-Allow-Origin"),
@@ -233,12 +294,27 @@ def test_cors() -> bool:
         return False
 
 
+def backend_reachable(timeout: float = 1.0) -> bool:
+    """Resolve and TCP-connect to the backend once before any HTTP check."""
+    parts = urlsplit(BACKEND_URL)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        socket.create_connection((parts.hostname, port), timeout=timeout).close()
+        return True
+    except OSError:
+        return False
+
+
 def print_summary(results: Dict) -> None:
     print_header("Summary Report")
 
-    tests_passed = sum(1 for v in results.values() if v is True)
-    tests_failed = sum(1 for v in results.values() if v is False)
-    tests_skipped = sum(1 for v in results.values() if v is None)
+    buckets = Counter(
+        "pass" if v is True else "fail" if v is False else "skip"
+        for v in results.values()
+    )
+    tests_passed = buckets["pass"]
+    tests_failed = buckets["fail"]
+    tests_skipped = buckets["skip"]
 
     print_info("Tests Passed: {}".format(tests_passed))
     print_info("Tests Failed: {}".format(tests_failed))
@@ -267,6 +343,11 @@ def main() -> None:
 
     results: Dict = {}
 
+    # Fail in milliseconds (not a 5s HTTP timeout) when nothing is listening
+    if not backend_reachable():
+        print_error("Backend unreachable at {}. Stopping tests.".format(BACKEND_URL))
+        return
+
     # Run tests
     results["health"] = test_health_check()
     if not results["health"]:
@@ -8,8 +8,13 @@ This script verifies that:
 4. Apps can start without errors
 """
 
+import functools
 import importlib
+import io
+import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Colors for output
@@ -18,17 +23,75 @@ RED = '\033[91m'
 BLUE = '\033[94m'
 RESET = '\033[0m'
 
+# Prefixes/suffixes built once; each helper is a single write
+_OK_PREFIX = GREEN + "✅ "
+_ERR_PREFIX = RED + "❌ "
+_INFO_PREFIX = BLUE + "ℹ️  "
+_END = RESET + "\n"
+
+PYTEST_ARGS = ["tests/test_hooks.py", "tests/test_websocket_hooks.py"]
+
+
+def _run_pytest(*extra_args):
+    """Run pytest in a child interpreter so plugin/module state stays out of ours."""
+    cmd = [sys.executable, "-m", "pytest", *PYTEST_ARGS, *extra_args]
+    return subprocess.run(cmd).returncode
+
+
+class _ThreadBufferedStdout:
+    """stdout proxy that captures writes per worker thread.
+
+    Threads that called ``start()`` write into their own buffer; every other
+    thread writes straight through to the real stream.
+    """
+
+    def __init__(self, real):
+        self._real = real
+        self._local = threading.local()
+
+    def start(self):
+        self._local.buf = io.StringIO()
+
+    def stop(self):
+        buf = self._local.buf
+        del self._local.buf
+        return buf.getvalue()
+
+    def write(self, text):
+        buf = getattr(self._local, "buf", None)
+        return (buf if buf is not None else self._real).write(text)
+
+    def flush(self):
+        self._real.flush()
+
+
+def _run_buffered(check_func, stdout):
+    """Run a check on a worker thread, returning (result, captured output)."""
+    stdout.start()
+    try:
+        result = check_func()
+    finally:
+        output = stdout.stop()
+    return result, output
+
 
 def print_success(msg):
-    print(f"{GREEN}✅ {msg}{RESET}")
+    sys.stdout.write(f"{_OK_PREFIX}{msg}{_END}")
 
 
 def print_error(msg):
-    print(f"{RED}❌ {msg}{RESET}")
+    sys.stdout.write(f"{_ERR_PREFIX}{msg}{_END}")
 
 
 def print_info(msg):
-    print(f"{BLUE}ℹ️  {msg}{RESET}")
+    sys.stdout.write(f"{_INFO_PREFIX}{msg}{_END}")
+
+
+@functools.lru_cache(None)
+def _flask():
+    import flask
+
+    return flask
 
 
 def check_imports():
@@ -93,15 +156,7 @@ def check_tests():
     """Check that tests can be discovered."""
     print_info("Checking test discovery...")
 
-    import pytest
-
-    # Collect tests
-    exit_code = pytest.main([
-        "tests/test_hooks.py",
-        "tests/test_websocket_hooks.py",
-        "--collect-only",
-        "-q",
-    ])
+    exit_code = _run_pytest("--collect-only", "-q")
 
     if exit_code == 0:
         print_success("All tests discovered successfully")
@@ -114,15 +169,7 @@ def run_tests():
     """Run the test suite."""
     print_info("Running test suite...")
 
-    import pytest
-
-    # Run tests
-    exit_code = pytest.main([
-        "tests/test_hooks.py",
-        "tests/test_websocket_hooks.py",
-        "-v",
-        "--tb=short",
-    ])
+    exit_code = _run_pytest("-v", "--tb=short")
 
     if exit_code == 0:
         print_success("All tests passed")
@@ -136,7 +183,7 @@ def verify_shared_utilities():
     print_info("Verifying shared utilities...")
 
     try:
-        from flask import Flask
+        Flask = _flask().Flask
         from server.logging_utils import setup_flask_app_hooks
 
         # Create a test app
@@ -178,16 +225,41 @@ def main():
     print("Hook Implementation Verification")
     print("=" * 60 + "\n")
 
-    checks = [
+    # Independent I/O-bound checks run concurrently; pytest-driven ones after.
+    parallel_checks = [
         ("File Existence", check_files_exist),
         ("Module Imports", check_imports),
         ("Shared Utilities", verify_shared_utilities),
+    ]
+    sequential_checks = [
         ("Test Discovery", check_tests),
         ("Test Suite", run_tests),
     ]
 
     results = {}
-    for name, check_func in checks:
+
+    real_stdout = sys.stdout
+    buffered_stdout = _ThreadBufferedStdout(real_stdout)
+    sys.stdout = buffered_stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(parallel_checks)) as executor:
+            futures = [
+                (name, executor.submit(_run_buffered, check_func, buffered_stdout))
+                for name, check_func in parallel_checks
+            ]
+            outcomes = [(name, future.result()) for name, future in futures]
+    finally:
+        sys.stdout = real_stdout
+
+    # Replay captured output in the original check order
+    for name, (result, output) in outcomes:
+        print(f"\n{'=' * 60}")
+        print(f"Check: {name}")
+        print("=" * 60)
+        sys.stdout.write(output)
+        results[name] = result
+
+    for name, check_func in sequential_checks:
         print(f"\n{'=' * 60}")
         print(f"Check: {name}")
         print("=" * 60)
@@ -2,11 +2,20 @@
 YouTube Download Service for AiMusicSeparator Backend
 Handles YouTube video/audio downloads with format conversion
 """
-import re
 import subprocess
 import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Literal, Any
+from typing import Dict, List, Literal, Any, Optional, Tuple
+
+try:
+    # In-process API: no interpreter spawn or JSON round-trip per call
+    import yt_dlp
+except ImportError:  # pragma: no cover - fall back to the yt-dlp CLI
+    yt_dlp = None
 
 # Quality presets for different formats
 QUALITY_PRESETS = {
@@ -30,6 +39,128 @@ QUALITY_PRESETS = {
     }
 }
 
+# Characters not allowed in filenames (Windows-reserved set) -> '_'
+_INVALID_FILENAME_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Parallel fragment fetches within a single HLS/DASH download
+CONCURRENT_FRAGMENTS = 4
+# Modern Chrome user-agent (2025)
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Fixed part of every yt-dlp download command
+_BASE_CMD = (
+    'yt-dlp',
+    '--no-playlist',
+    '--no-warnings',
+    '--no-check-certificate',
+    '--user-agent', _USER_AGENT,
+    '--concurrent-fragments', str(CONCURRENT_FRAGMENTS),
+)
+
+
+def _format_args(format_type: str, quality: str) -> Tuple[str, ...]:
+    """yt-dlp arguments selecting output format/quality"""
+    if format_type == 'mp4':
+        return (
+            '--format', QUALITY_PRESETS[quality]['mp4'],
+            '--merge-output-format', 'mp4',
+            '--embed-thumbnail',
+            '--add-metadata',
+        )
+    args = (
+        '--extract-audio',
+        '--audio-format', format_type,
+        '--audio-quality', QUALITY_PRESETS[quality][format_type],
+    )
+    if format_type != 'wav':
+        args += ('--embed-thumbnail', '--add-metadata')
+    return args
+
+
+# Precomputed per (format, quality) at import time
+_FORMAT_ARGS = {
+    format_type: {quality: _format_args(format_type, quality) for quality in QUALITY_PRESETS}
+    for format_type in ('mp3', 'wav', 'flac', 'mp4')
+}
+
+# Metadata cache shared by all downloader instances (one is built per request).
+# Entries are (fetched_at, info) and expire after INFO_CACHE_TTL seconds.
+INFO_CACHE_TTL = 600
+INFO_CACHE_MAXSIZE = 1024
+_info_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_info_cache_lock = threading.Lock()
+
+
+def _cache_get_info(url: str) -> Any:
+    with _info_cache_lock:
+        entry = _info_cache.get(url)
+        if entry is None:
+            return None
+        fetched_at, info = entry
+        if time.time() - fetched_at >= INFO_CACHE_TTL:
+            del _info_cache[url]
+            return None
+        _info_cache.move_to_end(url)
+        return info
+
+
+def _cache_put_info(url: str, info: Dict[str, Any]) -> None:
+    with _info_cache_lock:
+        _info_cache[url] = (time.time(), info)
+        _info_cache.move_to_end(url)
+        while len(_info_cache) > INFO_CACHE_MAXSIZE:
+            _info_cache.popitem(last=False)
+
+
+def _drain(stream: Any, sink: Any) -> None:
+    for line in stream:
+        sink.append(line)
+    stream.close()
+
+
+def _run_streaming(
+    cmd: List[str],
+    timeout: float,
+    stdout_lines: Optional[List[str]] = None
+) -> Tuple[int, str]:
+    """
+    Run cmd without buffering its whole output in memory
+
+    stderr is drained on a background thread into a bounded deque (the last
+    100 lines are kept for error messages). stdout is discarded unless a
+    stdout_lines list is given to collect it. Raises TimeoutExpired after
+    killing the process.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE if stdout_lines is not None else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+    )
+    stderr_tail: "deque[str]" = deque(maxlen=100)
+    readers = [threading.Thread(target=_drain, args=(proc.stderr, stderr_tail), daemon=True)]
+    if stdout_lines is not None:
+        readers.append(
+            threading.Thread(target=_drain, args=(proc.stdout, stdout_lines), daemon=True)
+        )
+    for reader in readers:
+        reader.start()
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join(timeout=5)
+    return returncode, ''.join(stderr_tail)
+
 
 class YouTubeDownloader:
     """Handle YouTube downloads with yt-dlp"""
@@ -40,7 +171,7 @@ class YouTubeDownloader:
 
     def _sanitize_filename(self, filename: str) -> str:
         """Remove invalid characters from filename"""
-        return re.sub(r'[<>:"/\\|?*]', '_', filename)
+        return filename.translate(_INVALID_FILENAME_TRANS)
 
     def _get_yt_dlp_command(
         self,
@@ -50,54 +181,114 @@ class YouTubeDownloader:
     ) -> list:
         """Build yt-dlp command with format and quality options, always set a modern user-agent"""
         output_template = str(self.output_dir / '%(title)s.%(ext)s')
-        # Modern Chrome user-agent (2025)
-        user_agent = (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
+        return (
+            list(_BASE_CMD)
+            + ['--output', output_template, url]
+            + list(_FORMAT_ARGS[format_type][quality])
         )
-        base_cmd = [
-            'yt-dlp',
-            url,
-            '--no-playlist',
-            '--output', output_template,
-            '--no-warnings',
-            '--no-check-certificate',
-            '--user-agent', user_agent,
-        ]
-        if format_type == 'mp3':
-            bitrate = QUALITY_PRESETS[quality]['mp3']
-            base_cmd.extend([
-                '--extract-audio',
-                '--audio-format', 'mp3',
-                '--audio-quality', bitrate,
-                '--embed-thumbnail',
-                '--add-metadata',
-            ])
-        elif format_type == 'wav':
-            base_cmd.extend([
-                '--extract-audio',
-                '--audio-format', 'wav',
-                '--audio-quality', '0',
-            ])
-        elif format_type == 'flac':
-            compression = QUALITY_PRESETS[quality]['flac']
-            base_cmd.extend([
-                '--extract-audio',
-                '--audio-format', 'flac',
-                '--audio-quality', compression,
-                '--embed-thumbnail',
-                '--add-metadata',
-            ])
+
+    def _build_ydl_opts(
+        self,
+        format_type: Literal['mp3', 'wav', 'flac', 'mp4'],
+        quality: Literal['high', 'medium', 'low']
+    ) -> Dict[str, Any]:
+        """Build yt_dlp.YoutubeDL options equivalent to _get_yt_dlp_command"""
+        opts: Dict[str, Any] = {
+            'outtmpl': str(self.output_dir / '%(title)s.%(ext)s'),
+            'noplaylist': True,
+            'quiet': True,
+            'no_warnings': True,
+            'nocheckcertificate': True,
+            'http_headers': {'User-Agent': _USER_AGENT},
+            'concurrent_fragment_downloads': CONCURRENT_FRAGMENTS,
+        }
+        postprocessors = []
+        embed_extras = True
+        if format_type in ('mp3', 'wav', 'flac'):
+            opts['format'] = 'bestaudio/best'
+            postprocessors.append({
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': format_type,
+                'preferredquality': QUALITY_PRESETS[quality][format_type],
+            })
+            embed_extras = format_type != 'wav'
         elif format_type == 'mp4':
-            format_string = QUALITY_PRESETS[quality]['mp4']
-            base_cmd.extend([
-                '--format', format_string,
-                '--merge-output-format', 'mp4',
-                '--embed-thumbnail',
-                '--add-metadata',
-            ])
-        return base_cmd
+            opts['format'] = QUALITY_PRESETS[quality]['mp4']
+            opts['merge_output_format'] = 'mp4'
+        if embed_extras:
+            opts['writethumbnail'] = True
+            postprocessors.append({'key': 'FFmpegMetadata', 'add_metadata': True})
+            postprocessors.append({'key': 'EmbedThumbnail', 'already_have_thumbnail': False})
+        opts['postprocessors'] = postprocessors
+        return opts
+
+    @staticmethod
+    def _failure(stderr: str, prefix: str) -> Dict[str, Any]:
+        """Map yt-dlp error output to the result dict returned to callers"""
+        if '403' in stderr or 'Forbidden' in stderr:
+            return {
+                'success': False,
+                'error': (
+                    'YouTube is blocking the download (HTTP 403 Forbidden). '
+                    'Update yt-dlp or try a different video.'
+                )
+            }
+        return {
+            'success': False,
+            'error': f'{prefix}: {stderr}'
+        }
+
+    def _result(
+        self,
+        title: str,
+        file_path: Path,
+        format_type: str,
+        quality: str
+    ) -> Dict[str, Any]:
+        result_dict = {
+            'success': True,
+            'title': title,
+            'filename': file_path.name,
+            'path': str(file_path),
+            'format': format_type,
+        }
+        try:
+            result_dict['quality'] = quality
+            result_dict['size_mb'] = round(file_path.stat().st_size / (1024 * 1024), 2)
+        except Exception:
+            # best-effort, not critical
+            pass
+        return result_dict
+
+    def _final_path(self, ydl: Any, info: Dict[str, Any], format_type: str) -> Path:
+        """Locate the post-processed output file for an extracted info dict"""
+        downloads = info.get('requested_downloads') or []
+        if downloads and downloads[0].get('filepath'):
+            return Path(downloads[0]['filepath'])
+        # Older yt-dlp: prepare_filename gives the pre-conversion name
+        return Path(ydl.prepare_filename(info)).with_suffix(f'.{format_type}')
+
+    def _download_in_process(
+        self,
+        url: str,
+        format_type: Literal['mp3', 'wav', 'flac', 'mp4'],
+        quality: Literal['high', 'medium', 'low']
+    ) -> Dict[str, Any]:
+        opts = self._build_ydl_opts(format_type, quality)
+        try:
+            with yt_dlp.YoutubeDL(opts) as ydl:
+                info = ydl.extract_info(url, download=True)
+                file_path = self._final_path(ydl, info, format_type)
+        except yt_dlp.utils.DownloadError as e:
+            return self._failure(str(e), 'Download failed')
+        _cache_put_info(url, info)
+        if not file_path.exists():
+            return {
+                'success': False,
+                'error': 'Downloaded file not found'
+            }
+        title = self._sanitize_filename(info.get('title', 'Unknown'))
+        return self._result(title, file_path, format_type, quality)
 
     def download(
         self,
@@ -112,100 +303,9 @@ class YouTubeDownloader:
             Dict with 'success', 'title', 'filename', 'path', 'error' keys
         """
         try:
-            # First, get video info (with user-agent)
-            user_agent = (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            )
-            info_cmd = [
-                'yt-dlp',
-                '--dump-json',
-                '--no-playlist',
-                '--user-agent', user_agent,
-                url
-            ]
-            info_result = subprocess.run(
-                info_cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if info_result.returncode != 0:
-                # Special handling for 403 errors
-                if (
-                    '403' in info_result.stderr or
-                    'Forbidden' in info_result.stderr
-                ):
-                    return {
-                        'success': False,
-                        'error': (
-                            'YouTube is blocking the download (HTTP 403 Forbidden). '
-                            'Update yt-dlp or try a different video.'
-                        )
-                    }
-                return {
-                    'success': False,
-                    'error': (
-                        f'Failed to fetch video info: {info_result.stderr}'
-                    )
-                }
-            video_info = json.loads(info_result.stdout)
-            title = self._sanitize_filename(video_info.get('title', 'Unknown'))
-            # Build download command
-            download_cmd = self._get_yt_dlp_command(url, format_type, quality)
-            # Execute download
-            result = subprocess.run(
-                download_cmd,
-                capture_output=True,
-                text=True,
-                timeout=600  # 10 minutes max
-            )
-            if result.returncode != 0:
-                # Special handling for 403 errors
-                if (
-                    '403' in result.stderr or
-                    'Forbidden' in result.stderr
-                ):
-                    return {
-                        'success': False,
-                        'error': (
-                            'YouTube is blocking the download (HTTP 403 Forbidden). '
-                            'Update yt-dlp or try a different video.'
-                        )
-                    }
-                return {
-                    'success': False,
-                    'error': f'Download failed: {result.stderr}'
-                }
-            # Find the downloaded file
-            expected_filename = f"{title}.{format_type}"
-            file_path = self.output_dir / expected_filename
-            if not file_path.exists():
-                # Try to find any recently created file
-                files = list(self.output_dir.glob(f"{title}*"))
-                if files:
-                    file_path = max(files, key=lambda p: p.stat().st_mtime)
-                else:
-                    return {
-                        'success': False,
-                        'error': 'Downloaded file not found'
-                    }
-            result_dict = {
-                'success': True,
-                'title': title,
-                'filename': file_path.name,
-                'path': str(file_path),
-                'format': format_type,
-            }
-            try:
-                result_dict['quality'] = quality
-                result_dict['size_mb'] = round(file_path.stat().st_size / (1024 * 1024), 2)
-            except Exception:
-                # best-effort, not critical
-                pass
-            return result_dict
-
+            if yt_dlp is not None:
+                return self._download_in_process(url, format_type, quality)
+            return self._download_subprocess(url, format_type, quality)
         except subprocess.TimeoutExpired:
             return {
                 'success': False,
@@ -217,30 +317,195 @@ class YouTubeDownloader:
                 'error': f'Unexpected error: {str(e)}'
             }
 
-    def get_video_info(self, url: str) -> Dict[str, Any]:
-        """Get video metadata without downloading"""
+    def download_many(
+        self,
+        urls: List[str],
+        format_type: Literal['mp3', 'wav', 'flac', 'mp4'] = 'mp3',
+        quality: Literal['high', 'medium', 'low'] = 'high'
+    ) -> List[Dict[str, Any]]:
+        """
+        Download several URLs in one yt-dlp session
+
+        The extractor, HTTP session and cookie jar are set up once and reused
+        for every URL instead of paying that cost per download.
+
+        Returns:
+            List of result dicts (same keys as download()). In-process results
+            are in input order; the CLI fallback returns one entry per file
+            written plus a trailing failure entry if yt-dlp exited non-zero.
+        """
+        if not urls:
+            return []
         try:
-            cmd = [
-                'yt-dlp',
-                '--dump-json',
-                '--no-playlist',
-                url
+            if yt_dlp is not None:
+                return self._download_many_in_process(urls, format_type, quality)
+            return self._download_many_subprocess(urls, format_type, quality)
+        except subprocess.TimeoutExpired:
+            return [{
+                'success': False,
+                'error': 'Download timed out (max 10 minutes)'
+            }]
+        except Exception as e:
+            return [{
+                'success': False,
+                'error': f'Unexpected error: {str(e)}'
+            }]
+
+    def download_parallel(
+        self,
+        urls: List[str],
+        format_type: Literal['mp3', 'wav', 'flac', 'mp4'] = 'mp3',
+        quality: Literal['high', 'medium', 'low'] = 'high',
+        max_workers: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        Download URLs concurrently on a thread pool (network-bound)
+
+        Each URL goes through download(), so every result keeps its own
+        timeout and error handling. Results are returned in input order.
+        """
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.download, url, format_type, quality)
+                for url in urls
             ]
+            return [future.result() for future in futures]
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+    def _download_many_in_process(
+        self,
+        urls: List[str],
+        format_type: Literal['mp3', 'wav', 'flac', 'mp4'],
+        quality: Literal['high', 'medium', 'low']
+    ) -> List[Dict[str, Any]]:
+        results = []
+        with yt_dlp.YoutubeDL(self._build_ydl_opts(format_type, quality)) as ydl:
+            for url in urls:
+                try:
+                    info = ydl.extract_info(url, download=True)
+                except yt_dlp.utils.DownloadError as e:
+                    results.append(self._failure(str(e), 'Download failed'))
+                    continue
+                _cache_put_info(url, info)
+                file_path = self._final_path(ydl, info, format_type)
+                if not file_path.exists():
+                    results.append({
+                        'success': False,
+                        'error': 'Downloaded file not found'
+                    })
+                    continue
+                title = self._sanitize_filename(info.get('title', 'Unknown'))
+                results.append(self._result(title, file_path, format_type, quality))
+        return results
+
+    def _download_many_subprocess(
+        self,
+        urls: List[str],
+        format_type: Literal['mp3', 'wav', 'flac', 'mp4'],
+        quality: Literal['high', 'medium', 'low']
+    ) -> List[Dict[str, Any]]:
+        cmd = self._get_yt_dlp_command(urls[0], format_type, quality)
+        # yt-dlp accepts URLs anywhere on the command line
+        cmd.extend(urls[1:])
+        cmd.extend(['--print', 'after_move:%(title)s\t%(filepath)s'])
+        printed: List[str] = []
+        returncode, stderr = _run_streaming(cmd, timeout=600 * len(urls), stdout_lines=printed)
+        results = []
+        for line in printed:
+            title, sep, filepath = line.rstrip('\n').rpartition('\t')
+            if not sep:
+                continue
+            file_path = Path(filepath)
+            results.append(self._result(
+                self._sanitize_filename(title), file_path, format_type, quality
+            ))
+        if returncode != 0:
+            results.append(self._failure(stderr, 'Download failed'))
+        return results
 
-            if result.returncode != 0:
+    def _download_subprocess(
+        self,
+        url: str,
+        format_type: Literal['mp3', 'wav', 'flac', 'mp4'],
+        quality: Literal['high', 'medium', 'low']
+    ) -> Dict[str, Any]:
+        """Fallback download path via the yt-dlp CLI"""
+        # First, get video info (cached across requests)
+        try:
+            video_info = self._probe_info(url)
+        except RuntimeError as e:
+            return self._failure(str(e), 'Failed to fetch video info')
+        title = self._sanitize_filename(video_info.get('title', 'Unknown'))
+        # Build download command
+        download_cmd = self._get_yt_dlp_command(url, format_type, quality)
+        # Execute download
+        returncode, stderr = _run_streaming(download_cmd, timeout=600)  # 10 minutes max
+        if returncode != 0:
+            return self._failure(stderr, 'Download failed')
+        # Find the downloaded file
+        expected_filename = f"{title}.{format_type}"
+        file_path = self.output_dir / expected_filename
+        if not file_path.exists():
+            # Try to find any recently created file
+            files = list(self.output_dir.glob(f"{title}*"))
+            if files:
+                file_path = max(files, key=lambda p: p.stat().st_mtime)
+            else:
                 return {
                     'success': False,
-                    'error': result.stderr
+                    'error': 'Downloaded file not found'
                 }
+        return self._result(title, file_path, format_type, quality)
+
+    def _probe_info(self, url: str) -> Dict[str, Any]:
+        """Video metadata for url, served from the TTL cache when fresh"""
+        info = _cache_get_info(url)
+        if info is None:
+            info = self._extract_info(url)
+            _cache_put_info(url, info)
+        return info
 
-            info = json.loads(result.stdout)
+    def _extract_info(self, url: str) -> Dict[str, Any]:
+        """Fetch video metadata as a dict (raises RuntimeError on failure)"""
+        if yt_dlp is not None:
+            opts = {
+                'noplaylist': True,
+                'quiet': True,
+                'no_warnings': True,
+                'skip_download': True,
+                'http_headers': {'User-Agent': _USER_AGENT},
+            }
+            try:
+                with yt_dlp.YoutubeDL(opts) as ydl:
+                    return ydl.extract_info(url, download=False)
+            except yt_dlp.utils.DownloadError as e:
+                raise RuntimeError(str(e)) from e
+
+        cmd = [
+            'yt-dlp',
+            '--dump-json',
+            '--no-playlist',
+            '--user-agent', _USER_AGENT,
+            url
+        ]
+
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+
+        return json.loads(result.stdout)
+
+    def get_video_info(self, url: str) -> Dict[str, Any]:
+        """Get video metadata without downloading"""
+        try:
+            info = self._probe_info(url)
 
             return {
                 'success': True,
@@ -248,7 +513,7 @@ class YouTubeDownloader:
                 'duration': info.get('duration', 0),
                 'uploader': info.get('uploader', 'Unknown'),
                 'thumbnail': info.get('thumbnail', ''),
-                'description': info.get('description', '')[:500]
+                'description': (info.get('description') or '')[:500]
             }
 
         except Exception as e:
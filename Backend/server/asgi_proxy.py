@@ -0,0 +1,125 @@
+"""ASGI entrypoint for the backend skeleton with an async /proxy-audio.
+
+``POST /proxy-audio`` is served natively on the event loop with
+``httpx.AsyncClient``, so a long-running proxy stream no longer holds a
+WSGI worker thread. Every other route is forwarded to the Flask app in
+``server.backend_skeleton`` through ``asgiref.wsgi.WsgiToAsgi``.
+
+Requires: httpx, asgiref, uvicorn (uvloop optional); see requirements-optional.txt
+Run: uvicorn server.asgi_proxy:app --workers 1 --loop uvloop
+"""
+
+import importlib.util
+import json
+
+import httpx  # type: ignore
+from asgiref.wsgi import WsgiToAsgi  # type: ignore
+
+from server.backend_skeleton import app as flask_app
+
+PROXY_CHUNK_SIZE = 64 * 1024
+# HTTP/2 lets concurrent proxies to one CDN host share a connection; it
+# needs the optional ``h2`` package (pip install httpx[http2]).
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+_wsgi_app = WsgiToAsgi(flask_app)
+_client = None  # created on first use so it binds to the running loop
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10, connect=3),
+            follow_redirects=True,
+            http2=HTTP2_ENABLED,
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+        )
+    return _client
+
+
+async def _read_body(receive):
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def _send_json(send, status, obj):
+    payload = json.dumps(obj).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def proxy_audio(scope, receive, send):
+    try:
+        data = json.loads(await _read_body(receive) or b"{}") or {}
+    except ValueError:
+        data = {}
+    url = data.get("url") if isinstance(data, dict) else None
+    if not url:
+        await _send_json(send, 400, {"error": "url required"})
+        return
+
+    client = _get_client()
+    try:
+        upstream = await client.send(client.build_request("GET", url), stream=True)
+    except Exception as e:
+        await _send_json(send, 502, {"error": f"fetch failed: {e}"})
+        return
+
+    try:
+        content_type = upstream.headers.get("Content-Type", "application/octet-stream")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", content_type.encode("latin-1"))],
+            }
+        )
+        # aiter_bytes (not aiter_raw) so content-encoding is decoded, as
+        # requests' iter_content did in the WSGI handler
+        async for chunk in upstream.aiter_bytes(PROXY_CHUNK_SIZE):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        await upstream.aclose()
+
+
+async def _lifespan(receive, send):
+    global _client
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if _client is not None:
+                await _client.aclose()
+                _client = None
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+    elif (
+        scope["type"] == "http"
+        and scope["path"] == "/proxy-audio"
+        and scope["method"] == "POST"
+    ):
+        await proxy_audio(scope, receive, send)
+    else:
+        await _wsgi_app(scope, receive, send)
@@ -13,14 +13,17 @@ Endpoints included:
 
 This is intentionally small and uses sqlite + filesystem for persistence.
 Run: python server/backend_skeleton.py
+ASGI (async /proxy-audio): uvicorn server.asgi_proxy:app --workers 1
 """
 
 import os
 import uuid
 import json
+import multiprocessing
 import sqlite3
 import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from flask import (  # type: ignore
     Flask,
@@ -31,6 +34,8 @@ from flask import (  # type: ignore
     stream_with_context,
 )
 import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.util.retry import Retry  # type: ignore
 
 try:
     from rq import Queue  # type: ignore
@@ -49,18 +54,63 @@ for p in (UPLOADS_DIR, OUTPUTS_DIR, BASE_DIR / "server"):
 
 app = Flask(__name__)
 app.config["MAX_CONTENT_LENGTH"] = 200 * 1024 * 1024  # 200MB default limit
+# Behind Apache/lighttpd mod_xsendfile, let the front server send file bodies
+app.config["USE_X_SENDFILE"] = os.environ.get("USE_X_SENDFILE", "").lower() in (
+    "1",
+    "true",
+)
+# Behind nginx, set e.g. X_ACCEL_REDIRECT_PREFIX=/_protected/ with an
+# ``internal`` location aliasing BASE_DIR so nginx serves downloads itself
+X_ACCEL_REDIRECT_PREFIX = os.environ.get("X_ACCEL_REDIRECT_PREFIX")
+
+# Pooled keep-alive session for /proxy-audio so repeat fetches from the same
+# host skip the TCP/TLS handshake
+_http = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=128,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+)
+_http.mount("http://", _http_adapter)
+_http.mount("https://", _http_adapter)
 
-# Simple sqlite helper
+# Simple sqlite helper: one connection per thread, reused across requests
+
+_db_local = threading.local()
+
+# Statement text is kept identical across calls so the per-connection
+# statement cache can reuse the compiled statement.
+INSERT_SONG_SQL = (
+    "INSERT INTO songs (id, title, artist, filename, duration, "
+    "metadata, created_at) VALUES (?,?,?,?,?,?,?)"
+)
+INSERT_JOB_SQL = (
+    "INSERT INTO jobs (id,file_id,model,status,progress,"
+    "message,created_at) VALUES (?,?,?,?,?,?,?)"
+)
 
 
 def get_db():
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    conn = getattr(_db_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(
+            str(DB_PATH),
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        _db_local.conn = conn
     return conn
 
 
 def init_db():
     conn = get_db()
+    # WAL is persistent in the database file; readers no longer block writers
+    conn.execute("PRAGMA journal_mode=WAL")
     cur = conn.cursor()
     cur.execute(
         """
@@ -88,8 +138,15 @@ def init_db():
         )
         """
     )
+    # job_poller: WHERE status=? ORDER BY created_at LIMIT 1
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_created "
+        "ON jobs(status, created_at)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_songs_created ON songs(created_at)"
+    )
     conn.commit()
-    conn.close()
 
 
 init_db()
@@ -120,10 +177,7 @@ def upload():
     conn = get_db()
     cur = conn.cursor()
     cur.execute(
-        (
-            "INSERT INTO songs (id, title, artist, filename, duration, "
-            "metadata, created_at) VALUES (?,?,?,?,?,?,?)"
-        ),
+        INSERT_SONG_SQL,
         (
             file_id,
             meta_obj.get("title"),
@@ -135,7 +189,6 @@ def upload():
         ),
     )
     conn.commit()
-    conn.close()
     return (
         jsonify(
             {
@@ -154,15 +207,20 @@ def list_songs():
     conn = get_db()
     cur = conn.cursor()
     cur.execute("SELECT * FROM songs")
-    rows = cur.fetchall()
-    songs = []
-    for r in rows:
-        obj = dict(r)
-        obj["metadata"] = json.loads(r["metadata"]) if r["metadata"] else {}
-        obj["url"] = f"/download/{r['id']}"
-        songs.append(obj)
-    conn.close()
-    return jsonify({"songs": songs})
+
+    def gen():
+        # metadata is stored as JSON text already, so splice it in verbatim
+        # rather than parsing it only for jsonify to serialize it again
+        yield '{"songs": ['
+        for i, r in enumerate(cur):
+            obj = dict(r)
+            metadata = obj.pop("metadata") or "{}"
+            obj["url"] = f"/download/{r['id']}"
+            row_json = json.dumps(obj)
+            yield ("," if i else "") + row_json[:-1] + ', "metadata": ' + metadata + "}"
+        yield "]}"
+
+    return Response(stream_with_context(gen()), mimetype="application/json")
 
 
 @app.route("/songs/<file_id>", methods=["GET", "PATCH", "DELETE"])
@@ -177,7 +235,6 @@ def song_detail(file_id):
         obj = dict(r)
         obj["metadata"] = json.loads(r["metadata"]) if r["metadata"] else {}
         obj["url"] = f"/download/{r['id']}"
-        conn.close()
         return jsonify(obj)
     elif request.method == "PATCH":
         body = request.get_json() or {}
@@ -198,7 +255,6 @@ def song_detail(file_id):
             ),
         )
         conn.commit()
-        conn.close()
         return jsonify({"id": file_id, **existing})
     else:  # DELETE
         cur.execute("SELECT filename FROM songs WHERE id=?", (file_id,))
@@ -210,25 +266,68 @@ def song_detail(file_id):
                 pass
         cur.execute("DELETE FROM songs WHERE id=?", (file_id,))
         conn.commit()
-        conn.close()
     return ("", 204)
 
 
 # Simple background job runner
 
 
+def _link_or_copy(src, dest):
+    """Hardlink ``src`` to ``dest`` (no data copied); copy when linking is
+    not possible, e.g. across devices or on filesystems without links."""
+    if dest.exists():
+        dest.unlink()
+    try:
+        os.link(src, dest)
+    except OSError:
+        import shutil
+
+        shutil.copy2(src, dest)
+
+
+# Progress is kept in memory and written to sqlite at most once per
+# PROGRESS_PERSIST_INTERVAL per job; terminal states are always written.
+# /status overlays the in-memory value so polling clients still see every
+# stage without a commit per update.
+PROGRESS_PERSIST_INTERVAL = 0.5
+_job_progress = {}
+_job_progress_lock = threading.Lock()
+
+# Set only inside job pool worker processes (see _init_job_worker). Workers
+# send progress here and the parent's drainer thread records/persists it.
+_progress_queue = None
+
+
+def _report_progress(cur, job_id, progress, message, last_persist):
+    """Record progress for ``job_id``; returns the new last-persist time."""
+    if _progress_queue is not None:
+        _progress_queue.put((job_id, progress, message))
+        return last_persist
+    with _job_progress_lock:
+        _job_progress[job_id] = (progress, message)
+    now = time.monotonic()
+    if now - last_persist < PROGRESS_PERSIST_INTERVAL:
+        return last_persist
+    # never clobber a terminal state written after this update was queued
+    cur.execute(
+        "UPDATE jobs SET progress=?, message=? "
+        "WHERE id=? AND status NOT IN ('completed', 'failed')",
+        (progress, message, job_id),
+    )
+    return now
+
+
 def background_process(job_id, file_id, model):
     conn = get_db()
     cur = conn.cursor()
     try:
         # simulate work
+        last_persist = 0.0
         for i in range(1, 6):
             time.sleep(1)
-            cur.execute(
-                "UPDATE jobs SET progress=?, message=? WHERE id=?",
-                (i / 5.0, f"stage {i}", job_id),
+            last_persist = _report_progress(
+                cur, job_id, i / 5.0, f"stage {i}", last_persist
             )
-            conn.commit()
 
         # create a dummy output artifact (copy original if exists)
         cur.execute("SELECT filename FROM songs WHERE id=?", (file_id,))
@@ -240,9 +339,7 @@ def background_process(job_id, file_id, model):
             if src.exists():
                 dest = outputs_dir / ("instrumental" + src.suffix)
                 try:
-                    import shutil
-
-                    shutil.copy2(src, dest)
+                    _link_or_copy(src, dest)
                 except Exception:
                     pass
 
@@ -258,7 +355,86 @@ def background_process(job_id, file_id, model):
         )
         conn.commit()
     finally:
-        conn.close()
+        with _job_progress_lock:
+            _job_progress.pop(job_id, None)
+        if _progress_queue is not None:
+            _progress_queue.put((job_id, None, None))
+
+
+# Process pool for jobs, so CPU-bound separation is not limited by the GIL.
+# Created on first use; JOB_WORKERS overrides the worker count. The pool is
+# created from a running multi-threaded process (poller, drainer, request
+# threads), so workers are spawned rather than forked: a forked child could
+# inherit a lock held by another thread and hang.
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS") or os.cpu_count() or 1)
+_mp_context = multiprocessing.get_context("spawn")
+_job_executor = None
+_job_executor_lock = threading.Lock()
+_job_futures = {}
+
+
+def _init_job_worker(progress_queue):
+    global _progress_queue, _db_local
+    _progress_queue = progress_queue
+    # never share a sqlite connection with the parent, whatever the context
+    _db_local = threading.local()
+
+
+def _drain_progress(progress_queue):
+    """Parent-side thread: apply progress messages sent by pool workers."""
+    cur = get_db().cursor()
+    last_persist = {}
+    while True:
+        job_id, progress, message = progress_queue.get()
+        if progress is None:  # job finished
+            last_persist.pop(job_id, None)
+            with _job_progress_lock:
+                _job_progress.pop(job_id, None)
+            continue
+        try:
+            last_persist[job_id] = _report_progress(
+                cur, job_id, progress, message, last_persist.get(job_id, 0.0)
+            )
+        except Exception:
+            pass
+
+
+def _get_job_executor():
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is None:
+            progress_queue = _mp_context.Queue()
+            _job_executor = ProcessPoolExecutor(
+                max_workers=JOB_WORKERS,
+                mp_context=_mp_context,
+                initializer=_init_job_worker,
+                initargs=(progress_queue,),
+            )
+            threading.Thread(
+                target=_drain_progress, args=(progress_queue,), daemon=True
+            ).start()
+        return _job_executor
+
+
+def submit_job(job_id, file_id, model):
+    """Run ``background_process`` for a job on the process pool.
+
+    Falls back to a daemon thread if the pool cannot be used.
+    """
+    try:
+        future = _get_job_executor().submit(
+            background_process, job_id, file_id, model
+        )
+    except Exception:
+        threading.Thread(
+            target=background_process,
+            args=(job_id, file_id, model),
+            daemon=True,
+        ).start()
+        return
+    _job_futures[job_id] = future
+    future.add_done_callback(lambda _f: _job_futures.pop(job_id, None))
 
 
 # Simple SQLite-backed poller: looks for jobs with status 'queued'
@@ -271,6 +447,9 @@ def job_poller(poll_interval: float = 1.0):
     This keeps a single background thread that serially runs jobs using the
     existing ``background_process`` function. It's intentionally simple and
     suitable for development; for production use a proper queue (RQ/Celery).
+
+    Queued rows may be inserted by other processes, so the table is polled
+    every ``poll_interval`` seconds while idle.
     """
     while True:
         try:
@@ -282,7 +461,6 @@ def job_poller(poll_interval: float = 1.0):
                 ("queued",),
             )
             r = cur.fetchone()
-            conn.close()
             if r:
                 job_id = r["id"]
                 file_id = r["file_id"]
@@ -295,12 +473,8 @@ def job_poller(poll_interval: float = 1.0):
                     ("processing", "taken by poller", job_id),
                 )
                 conn2.commit()
-                conn2.close()
-                # run job synchronously in poller thread
-                try:
-                    background_process(job_id, file_id, model)
-                except Exception:
-                    pass
+                # hand the job to the process pool
+                submit_job(job_id, file_id, model)
             else:
                 time.sleep(poll_interval)
         except Exception:
@@ -308,10 +482,12 @@ def job_poller(poll_interval: float = 1.0):
             time.sleep(poll_interval)
 
 
-# start single poller thread (daemon)
+# start single poller thread (daemon) in the main process only; pool
+# workers are spawned, so they re-import this module and must not poll
 
 _poller_thread = threading.Thread(target=job_poller, args=(), daemon=True)
-_poller_thread.start()
+if multiprocessing.parent_process() is None:
+    _poller_thread.start()
 
 
 @app.route("/process/<model>/<file_id>", methods=["POST"])
@@ -320,10 +496,7 @@ def start_process(model, file_id):
     cur = conn.cursor()
     job_id = str(uuid.uuid4())
     cur.execute(
-        (
-            "INSERT INTO jobs (id,file_id,model,status,progress,"
-            "message,created_at) VALUES (?,?,?,?,?,?,?)"
-        ),
+        INSERT_JOB_SQL,
         (
             job_id,
             file_id,
@@ -335,7 +508,8 @@ def start_process(model, file_id):
         ),
     )
     conn.commit()
-    conn.close()
+    # The row is created as 'processing' and submitted directly below, so
+    # the poller (which only takes 'queued' rows) is not involved.
     # If REDIS_URL is provided and rq is available, enqueue the job there.
     redis_url = os.environ.get("REDIS_URL")
     if redis_url and Queue is not None and Redis is not None:
@@ -346,31 +520,21 @@ def start_process(model, file_id):
                 func=background_process, args=(job_id, file_id, model)
             )
         except Exception:
-            # fallback to in-process thread
-            t = threading.Thread(
-                target=background_process,
-                args=(job_id, file_id, model),
-                daemon=True,
-            )
-            t.start()
+            # fallback to the in-process pool
+            submit_job(job_id, file_id, model)
     else:
-        # default: run in a background thread (development)
-        t = threading.Thread(
-            target=background_process,
-            args=(job_id, file_id, model),
-            daemon=True,
-        )
-        t.start()
-        return (
-            jsonify(
-                {
-                    "status": "accepted",
-                    "job_id": job_id,
-                    "file_id": file_id,
-                }
-            ),
-            202,
-        )
+        # default: run on the local process pool (development)
+        submit_job(job_id, file_id, model)
+    return (
+        jsonify(
+            {
+                "status": "accepted",
+                "job_id": job_id,
+                "file_id": file_id,
+            }
+        ),
+        202,
+    )
 
 
 @app.route("/status/<job_id>", methods=["GET"])
@@ -379,13 +543,43 @@ def job_status(job_id):
     cur = conn.cursor()
     cur.execute("SELECT * FROM jobs WHERE id=?", (job_id,))
     r = cur.fetchone()
-    conn.close()
     if not r:
         return jsonify({"error": "not found"}), 404
     obj = dict(r)
+    with _job_progress_lock:
+        pending = _job_progress.get(job_id)
+    if pending is not None:
+        obj["progress"], obj["message"] = pending
     return jsonify(obj)
 
 
+def _send_download(path):
+    """Send ``path`` as an attachment, with 304 support for repeat requests.
+
+    The path (not a file object) is handed to ``send_file`` on purpose:
+    Flask then serves it through ``wsgi.file_wrapper``, which gunicorn maps
+    to ``os.sendfile`` and the dev server reads in small blocks, so memory
+    stays flat for large audio. Wrapping an mmap in ``BytesIO`` would copy
+    the whole file into the process instead.
+    """
+    if X_ACCEL_REDIRECT_PREFIX:
+        resp = Response(status=200)
+        resp.headers["X-Accel-Redirect"] = (
+            X_ACCEL_REDIRECT_PREFIX.rstrip("/")
+            + "/"
+            + path.relative_to(BASE_DIR).as_posix()
+        )
+        resp.headers["Content-Disposition"] = f'attachment; filename="{path.name}"'
+        return resp
+    return send_file(
+        str(path),
+        as_attachment=True,
+        conditional=True,
+        etag=True,
+        last_modified=path.stat().st_mtime,
+    )
+
+
 @app.route("/download/<file_id>", methods=["GET"])
 @app.route("/download/<file_id>/<artifact_key>", methods=["GET"])
 def download(file_id, artifact_key=None):
@@ -396,7 +590,7 @@ def download(file_id, artifact_key=None):
             return jsonify({"error": "not found"}), 404
         for p in outputs_dir.iterdir():
             if p.name.startswith(artifact_key):
-                return send_file(str(p), as_attachment=True)
+                return _send_download(p)
         return jsonify({"error": "artifact not found"}), 404
     else:
         # return original upload if present
@@ -404,13 +598,12 @@ def download(file_id, artifact_key=None):
         cur = conn.cursor()
         cur.execute("SELECT filename FROM songs WHERE id=?", (file_id,))
         r = cur.fetchone()
-        conn.close()
         if not r:
             return jsonify({"error": "not found"}), 404
         src = UPLOADS_DIR / r["filename"]
         if not src.exists():
             return jsonify({"error": "file missing"}), 404
-        return send_file(str(src), as_attachment=True)
+        return _send_download(src)
 
 
 @app.route("/proxy-audio", methods=["POST"])
@@ -420,7 +613,7 @@ def proxy_audio():
     if not url:
         return jsonify({"error": "url required"}), 400
     try:
-        r = requests.get(url, stream=True, timeout=10)
+        r = _http.get(url, stream=True, timeout=(3, 10))
     except Exception as e:
         return jsonify({"error": f"fetch failed: {e}"}), 502
 
@@ -438,6 +631,84 @@ def proxy_audio():
     return Response(stream_with_context(gen()), headers=headers)
 
 
+UPLOAD_DATA_NAME = "data.bin"
+# one "<idx>.done" marker per received offset chunk; each request writes
+# only its own file, so concurrent workers never rewrite shared state
+UPLOAD_MARKERS_DIR = "received"
+
+COPY_BUFFER_SIZE = 1 << 20  # 1MB
+SENDFILE_CHUNK = 1 << 22  # 4MB
+
+
+def _write_stream_at(path, stream, offset):
+    """Copy ``stream`` into ``path`` starting at byte ``offset`` without
+    truncating, one COPY_BUFFER_SIZE read at a time. Returns bytes written."""
+    fd = os.open(str(path), os.O_WRONLY | getattr(os, "O_BINARY", 0))
+    total = 0
+    try:
+        if not hasattr(os, "pwrite"):  # Windows has no pwrite
+            os.lseek(fd, offset, os.SEEK_SET)
+        while True:
+            buf = stream.read(COPY_BUFFER_SIZE)
+            if not buf:
+                break
+            view = memoryview(buf)
+            while view:
+                if hasattr(os, "pwrite"):
+                    written = os.pwrite(fd, view, offset + total)
+                else:
+                    written = os.write(fd, view)
+                view = view[written:]
+                total += written
+    finally:
+        os.close(fd)
+    return total
+
+
+def _record_chunk(upload_dir, idx, offset, length):
+    """Note chunk ``idx`` as received by writing its marker file.
+
+    The marker is written under a unique temporary name and renamed into
+    place, so a retried chunk atomically replaces its earlier marker.
+    """
+    markers = upload_dir / UPLOAD_MARKERS_DIR
+    markers.mkdir(exist_ok=True)
+    tmp = markers / f".{idx}.{uuid.uuid4().hex}.tmp"
+    tmp.write_text(json.dumps([offset, length]))
+    os.replace(tmp, markers / f"{idx}.done")
+
+
+def _read_chunk_state(upload_dir):
+    """Map str(idx) -> [offset, length] for every recorded chunk."""
+    state = {}
+    try:
+        names = os.listdir(upload_dir / UPLOAD_MARKERS_DIR)
+    except FileNotFoundError:
+        return state
+    for name in names:
+        idx, ext = os.path.splitext(name)
+        if ext != ".done":
+            continue  # in-flight temporary file
+        try:
+            entry = json.loads((upload_dir / UPLOAD_MARKERS_DIR / name).read_text())
+        except (OSError, ValueError):
+            continue
+        state[idx] = entry
+    return state
+
+
+def _received_size(state):
+    """Total size if chunks 0..n-1 were all received and tile the file
+    contiguously, otherwise None."""
+    expected_offset = 0
+    for idx in range(len(state)):
+        entry = state.get(str(idx))
+        if entry is None or entry[0] != expected_offset:
+            return None
+        expected_offset += entry[1]
+    return expected_offset
+
+
 @app.route("/uploads", methods=["POST"])
 def create_upload():
     """Create a resumable upload session and return an upload_id."""
@@ -447,6 +718,8 @@ def create_upload():
     # store metadata if provided
     metadata = request.get_json() or {}
     (upload_dir / "meta.json").write_text(json.dumps(metadata))
+    # offset-addressed chunks are written straight into this file
+    (upload_dir / UPLOAD_DATA_NAME).touch()
     return jsonify({"upload_id": upload_id}), 201
 
 
@@ -454,7 +727,10 @@ def create_upload():
 def upload_chunk(upload_id):
     """Append a chunk to the upload.
 
-    Client must send 'X-Chunk-Index' header (int) and a binary body.
+    Client must send 'X-Chunk-Index' header (int) and a binary body. When
+    'X-Chunk-Offset' (byte offset, int) is also sent, the chunk is written
+    in place into the session's data file instead of a separate part file,
+    so completing the upload needs no concatenation pass.
     """
     upload_dir = UPLOADS_DIR / upload_id
     if not upload_dir.exists():
@@ -467,12 +743,48 @@ def upload_chunk(upload_id):
     except Exception:
         return jsonify({"error": "invalid chunk index"}), 400
 
+    chunk_offset = request.headers.get("X-Chunk-Offset")
+    if chunk_offset is not None:
+        try:
+            offset = int(chunk_offset)
+            if offset < 0:
+                raise ValueError(chunk_offset)
+        except ValueError:
+            return jsonify({"error": "invalid chunk offset"}), 400
+        data_path = upload_dir / UPLOAD_DATA_NAME
+        if not data_path.exists():
+            return jsonify({"error": "upload not found"}), 404
+        length = _write_stream_at(data_path, request.stream, offset)
+        _record_chunk(upload_dir, idx, offset, length)
+        return ("", 204)
+
+    import shutil
+
     chunk_path = upload_dir / f"chunk-{idx:06d}.part"
     with open(chunk_path, "wb") as fh:
-        fh.write(request.get_data())
+        shutil.copyfileobj(request.stream, fh, COPY_BUFFER_SIZE)
     return ("", 204)
 
 
+def _copy_into(src, dst):
+    """Append the rest of file ``src`` to file ``dst``.
+
+    Uses ``os.sendfile`` (kernel-space copy) where the platform supports it
+    between regular files, otherwise a buffered ``shutil.copyfileobj``.
+    """
+    if hasattr(os, "sendfile"):
+        dst.flush()
+        try:
+            while os.sendfile(dst.fileno(), src.fileno(), None, SENDFILE_CHUNK):
+                pass
+            return
+        except OSError:
+            pass  # e.g. file-to-file sendfile unsupported; finish with copyfileobj
+    import shutil
+
+    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+
 @app.route("/uploads/<upload_id>/complete", methods=["POST"])
 def complete_upload(upload_id):
     """Assemble chunks in order and register final file.
@@ -482,12 +794,15 @@ def complete_upload(upload_id):
     upload_dir = UPLOADS_DIR / upload_id
     if not upload_dir.exists():
         return jsonify({"error": "upload not found"}), 404
-    # assemble
     parts = sorted(
         [p for p in upload_dir.iterdir() if p.name.startswith("chunk-")]
     )
-    if not parts:
+    state = None if parts else _read_chunk_state(upload_dir)
+    if not parts and not state:
         return jsonify({"error": "no chunks found"}), 400
+    total_size = _received_size(state) if state else None
+    if state and total_size is None:
+        return jsonify({"error": "upload incomplete"}), 400
     file_id = str(uuid.uuid4())
     # infer extension from metadata or default to .bin
     meta_path = upload_dir / "meta.json"
@@ -502,22 +817,27 @@ def complete_upload(upload_id):
             pass
     final_name = f"{file_id}{ext}"
     final_path = UPLOADS_DIR / final_name
-    with open(final_path, "wb") as out:
-        for p in parts:
-            with open(p, "rb") as fh:
-                out.write(fh.read())
+    if state:
+        # offset-addressed chunks already form the file; just persist it
+        data_path = upload_dir / UPLOAD_DATA_NAME
+        with open(data_path, "rb+") as fh:
+            fh.truncate(total_size)  # drop bytes past the last chunk
+            os.fsync(fh.fileno())
+        os.replace(data_path, final_path)
+    else:
+        # assemble legacy per-chunk part files
+        with open(final_path, "wb") as out:
+            for p in parts:
+                with open(p, "rb") as fh:
+                    _copy_into(fh, out)
     # register as song
     conn = get_db()
     cur = conn.cursor()
     cur.execute(
-        (
-            "INSERT INTO songs (id, title, artist, filename, duration, "
-            "metadata, created_at) VALUES (?,?,?,?,?,?,?)"
-        ),
+        INSERT_SONG_SQL,
         (file_id, None, None, final_name, None, json.dumps({}), time.time()),
     )
     conn.commit()
-    conn.close()
     # cleanup upload parts
     try:
         import shutil
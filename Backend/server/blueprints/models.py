@@ -3,31 +3,63 @@ from flask import Blueprint, jsonify, current_app
 bp = Blueprint("models", __name__)
 
 
+def _serializable(config):
+    return {
+        **config,
+        "file_types": list(config.get("file_types", [])),
+        "available_models": list(config.get("available_models", [])),
+    }
+
+
+def _models_list_body():
+    """Return the /models response body, serialized once per MODELS config.
+
+    The cache is keyed on the MODELS object itself, so assigning a new
+    ``app.config["MODELS"]`` (e.g. on config reload) rebuilds it.
+    """
+    models_cfg = current_app.config.get("MODELS", {})
+    cached = current_app.extensions.get("models_list_json")
+    if cached is not None and cached[0] is models_cfg:
+        return cached[1]
+
+    models_json = {
+        model_name: _serializable(config)
+        for model_name, config in models_cfg.items()
+    }
+    body = current_app.json.dumps(
+        {"models": models_json, "message": "Available AI models"}
+    )
+    current_app.extensions["models_list_json"] = (models_cfg, body)
+    return body
+
+
 @bp.route("/models", methods=["GET"])
 def list_models():
+    return current_app.response_class(
+        _models_list_body(), mimetype="application/json"
+    )
+
+
+def _model_info_bodies():
+    """Return ``{model_name: body}`` for /models/<name>, cached like the list."""
     models_cfg = current_app.config.get("MODELS", {})
-    models_json = {}
-    for model_name, config in models_cfg.items():
-        models_json[model_name] = {
-            **config,
-            "file_types": list(config.get("file_types", [])),
-            "available_models": list(config.get("available_models", [])),
-        }
+    cached = current_app.extensions.get("model_info_json")
+    if cached is not None and cached[0] is models_cfg:
+        return cached[1]
 
-    return jsonify({"models": models_json, "message": "Available AI models"})
+    dumps = current_app.json.dumps
+    bodies = {
+        model_name: dumps({"model": model_name, "config": _serializable(config)})
+        for model_name, config in models_cfg.items()
+    }
+    current_app.extensions["model_info_json"] = (models_cfg, bodies)
+    return bodies
 
 
 @bp.route("/models/<model_name>", methods=["GET"])
 def get_model_info(model_name):
-    cfg = current_app.config.get("MODELS", {})
-    if model_name not in cfg:
+    body = _model_info_bodies().get(model_name)
+    if body is None:
         return jsonify({"error": f"Model {model_name} not found"}), 404
 
-    config = cfg[model_name]
-    config_json = {
-        **config,
-        "file_types": list(config.get("file_types", set())),
-        "available_models": list(config.get("available_models", [])),
-    }
-
-    return jsonify({"model": model_name, "config": config_json})
+    return current_app.response_class(body, mimetype="application/json")
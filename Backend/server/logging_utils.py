@@ -6,31 +6,77 @@ components that can be shared across multiple Flask applications.
 
 import os
 import logging
-import uuid
+import secrets
 import json
 import traceback
+from contextvars import ContextVar
 from logging.handlers import RotatingFileHandler
-from flask import request, jsonify
+from flask import g, request, jsonify
 from werkzeug.exceptions import HTTPException
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def new_request_id():
+    """Return a random request ID in the 8-4-4-4-12 hex layout of a UUID.
+
+    Slicing secrets.token_hex avoids building a uuid.UUID object per request
+    while keeping the ID shape clients and log queries already expect.
+    """
+    h = secrets.token_hex(16)
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+# Content-Type of Werkzeug's default HTML error pages
+_HTML_CT = 'text/html; charset=utf-8'
+# Header every response must expose to browser clients
+_EXPOSE_DEFAULT = 'X-Request-ID'
+
+
+# Current request ID, set by log_request_info; a plain ContextVar read is far
+# cheaper than going through Flask's proxies on every log emission and also
+# works outside a request context.
+_REQ_ID = ContextVar('request_id', default='')
+
 
 class RequestIDFilter(logging.Filter):
-    """Inject request_id into log records from Flask request context."""
+    """Inject request_id into log records from the current request."""
 
     def filter(self, record):
-        try:
-            # Try to pull from flask request context or environ
-            env_req_id = request.environ.get('request_id', '')
-            record.request_id = getattr(request, 'request_id', env_req_id)
-        except Exception:
-            record.request_id = ''
+        req_id = _REQ_ID.get()
+        # Outside a request keep an explicit extra={"request_id": ...}
+        if req_id or not hasattr(record, 'request_id'):
+            record.request_id = req_id
         return True
 
 
+class FastRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler whose rollover check does not re-format the record.
+
+    The stdlib check formats every record a second time just to measure it;
+    comparing the current stream offset against maxBytes is enough here, at
+    the cost of a file overshooting the limit by at most one record.
+    """
+
+    def shouldRollover(self, record):
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        return self.stream.tell() >= self.maxBytes
+
+
 class JsonFormatter(logging.Formatter):
     """Format log records as JSON for structured logging."""
 
     def format(self, record):
+        # A record reaching several JSON handlers is serialized only once
+        cached = getattr(record, '_cached_json', None)
+        if cached is not None:
+            return cached
         log_obj = {
             'timestamp': self.formatTime(record, self.datefmt),
             'level': record.levelname,
@@ -40,7 +86,13 @@ class JsonFormatter(logging.Formatter):
         }
         if record.exc_info:
             log_obj['exception'] = self.formatException(record.exc_info)
-        return json.dumps(log_obj)
+        if orjson is not None:
+            # Every value above is already a str, so orjson needs no options
+            formatted = orjson.dumps(log_obj).decode('utf-8')
+        else:
+            formatted = json.dumps(log_obj)
+        record._cached_json = formatted
+        return formatted
 
 
 def setup_app_logging(app, log_dir='logs'):
@@ -52,8 +104,13 @@ def setup_app_logging(app, log_dir='logs'):
     """
     os.makedirs(log_dir, exist_ok=True)
 
+    # Create app.logger before the root handlers exist: Flask only installs
+    # its stderr handler when no handler is reachable, and the file handlers
+    # below would otherwise suppress console output for app records.
+    app_logger = app.logger
+
     # Text log with rotating file handler
-    file_handler = RotatingFileHandler(
+    file_handler = FastRotatingFileHandler(
         os.path.join(log_dir, 'app.log'),
         maxBytes=5 * 1024 * 1024,  # 5MB
         backupCount=5
@@ -64,10 +121,9 @@ def setup_app_logging(app, log_dir='logs'):
     )
     file_handler.setFormatter(formatter)
     file_handler.addFilter(RequestIDFilter())
-    app.logger.addHandler(file_handler)
 
     # JSON log with rotating file handler
-    json_handler = RotatingFileHandler(
+    json_handler = FastRotatingFileHandler(
         os.path.join(log_dir, 'app.json.log'),
         maxBytes=5 * 1024 * 1024,  # 5MB
         backupCount=5
@@ -75,14 +131,16 @@ def setup_app_logging(app, log_dir='logs'):
     json_handler.setLevel(logging.INFO)
     json_handler.setFormatter(JsonFormatter())
     json_handler.addFilter(RequestIDFilter())
-    app.logger.addHandler(json_handler)
 
-    # Also attach to root logger so werkzeug and other modules write to same file
+    # Attach to the root logger only so werkzeug and other modules write to the
+    # same files; app.logger reaches them by propagation, so attaching to both
+    # would format and write every app record twice.
     root_logger = logging.getLogger()
     root_logger.addHandler(file_handler)
     root_logger.addHandler(json_handler)
 
-    app.logger.setLevel(logging.INFO)
+    app_logger.setLevel(logging.INFO)
+    app_logger.propagate = True
 
     # Write a startup log entry to validate file logging
     try:
@@ -115,52 +173,58 @@ def add_request_id_hooks(app):
             )
 
             # Generate or accept a request_id for tracing
-            request_id = incoming_req_id or str(uuid.uuid4())
-            extra = {"request_id": request_id}
-            msg = "Request: %s %s from %s"
-            app.logger.info(
-                msg,
-                request.method,
-                request.path,
-                request.remote_addr,
-                extra=extra,
-            )
+            request_id = incoming_req_id or new_request_id()
 
-            # Store into Flask environ for later handlers
-            request.environ['request_id'] = request_id
+            # Store on flask.g so later hooks and handlers read it directly,
+            # and in the ContextVar read by RequestIDFilter
+            g.request_id = request_id
+            g._request_id_token = _REQ_ID.set(request_id)
+
+            # Skip building the record entirely when INFO is filtered out
+            if app.logger.isEnabledFor(logging.INFO):
+                app.logger.info(
+                    "Request: %s %s from %s",
+                    request.method,
+                    request.path,
+                    request.remote_addr,
+                    extra={"request_id": request_id},
+                )
         except Exception:
             # In case request context is not fully available
             app.logger.info("Request received")
 
+    @app.teardown_request
+    def clear_request_id(exc=None):
+        """Reset the ContextVar so a worker thread does not keep a stale ID."""
+        token = g.pop('_request_id_token', None)
+        if token is not None:
+            try:
+                _REQ_ID.reset(token)
+            except ValueError:
+                # Token created in another context (e.g. copied contexts)
+                _REQ_ID.set('')
+
     @app.after_request
     def add_request_id_header(response):
         """Add X-Request-ID to response headers and ensure CORS exposure."""
         # Set X-Request-ID header
         try:
-            req_id = (
-                getattr(request, 'request_id', None)
-                or request.environ.get('request_id')
-            )
+            req_id = getattr(g, 'request_id', None)
             if req_id:
                 response.headers['X-Request-ID'] = req_id
         except Exception:
             pass
 
-        # Ensure browser clients can read the X-Request-ID header
+        # Ensure browser clients can read the X-Request-ID header; most
+        # responses have no expose list yet, so set the constant verbatim
         try:
-            # Ensure Access-Control-Expose-Headers contains unique values
-            existing = response.headers.get('Access-Control-Expose-Headers', '')
-            expose = 'X-Request-ID'
-            # Build a set of existing tokens (trim whitespace)
-            if existing:
-                tokens = {t.strip() for t in existing.split(',') if t.strip()}
-            else:
-                tokens = set()
-            tokens.add(expose)
-            if tokens:
-                response.headers[
-                    'Access-Control-Expose-Headers'
-                ] = ', '.join(sorted(tokens))
+            existing = response.headers.get('Access-Control-Expose-Headers')
+            if not existing:
+                response.headers['Access-Control-Expose-Headers'] = _EXPOSE_DEFAULT
+            elif _EXPOSE_DEFAULT not in existing:
+                response.headers['Access-Control-Expose-Headers'] = (
+                    existing + ', ' + _EXPOSE_DEFAULT
+                )
         except Exception:
             pass
 
@@ -183,10 +247,7 @@ def add_error_handlers(app):
     @app.errorhandler(HTTPException)
     def handle_http_exception(e):
         """Return JSON for HTTPExceptions (e.g., 404, 400)."""
-        req_id = (
-            getattr(request, 'request_id', None)
-            or request.environ.get('request_id')
-        )
+        req_id = getattr(g, 'request_id', None)
         extra = {"request_id": req_id}
         app.logger.error(
             "HTTP exception: %s %s",
@@ -208,10 +269,7 @@ def add_error_handlers(app):
     def handle_exception(e):
         """Generic exception handler - logs full traceback and returns JSON."""
         tb = traceback.format_exc()
-        req_id = (
-            getattr(request, 'request_id', None)
-            or request.environ.get('request_id')
-        )
+        req_id = getattr(g, 'request_id', None)
         extra = {"request_id": req_id}
         app.logger.exception(
             "Unhandled exception: %s",
@@ -228,16 +286,14 @@ def add_error_handlers(app):
     @app.errorhandler(404)
     def not_found_json(e):
         """Handle 404 errors with JSON response."""
-        req_id = (
-            getattr(request, 'request_id', None)
-            or request.environ.get('request_id')
-        )
-        app.logger.warning(
-            "404 Not Found: %s %s",
-            request.method,
-            request.path,
-            extra={"request_id": req_id},
-        )
+        req_id = getattr(g, 'request_id', None)
+        if app.logger.isEnabledFor(logging.WARNING):
+            app.logger.warning(
+                "404 Not Found: %s %s",
+                request.method,
+                request.path,
+                extra={"request_id": req_id},
+            )
         return jsonify({
             "error": "Not Found",
             "code": 404,
@@ -259,13 +315,12 @@ def add_json_error_converter(app):
     @app.after_request
     def ensure_json_errors(response):
         """Convert default HTML error pages into JSON for consistency."""
+        # Successful responses are the common case; leave them untouched
+        if response.status_code < 400:
+            return response
         try:
-            html_ct = 'text/html; charset=utf-8'
-            if response.status_code >= 400 and response.content_type == html_ct:
-                req_id = (
-                    getattr(request, 'request_id', None)
-                    or request.environ.get('request_id')
-                )
+            if response.content_type == _HTML_CT:
+                req_id = getattr(g, 'request_id', None)
                 extra_log = {"request_id": req_id}
                 app.logger.info(
                     "Converting HTML error response to JSON (status=%s)",
@@ -303,6 +358,13 @@ def setup_flask_app_hooks(app, log_dir='logs', enable_json_converter=True):
         log_dir: Directory to store log files (default: 'logs')
         enable_json_converter: Whether to enable HTML-to-JSON error conversion
     """
+    # Emit jsonify payloads unsorted and compact, even in DEBUG
+    if hasattr(app, 'json') and hasattr(app.json, 'sort_keys'):
+        app.json.sort_keys = False
+        app.json.compact = True
+    else:  # Flask < 2.2 reads these from config
+        app.config.setdefault('JSON_SORT_KEYS', False)
+        app.config.setdefault('JSONIFY_PRETTYPRINT_REGULAR', False)
     setup_app_logging(app, log_dir=log_dir)
     add_request_id_hooks(app)
     add_error_handlers(app)
@@ -1,11 +1,49 @@
 from fastapi import FastAPI, Request
+import asyncio
+import httpx
 import os
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = FastAPI()
 JOB_DIR = os.path.abspath('jobs')
 os.makedirs(JOB_DIR, exist_ok=True)
 
+@app.on_event('startup')
+async def open_http_client():
+    # Shared async client so downstream calls never block the event loop
+    app.state.http = httpx.AsyncClient(timeout=30)
+
+@app.on_event('shutdown')
+async def close_http_client():
+    await app.state.http.aclose()
+
+def _write_job(path, data):
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+def _read_job(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+# Job files are read/written on a worker thread so disk I/O never blocks the loop
+async def save_job(path, data):
+    await asyncio.to_thread(_write_job, path, data)
+
+async def load_job(path):
+    return await asyncio.to_thread(_read_job, path)
+
 @app.get('/health')
 async def health():
     return {'status':'ok'}
@@ -15,22 +53,22 @@ async def process(model: str, file_id: str, request: Request):
     payload = await request.json()
     job_id = payload.get('job_id') or str(file_id) + '-' + model
     data = {'job_id': job_id,'model': model,'file_id': file_id,'status':'submitted','payload': payload}
-    with open(os.path.join(JOB_DIR, job_id + '.json'),'w') as f:
-        json.dump(data,f)
+    await save_job(os.path.join(JOB_DIR, job_id + '.json'), data)
     # For prototype: forward to demucs service if model == 'demucs'
     if model == 'demucs':
         # build request to demucs
-        import requests
         demucs_url = os.environ.get('DEMUC_SERVICE','http://demucs:8000/jobs')
         files = {}
         # For prototype we won't send real files; the demucs service accepts multipart uploads too
         try:
-            resp = requests.post(demucs_url, json={'file_id': file_id, 'callback': os.environ.get('ORCH_CALLBACK','http://orchestrator:5000/notify')})
+            callback = os.environ.get('ORCH_CALLBACK','http://orchestrator:5000/notify')
+            resp = await app.state.http.post(
+                demucs_url, json={'file_id': file_id, 'callback': callback}
+            )
         except Exception as e:
             data['status']='error'
             data['error']=str(e)
-            with open(os.path.join(JOB_DIR, job_id + '.json'),'w') as f:
-                json.dump(data,f)
+            await save_job(os.path.join(JOB_DIR, job_id + '.json'), data)
             return {'ok':False,'error':str(e)}
     return {'ok':True,'job_id': job_id}
 
@@ -39,13 +77,8 @@ async def notify(request: Request):
     payload = await request.json()
     job_id = payload.get('job_id') or 'unknown'
     path = os.path.join(JOB_DIR, job_id + '.json')
-    if os.path.exists(path):
-        with open(path,'r') as f:
-            data = json.load(f)
-    else:
-        data = {}
+    data = await load_job(path)
     data['status']='completed'
     data['outputs']=payload.get('outputs', [])
-    with open(path,'w') as f:
-        json.dump(data,f)
+    await save_job(path, data)
     return {'ok':True}
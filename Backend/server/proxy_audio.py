@@ -3,6 +3,10 @@ from flask import Flask, request, Response, jsonify
 from flask_cors import CORS
 import requests
 from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.wsgi import wrap_file
+
+# Read size for the upstream body; large reads keep Python out of the copy loop
+PROXY_CHUNK_SIZE = 256 * 1024
 
 app = Flask(__name__)
 # Allow all origins for local dev. Restrict in production!
@@ -46,15 +50,12 @@ def proxy_audio():
     headers["Access-Control-Allow-Methods"] = "POST, OPTIONS"
     headers["Access-Control-Allow-Headers"] = "Content-Type"
 
-    def generate():
-        try:
-            for chunk in upstream.iter_content(chunk_size=8192):
-                if chunk:
-                    yield chunk
-        finally:
-            upstream.close()
-
-    return Response(generate(), headers=headers, status=200)
+    # Hand the raw upstream stream to the server's wsgi.file_wrapper (when it
+    # has one) instead of re-yielding small chunks from a Python generator.
+    # decode_content keeps gzip/deflate transparent, as iter_content was.
+    upstream.raw.decode_content = True
+    body = wrap_file(request.environ, upstream.raw, buffer_size=PROXY_CHUNK_SIZE)
+    return Response(body, headers=headers, status=200, direct_passthrough=True)
 
 
 if __name__ == "__main__":
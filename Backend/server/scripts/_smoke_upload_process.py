@@ -1,18 +1,40 @@
 import requests
 from pathlib import Path
 
+try:  # optional: stream multipart bodies straight off disk
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:  # fall back to requests' buffered multipart
+    MultipartEncoder = None
+
 backend = 'http://127.0.0.1:5000'
+
+# Keep-alive session shared by the upload and process calls
+SESSION = requests.Session()
+_ADAPTER = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+SESSION.mount('http://', _ADAPTER)
+SESSION.mount('https://', _ADAPTER)
 filep = Path('uploads') / (
     "Aca Lukas - Kuda idu ljudi kao ja - (Audio 1995).mp3"
 )
 
 print('Uploading', filep)
 with filep.open('rb') as fh:
-    r = requests.post(
-        backend + '/upload/whisper',
-        files={'file': (filep.name, fh)},
-        timeout=300,
-    )
+    if MultipartEncoder is not None:
+        encoder = MultipartEncoder(
+            fields={'file': (filep.name, fh, 'application/octet-stream')}
+        )
+        r = SESSION.post(
+            backend + '/upload/whisper',
+            data=encoder,
+            headers={'Content-Type': encoder.content_type},
+            timeout=300,
+        )
+    else:
+        r = SESSION.post(
+            backend + '/upload/whisper',
+            files={'file': (filep.name, fh)},
+            timeout=300,
+        )
     print('upload status', r.status_code)
     try:
         print(r.text)
@@ -23,7 +45,7 @@ with filep.open('rb') as fh:
     fid = j.get('file_id')
     if fid:
         print('Processing', fid)
-        pr = requests.post(
+        pr = SESSION.post(
             backend + f'/process/whisper/{fid}', timeout=600
         )
         print('process status', pr.status_code)
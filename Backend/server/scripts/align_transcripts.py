@@ -7,19 +7,33 @@ distribute timestamps evenly across the audio duration.
 Writes per-file outputs to: outputs/{id}/transcription_base.json and .txt
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import json
 import argparse
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from wav_header import read_wav_info
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
 
 ROOT = Path(__file__).resolve().parents[2]
 OUTROOT = ROOT / "outputs"
 OUTROOT.mkdir(parents=True, exist_ok=True)
 
+_SENT_RE = re.compile(r"(?<=[.!?])\s+")
+
 
 def split_sentences(text: str) -> List[str]:
-    parts = re.split(r"(?<=[.!?])\s+", text.strip())
+    parts = _SENT_RE.split(text.strip())
     return [p.strip() for p in parts if p.strip()]
 
 
@@ -43,10 +57,12 @@ def approx_align(transcript: str, duration: float) -> Dict:
         word_items = []
         if wcount > 0 and end > start:
             per = (end - start) / wcount
-            for i, w in enumerate(words):
-                wstart = round(start + i * per, 3)
-                wend = round(start + (i + 1) * per, 3)
-                word_items.append({"word": w, "start": wstart, "end": wend})
+            # word i spans bounds[i]..bounds[i + 1]; tolist() yields floats
+            bounds = (np.arange(wcount + 1) * per + start).round(3).tolist()
+            word_items = [
+                {"word": w, "start": ws, "end": we}
+                for w, ws, we in zip(words, bounds, bounds[1:])
+            ]
 
         segs.append(
             {
@@ -66,73 +82,94 @@ def write_outputs(file_id: str, alignment: Dict):
     outdir.mkdir(parents=True, exist_ok=True)
     json_path = outdir / "transcription_base.json"
     txt_path = outdir / "transcription_base.txt"
-    json_path.write_text(
-        json.dumps(alignment, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    if orjson is not None:
+        json_path.write_bytes(
+            orjson.dumps(
+                alignment, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        )
+    else:
+        json_path.write_text(
+            json.dumps(alignment, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
     with txt_path.open("w", encoding="utf-8") as fh:
         fh.write(alignment.get("text", ""))
     print(f"Wrote alignment for {file_id} -> {json_path}")
 
 
-def process_manifest(manifest: Path):
-    if not manifest.exists():
-        print("Manifest not found:", manifest)
-        return 1
-    with manifest.open("r", encoding="utf-8") as fh:
-        for line in fh:
-            if not line.strip():
-                continue
-            obj = json.loads(line)
-            file_id = obj.get("id")
-            transcript = (obj.get("transcript") or "").strip()
-            duration = obj.get("duration")
-
-            if not transcript:
-                print(f"Skipping {file_id}: no transcript")
-                continue
+def _align_one(obj: Dict):
+    """Align one manifest entry; return ``(file_id, alignment, skip_reason)``.
 
-            # attempt to compute duration from processed audio if missing
-            if duration is None:
-                proc = ROOT / "data" / "processed" / f"{file_id}.wav"
-                if proc.exists():
-                    try:
-                        import soundfile as sf
+    Runs in a worker process, so it only computes; the parent prints skip
+    reasons and writes outputs.
+    """
+    file_id = obj.get("id")
+    transcript = (obj.get("transcript") or "").strip()
+    duration = obj.get("duration")
 
-                        info = sf.info(str(proc))
-                        duration = float(info.frames) / float(info.samplerate)
-                    except Exception:
-                        duration = None
+    if not transcript:
+        return file_id, None, f"Skipping {file_id}: no transcript"
 
-            # Try an external aligner if installed (best-effort)
-            used = False
+    # attempt to compute duration from processed audio if missing
+    if duration is None:
+        proc = ROOT / "data" / "processed" / f"{file_id}.wav"
+        if proc.exists():
             try:
-                # prefer a direct import check to avoid importlib.util usage
-                import importlib
-
-                try:
-                    mod = importlib.import_module("whisper_timestamped")
-                except Exception:
-                    mod = None
-
-                if mod and hasattr(mod, "align"):
-                    # many third-party aligners accept different args.
-                    # Try alignment in a best-effort manner.
-                    aln = mod.align(
-                        transcript, file=str(Path(obj.get("audio")))
-                    )
-                    write_outputs(file_id, aln)
-                    used = True
-                if used:
-                    continue
+                info = read_wav_info(proc)
+                if info is None:
+                    import soundfile as sf
+
+                    info = sf.info(str(proc))
+                duration = float(info.frames) / float(info.samplerate)
             except Exception:
-                # ignore and fallback
-                pass
+                duration = None
+
+    # Try an external aligner if installed (best-effort)
+    try:
+        # prefer a direct import check to avoid importlib.util usage
+        import importlib
+
+        try:
+            mod = importlib.import_module("whisper_timestamped")
+        except Exception:
+            mod = None
+
+        if mod and hasattr(mod, "align"):
+            # many third-party aligners accept different args.
+            # Try alignment in a best-effort manner.
+            aln = mod.align(transcript, file=str(Path(obj.get("audio"))))
+            return file_id, aln, None
+    except Exception:
+        # ignore and fallback
+        pass
+
+    # fallback to approximate alignment
+    if duration is None:
+        return file_id, None, f"No duration for {file_id}; cannot align. Skipping."
+    return file_id, approx_align(transcript, float(duration)), None
+
 
-            # fallback to approximate alignment
-            if duration is None:
-                print(f"No duration for {file_id}; cannot align. Skipping.")
+def _iter_manifest(fh):
+    for line in fh:
+        if line.strip():
+            yield _loads(line)
+
+
+def process_manifest(manifest: Path, workers: Optional[int] = None):
+    if not manifest.exists():
+        print("Manifest not found:", manifest)
+        return 1
+    # Entries are independent and alignment is CPU-bound, so fan them out
+    # across processes; results come back in manifest order.
+    with manifest.open("r", encoding="utf-8") as fh, ProcessPoolExecutor(
+        max_workers=workers
+    ) as ex:
+        for file_id, aln, skipped in ex.map(
+            _align_one, _iter_manifest(fh), chunksize=16
+        ):
+            if skipped:
+                print(skipped)
                 continue
-            aln = approx_align(transcript, float(duration))
             write_outputs(file_id, aln)
 
     return 0
@@ -141,8 +178,14 @@ def process_manifest(manifest: Path):
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--manifest", required=True)
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="alignment processes (default: one per CPU)",
+    )
     args = p.parse_args()
-    return process_manifest(Path(args.manifest))
+    return process_manifest(Path(args.manifest), args.workers)
 
 
 if __name__ == "__main__":
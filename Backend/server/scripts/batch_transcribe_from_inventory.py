@@ -13,7 +13,7 @@ from __future__ import annotations
 import argparse
 import csv
 import json
-# sys not needed
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List
 
@@ -22,11 +22,26 @@ try:
 except Exception:
     requests = None
 
+try:  # optional: stream multipart bodies straight off disk
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:  # fall back to requests' buffered multipart
+    MultipartEncoder = None
+
 ROOT = Path(__file__).resolve().parents[2]
 MANIFESTS = ROOT / "manifests"
 UPLOADS = ROOT / "uploads"
 DEFAULT_BACKEND = "http://127.0.0.1:5000"
 
+# One keep-alive session for the whole batch so uploads and process calls
+# reuse pooled connections instead of reconnecting per file.
+if requests is not None:
+    SESSION = requests.Session()
+    _ADAPTER = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    SESSION.mount("http://", _ADAPTER)
+    SESSION.mount("https://", _ADAPTER)
+else:
+    SESSION = None
+
 
 def read_inventory() -> List[dict]:
     csv_path = MANIFESTS / "dataset_inventory.csv"
@@ -45,8 +60,19 @@ def upload_file(path: Path, backend: str) -> dict:
         raise RuntimeError("requests not available")
     url = backend.rstrip("/") + "/upload/whisper"
     with path.open("rb") as fh:
-        files = {"file": (path.name, fh)}
-        resp = requests.post(url, files=files, timeout=300)
+        if MultipartEncoder is not None:
+            encoder = MultipartEncoder(
+                fields={"file": (path.name, fh, "application/octet-stream")}
+            )
+            resp = SESSION.post(
+                url,
+                data=encoder,
+                headers={"Content-Type": encoder.content_type},
+                timeout=300,
+            )
+        else:
+            files = {"file": (path.name, fh)}
+            resp = SESSION.post(url, files=files, timeout=300)
         return resp.json()
 
 
@@ -59,18 +85,53 @@ def process_file(
     payload = {}
     if model_variant:
         payload["model_variant"] = model_variant
-    resp = requests.post(url, json=payload, timeout=600)
+    resp = SESSION.post(url, json=payload, timeout=600)
     try:
         return resp.json()
     except Exception:
         return {"http_status": resp.status_code, "text": resp.text}
 
 
+def transcribe_one(
+    pth: Path, backend: str, model_variant: str | None, dry_run: bool
+) -> dict:
+    """Upload one file and request its transcription; return its summary entry."""
+    print("->", pth)
+    if dry_run:
+        return {"path": str(pth), "action": "dry-run"}
+
+    try:
+        up = upload_file(pth, backend)
+    except Exception as e:
+        return {"path": str(pth), "error": f"upload failed: {e}"}
+
+    file_id = up.get("file_id") or up.get("id")
+    if not file_id:
+        return {"path": str(pth), "upload_response": up}
+
+    try:
+        proc = process_file(file_id, backend, model_variant)
+    except Exception as e:
+        return {
+            "path": str(pth),
+            "file_id": file_id,
+            "error": str(e),
+        }
+
+    return {"path": str(pth), "file_id": file_id, "process": proc}
+
+
 def main(argv: List[str] | None = None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--backend", default=DEFAULT_BACKEND)
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--model-variant", default=None)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="files uploaded/transcribed concurrently (default: 4)",
+    )
     args = parser.parse_args(argv)
 
     rows = read_inventory()
@@ -88,38 +149,17 @@ def main(argv: List[str] | None = None) -> int:
 
     print(f"Found {len(plan)} files to transcribe. dry-run={args.dry_run}")
 
-    results = []
-    for p in plan:
-        pth = Path(p)
-        print("->", pth)
-        if args.dry_run:
-            results.append({"path": str(pth), "action": "dry-run"})
-            continue
-
-        try:
-            up = upload_file(pth, args.backend)
-        except Exception as e:
-            results.append({"path": str(pth), "error": f"upload failed: {e}"})
-            continue
-
-        file_id = up.get("file_id") or up.get("id")
-        if not file_id:
-            results.append({"path": str(pth), "upload_response": up})
-            continue
-
-        try:
-            proc = process_file(
-                file_id, args.backend, args.model_variant
-            )
-        except Exception as e:
-            results.append({
-                "path": str(pth),
-                "file_id": file_id,
-                "error": str(e),
-            })
-            continue
-
-        results.append({"path": str(pth), "file_id": file_id, "process": proc})
+    results: List[dict | None] = [None] * len(plan)
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {
+            pool.submit(
+                transcribe_one, Path(p), args.backend, args.model_variant, args.dry_run
+            ): i
+            for i, p in enumerate(plan)
+        }
+        for fut in as_completed(futures):
+            # Keep the summary in plan order regardless of completion order
+            results[futures[fut]] = fut.result()
 
     out = MANIFESTS / "batch_transcribe_summary.json"
     out.write_text(
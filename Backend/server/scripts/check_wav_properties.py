@@ -12,6 +12,15 @@ try:
 except Exception:
     sf = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from wav_header import read_wav_info
+
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 def check(manifest_path: Path):
     if not manifest_path.exists():
@@ -21,22 +30,25 @@ def check(manifest_path: Path):
         for line in fh:
             if not line.strip():
                 continue
-            obj = json.loads(line)
+            obj = _loads(line)
             audio = Path(obj.get('audio'))
             if not audio.exists():
                 print(f"MISSING: {audio}")
                 continue
-            if not sf:
-                print(f"soundfile not installed — cannot inspect {audio}")
-                continue
-            try:
-                info = sf.info(str(audio))
-                print(
-                    f"{audio.name}: samplerate={info.samplerate}, "
-                    f"channels={info.channels}, subtype={info.subtype}"
-                )
-            except Exception as e:
-                print(f"FAILED to read {audio}: {e}")
+            info = read_wav_info(audio)
+            if info is None:
+                if not sf:
+                    print(f"soundfile not installed — cannot inspect {audio}")
+                    continue
+                try:
+                    info = sf.info(str(audio))
+                except Exception as e:
+                    print(f"FAILED to read {audio}: {e}")
+                    continue
+            print(
+                f"{audio.name}: samplerate={info.samplerate}, "
+                f"channels={info.channels}, subtype={info.subtype}"
+            )
     return 0
 
 
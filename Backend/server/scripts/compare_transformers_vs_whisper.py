@@ -13,12 +13,18 @@ The script will:
      transcribe, and then
  - print both transcripts and a simple token overlap score.
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import argparse
 import tempfile
 import sys
 import time
 
+try:  # optional: fast C++ edit distance
+    from rapidfuzz.distance import Levenshtein
+except ImportError:
+    Levenshtein = None
+
 
 def gen_sine_wav(path, duration=1.0, sr=16000, freq=440.0):
     import numpy as np
@@ -30,25 +36,22 @@ def gen_sine_wav(path, duration=1.0, sr=16000, freq=440.0):
 
 
 def gen_tts_wav(path, text: str = 'Hello world this is a quick test'):
-    """Synthesize deterministic TTS using Windows SAPI via PowerShell.
+    """Synthesize deterministic TTS in-process with pyttsx3.
 
-    This is platform-specific (Windows). On other platforms, fallback to
-    generating a sine wave (not ideal).
+    pyttsx3 drives the platform engine (SAPI5 on Windows, NSSpeech on
+    macOS, eSpeak on Linux). If it is not installed or synthesis fails,
+    fall back to generating a sine wave (not ideal).
     """
-    import subprocess
-    # PowerShell command to synthesize WAV using System.Speech
-    ps_cmd = (
-        "Add-Type -AssemblyName System.speech;"
-        " $s = New-Object System.Speech.Synthesis.SpeechSynthesizer;"
-        f" $s.SetOutputToWaveFile('{path}');"
-        " $s.Rate = 0;"
-        f" $s.Speak(\"{text}\");"
-        " $s.Dispose();"
-    )
     try:
-        subprocess.run([
-            'powershell', '-NoProfile', '-Command', ps_cmd
-        ], check=True)
+        import pyttsx3
+    except ImportError as e:
+        print('pyttsx3 not available, falling back to sine:', e)
+        gen_sine_wav(path)
+        return
+    try:
+        engine = pyttsx3.init()
+        engine.save_to_file(text, str(path))
+        engine.runAndWait()
     except Exception as e:
         print('TTS synthesis failed, falling back to sine:', e)
         gen_sine_wav(path)
@@ -63,70 +66,44 @@ def simple_token_overlap(a, b):
     return len(s) / max(len(set(ta)), 1)
 
 
+def _edit_distance(r, h):
+    """Word-level Levenshtein distance, one vectorized DP row per ref word."""
+    import numpy as np
+
+    # encode tokens as ints so each row compares int arrays
+    _, ids = np.unique(np.array(r + h), return_inverse=True)
+    r_ids, h_ids = ids[:len(r)], ids[len(r):]
+    cols = np.arange(len(h) + 1)
+    prev = cols.copy()
+    for i, tok in enumerate(r_ids, 1):
+        # match/substitute from the diagonal, delete from the row above
+        best = np.empty_like(prev)
+        best[0] = i
+        best[1:] = np.minimum(prev[:-1] + (h_ids != tok), prev[1:] + 1)
+        # inserts chain along the row: d[j] = min over k <= j of best[k] + (j - k)
+        prev = np.minimum.accumulate(best - cols) + cols
+    return int(prev[-1])
+
+
 def wer(ref, hyp):
     """Compute a simple Word Error Rate (WER) between ref and hyp."""
     r = ref.lower().split()
     h = hyp.lower().split()
-    # classic dynamic programming edit distance
-    import numpy as np
-
-    d = np.zeros((len(r) + 1, len(h) + 1), dtype=int)
-    for i in range(len(r) + 1):
-        d[i, 0] = i
-    for j in range(len(h) + 1):
-        d[0, j] = j
-    for i in range(1, len(r) + 1):
-        for j in range(1, len(h) + 1):
-            if r[i - 1] == h[j - 1]:
-                d[i, j] = d[i - 1, j - 1]
-            else:
-                substitute = d[i - 1, j - 1] + 1
-                insert = d[i, j - 1] + 1
-                delete = d[i - 1, j] + 1
-                d[i, j] = min(substitute, insert, delete)
     if len(r) == 0:
         return 1.0 if len(h) > 0 else 0.0
-    return d[len(r), len(h)] / len(r)
-
-
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--transformers-dir', required=True)
-    parser.add_argument('--whisper-pt', required=True)
-    parser.add_argument(
-        '--language',
-        help=(
-            'Optional language to pass to models. Do not force a language '
-            'unless you want deterministic behavior.'
-        ),
-    )
-    parser.add_argument(
-        '--tts-text',
-        help='TTS text to synthesize (platform-specific)',
-        default='Hello world this is a quick test',
-    )
-    args = parser.parse_args()
-
-    tdir = Path(args.transformers_dir)
-    wpt = Path(args.whisper_pt)
-    if not tdir.exists():
-        print('Transformers dir not found:', tdir)
-        return 2
-    if not wpt.exists():
-        print('Whisper checkpoint not found:', wpt)
-        return 3
+    if Levenshtein is not None:
+        # bit-parallel C++ kernel; accepts sequences of hashable tokens
+        dist = Levenshtein.distance(r, h)
+    else:
+        dist = _edit_distance(r, h)
+    return dist / len(r)
 
-    tmp = Path(tempfile.gettempdir()) / 'compare_transformers_vs_whisper.wav'
-    print('Generating deterministic spoken test WAV:', tmp)
-    gen_tts_wav(str(tmp), text=args.tts_text)
 
-    # 1) Transformers transcription
+def run_transformers(args, tdir, tmp):
+    """Transcribe ``tmp`` with the Transformers model; return (text, secs)."""
     print('\nLoading Transformers model from', tdir)
-    try:
-        from transformers import AutoProcessor, AutoModelForSpeechSeq2Seq
-    except Exception as e:
-        print('transformers not available:', e)
-        return 4
+    from transformers import AutoProcessor, AutoModelForSpeechSeq2Seq
+
     proc = AutoProcessor.from_pretrained(str(tdir))
     tmodel = AutoModelForSpeechSeq2Seq.from_pretrained(str(tdir))
     # optionally provide generation kwargs if language/task explicitly set
@@ -150,29 +127,45 @@ def main():
         raise RuntimeError(
             'Processor did not return input_features or input_values'
         )
+    tmodel.eval()
+    # Full precision by default, since this script compares transcripts.
+    # --half trades exactness for speed: FP16 on CUDA (the model is moved
+    # there first; from_pretrained leaves it on CPU), BF16 otherwise.
+    dtype = torch.float32
+    if args.half:
+        if torch.cuda.is_available():
+            tmodel = tmodel.to('cuda')
+            dtype = torch.float16
+            torch.backends.cudnn.benchmark = True
+        else:
+            dtype = torch.bfloat16
+        tmodel = tmodel.to(dtype)
+        # process-global: also lets the concurrently running Whisper thread
+        # use TF32 matmuls, so it is only set when --half is requested
+        torch.set_float32_matmul_precision('high')
+    model_device = next(tmodel.parameters()).device
+    if args.compile and hasattr(torch, 'compile') and model_device.type != 'mps':
+        # compile the forward generate() calls per decoding step; the
+        # first call pays the compilation cost
+        tmodel.forward = torch.compile(tmodel.forward, mode='reduce-overhead')
     # run inference
     t0 = time.time()
-    with torch.no_grad():
+    with torch.inference_mode():
         # move inputs to model device if needed
-        model_device = next(tmodel.parameters()).device
-        if input_values.device != model_device:
-            input_values = input_values.to(model_device)
-        # Transformers whisper expects input_features=... for generate
-    # pass gen kwargs only if provided. Transformers will use its
-    # defaults otherwise.
-    generated = tmodel.generate(input_features=input_values, **gen_kwargs)
+        input_values = input_values.to(model_device, dtype)
+        # Transformers whisper expects input_features=... for generate;
+        # pass gen kwargs only if provided. Transformers will use its
+        # defaults otherwise.
+        generated = tmodel.generate(input_features=input_values, **gen_kwargs)
     ttrans = proc.batch_decode(generated, skip_special_tokens=True)[0]
     ttime = time.time() - t0
-    print(f'Transformers transcript (time={ttime:.2f}s):')
-    print('  ', ttrans)
+    return ttrans, ttime
 
-    # 2) Whisper checkpoint transcription
+
+def run_whisper(args, wpt, tmp):
+    """Transcribe ``tmp`` with the converted checkpoint; return (text, secs)."""
     print('\nLoading converted Whisper checkpoint:', wpt)
-    try:
-        import whisper
-    except Exception as e:
-        print('whisper lib not available:', e)
-        return 5
+    import whisper
 
     # reuse existing loader if present
     loader_path = Path(__file__).parent / 'whisper_loader.py'
@@ -201,15 +194,98 @@ def main():
     print('Loaded whisper model in', f'{wtime:.2f}s')
 
     w0 = time.time()
+    # keep whisper's own precision default (FP16 on CUDA) unless --fp32
+    decode_kwargs = {'fp16': False} if args.fp32 else {}
     # pass language/task only when provided by the user; don't force English
     if args.language:
         wres = model.transcribe(
-            str(tmp), language=args.language, task='transcribe'
+            str(tmp), language=args.language, task='transcribe', **decode_kwargs
         )
     else:
-        wres = model.transcribe(str(tmp))
+        wres = model.transcribe(str(tmp), **decode_kwargs)
     wtime2 = time.time() - w0
     wtrans = wres.get('text', '')
+    return wtrans, wtime2
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--transformers-dir', required=True)
+    parser.add_argument('--whisper-pt', required=True)
+    parser.add_argument(
+        '--language',
+        help=(
+            'Optional language to pass to models. Do not force a language '
+            'unless you want deterministic behavior.'
+        ),
+    )
+    parser.add_argument(
+        '--tts-text',
+        help='TTS text to synthesize (via pyttsx3)',
+        default='Hello world this is a quick test',
+    )
+    parser.add_argument(
+        '--half',
+        action='store_true',
+        help=(
+            'run the Transformers model in reduced precision (FP16 on CUDA, '
+            'BF16 on CPU); transcripts may differ from FP32'
+        ),
+    )
+    parser.add_argument(
+        '--fp32',
+        action='store_true',
+        help='decode with whisper in FP32 instead of its FP16 default on CUDA',
+    )
+    parser.add_argument(
+        '--sequential',
+        action='store_true',
+        help='run the two models one after the other instead of concurrently',
+    )
+    parser.add_argument(
+        '--compile',
+        action='store_true',
+        help='torch.compile the Transformers model forward before generate',
+    )
+    args = parser.parse_args()
+
+    tdir = Path(args.transformers_dir)
+    wpt = Path(args.whisper_pt)
+    if not tdir.exists():
+        print('Transformers dir not found:', tdir)
+        return 2
+    if not wpt.exists():
+        print('Whisper checkpoint not found:', wpt)
+        return 3
+
+    tmp = Path(tempfile.gettempdir()) / 'compare_transformers_vs_whisper.wav'
+    print('Generating deterministic spoken test WAV:', tmp)
+    gen_tts_wav(str(tmp), text=args.tts_text)
+
+    # check both runtimes up front so the exit codes do not depend on
+    # which model thread gets to its import first
+    try:
+        import transformers  # noqa: F401
+    except Exception as e:
+        print('transformers not available:', e)
+        return 4
+    try:
+        import whisper  # noqa: F401
+    except Exception as e:
+        print('whisper lib not available:', e)
+        return 5
+
+    # 1) Transformers and 2) Whisper transcription. Both spend their time
+    # in torch kernels that release the GIL, so they overlap on two
+    # threads; --sequential runs them one after the other for clean timings.
+    with ThreadPoolExecutor(max_workers=1 if args.sequential else 2) as ex:
+        tfut = ex.submit(run_transformers, args, tdir, tmp)
+        wfut = ex.submit(run_whisper, args, wpt, tmp)
+        ttrans, ttime = tfut.result()
+        wtrans, wtime2 = wfut.result()
+
+    print(f'\nTransformers transcript (time={ttime:.2f}s):')
+    print('  ', ttrans)
     print(f'Whisper transcript (time={wtime2:.2f}s):')
     print('  ', wtrans)
 
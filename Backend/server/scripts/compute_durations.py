@@ -10,22 +10,41 @@ Options:
     --write              Overwrite the manifest with updated duration
                                              fields (backups created).
 """
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 from pathlib import Path
 import json
 import argparse
+import os
 
 try:
     import soundfile as sf
 except Exception:
     sf = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from wav_header import wav_duration
+
+# orjson only parses; lines are written with json.dumps so a rewritten
+# manifest keeps json's ", "/": " separators byte for byte
+_loads = orjson.loads if orjson is not None else json.loads
+
 ROOT = Path(__file__).resolve().parents[2]
 PROCESSED = ROOT / "data" / "processed"
+# Manifest lines resolved per thread-pool round
+BATCH_SIZE = 1024
 
 
 def get_duration(path: Path):
     if not path.exists():
         return None
+    duration = wav_duration(path)
+    if duration is not None:
+        return duration
     if not sf:
         return None
     try:
@@ -35,48 +54,83 @@ def get_duration(path: Path):
         return None
 
 
+def _update_batch(ex, batch, out):
+    """Fill durations for one batch of (obj, audio) pairs; return changes.
+
+    Header reads are I/O-bound, so they are overlapped across the pool;
+    map() keeps results in manifest order. Lines go to ``out`` if given.
+    """
+    changed = 0
+    durations = ex.map(get_duration, [audio for _, audio in batch])
+    for (obj, _), duration in zip(batch, durations):
+        if duration is not None:
+            # round to 3 decimals
+            dur = round(duration, 3)
+            if obj.get("duration") != dur:
+                obj["duration"] = dur
+                changed += 1
+
+        if out is not None:
+            out.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    return changed
+
+
 def process_manifest(manifest: Path, replace_processed=False, write=False):
     if not manifest.exists():
         print("Manifest not found:", manifest)
         return 1
-    out_lines = []
+    # Stream updated lines to a temp file in bounded batches so memory stays
+    # flat for large manifests; it replaces the manifest only on --write.
+    tmp = manifest.with_suffix(".tmp.jsonl")
     changed = 0
-    with manifest.open("r", encoding="utf-8") as fh:
-        for line in fh:
-            if not line.strip():
-                continue
-            obj = json.loads(line)
-            audio = Path(obj.get("audio") or "")
-            id_ = obj.get("id")
-
-            # Optionally replace with processed file if available
-            if replace_processed and id_:
-                proc = PROCESSED / f"{id_}.wav"
-                if proc.exists():
-                    if str(proc) != str(audio):
-                        obj["audio"] = str(proc)
-                        changed += 1
-                    audio = proc
-
-            duration = get_duration(audio)
-            if duration is not None:
-                # round to 3 decimals
-                dur = round(duration, 3)
-                if obj.get("duration") != dur:
-                    obj["duration"] = dur
-                    changed += 1
-
-            out_lines.append(json.dumps(obj, ensure_ascii=False))
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    try:
+        with manifest.open("r", encoding="utf-8") as fh, ThreadPoolExecutor(
+            max_workers=workers
+        ) as ex, (
+            tmp.open("w", encoding="utf-8") if write else contextlib.nullcontext()
+        ) as out:
+            batch = []
+            for line in fh:
+                if not line.strip():
+                    continue
+                obj = _loads(line)
+                audio = Path(obj.get("audio") or "")
+                id_ = obj.get("id")
+
+                # Optionally replace with processed file if available; done
+                # before the duration lookups so they read the final path
+                if replace_processed and id_:
+                    proc = PROCESSED / f"{id_}.wav"
+                    if proc.exists():
+                        if str(proc) != str(audio):
+                            obj["audio"] = str(proc)
+                            changed += 1
+                        audio = proc
+
+                batch.append((obj, audio))
+                if len(batch) >= BATCH_SIZE:
+                    changed += _update_batch(ex, batch, out)
+                    batch = []
+            if batch:
+                changed += _update_batch(ex, batch, out)
+    except BaseException:
+        # never leave a half-written temp manifest behind
+        if write:
+            tmp.unlink(missing_ok=True)
+        raise
 
     if write and changed > 0:
         backup = manifest.with_suffix(".bak.jsonl")
-        manifest.replace(backup)
-        manifest.write_text("\n".join(out_lines) + "\n", encoding="utf-8")
+        os.replace(manifest, backup)
+        os.replace(tmp, manifest)
         print(
             f"Wrote updated manifest (backup at {backup}). "
             f"Changes: {changed}"
         )
     else:
+        if write:
+            tmp.unlink()
         print(f"Dry run complete. Detected changes: {changed}")
     return 0
 
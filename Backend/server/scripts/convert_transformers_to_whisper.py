@@ -12,19 +12,26 @@ Strategy:
     2) suffix/prefix heuristics
     3) unique-shape heuristic (if only one unmatched parameter has that shape)
 - Save checkpoint as a dict with keys 'dims' and 'model_state_dict' so
-  whisper.load_model(path) can potentially load it.
+  whisper.load_model(path) can potentially load it (or, with
+  ``--format safetensors``, as safetensors weights plus a dims JSON).
 
 This is a best-effort converter and will log mappings and any mismatches.
 """
+from collections import Counter, defaultdict
 from pathlib import Path
 import argparse
+import json
+import os
+import re
 import sys
 import torch
 
+_MODELS_DIR = Path(__file__).resolve().parents[2] / 'models' / 'whisper'
+
 
 def model_dir_for(name: str) -> Path:
     safe = name.replace('/', '_').replace(':', '_')
-    return Path(__file__).resolve().parents[2] / 'models' / 'whisper' / safe
+    return _MODELS_DIR / safe
 
 
 def serialize_dims(dims):
@@ -35,6 +42,164 @@ def serialize_dims(dims):
         return dict(dims)
 
 
+# Substring rewrites aligning transformers parameter names with whisper's
+TRANSFORMER_NAME_SUBS = [
+    ('layers.', 'blocks.'),
+    ('self_attn.', 'attn.'),
+    ('self_attn_layer_norm', 'attn_ln'),
+    # transformers use 'encoder_attn_layer_norm' names for cross-attn
+    # layer norms; normalize them to whisper's 'cross_attn_ln'
+    ('encoder_attn_layer_norm', 'cross_attn_ln'),
+    ('final_layer_norm', 'mlp_ln'),
+    ('fc1.', 'mlp.0.'),
+    ('fc2.', 'mlp.2.'),
+    ('fc1', 'mlp.0'),
+    ('fc2', 'mlp.2'),
+    ('encoder_attn', 'cross_attn'),
+    ('out_proj', 'out'),
+    ('embed_positions', 'positional_embedding'),
+    ('embed_tokens', 'token_embedding'),
+    ('self_attn_layer_norm.weight', 'attn_ln.weight'),
+    # map whisper 'ln_post' to transformer 'final_layer_norm'
+    ('ln_post', 'final_layer_norm'),
+]
+_TRANSFORMER_NAME_TABLE = dict(TRANSFORMER_NAME_SUBS)
+# Longest alternative first so e.g. 'encoder_attn_layer_norm' wins over
+# 'encoder_attn' and 'fc1.' over 'fc1', matching the sequential replaces
+# (no replacement output contains a later pattern).
+_TRANSFORMER_NAME_RE = re.compile(
+    '|'.join(
+        re.escape(a)
+        for a in sorted(_TRANSFORMER_NAME_TABLE, key=len, reverse=True)
+    )
+)
+
+
+def _transformer_name_sub(m):
+    return _TRANSFORMER_NAME_TABLE[m.group(0)]
+
+
+def cpu_state_dict(module):
+    """Return module.state_dict() with any non-CPU tensor moved to CPU.
+
+    CPU tensors are kept by reference rather than rebuilt into a new dict.
+    """
+    state = module.state_dict()
+    for k, v in state.items():
+        if v.device.type != 'cpu':
+            state[k] = v.detach().cpu()
+    return state
+
+
+def load_reference_state(name):
+    """Return ``(dims, state_dict)`` of a whisper reference checkpoint.
+
+    The checkpoint file is memory-mapped with ``torch.load(mmap=True)``
+    rather than materialized into a model, so reference tensors are only
+    paged in when read (shape lookups touch none; saving reads the data).
+    Falls back to ``whisper.load_model`` when mmap loading is unavailable.
+    """
+    import whisper
+
+    try:
+        if os.path.isfile(name):
+            path = name
+        else:
+            root = os.path.join(
+                os.getenv('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+                'whisper',
+            )
+            # same cache location whisper.load_model downloads into; relies
+            # on the private whisper._download/_MODELS, which may change
+            # between releases (any failure falls back to load_model below)
+            path = whisper._download(whisper._MODELS[name], root, False)
+        ckpt = torch.load(path, map_location='cpu', mmap=True, weights_only=True)
+        return dict(ckpt['dims']), ckpt['model_state_dict']
+    except Exception as e:
+        print('mmap load of reference failed, loading full model:', e)
+        ref = whisper.load_model(name, device='cpu')
+        return serialize_dims(ref.dims), cpu_state_dict(ref)
+
+
+def load_reference_shapes(name):
+    """Return ``(dims, {param: shape}, state_dict or None)`` for a reference.
+
+    Names and shapes of a named reference are cached in
+    ``model_dir_for(name)/ref_shape_map.json`` as ``{name: [shape, dtype]}``;
+    on a cache hit no weights are loaded and the state dict is None. A miss
+    loads the reference once and writes the cache. Checkpoint paths are not
+    cached: the file can change under the same name, and mmap-loading a
+    local file for its shapes is already cheap.
+    """
+    if os.path.isfile(name):
+        print('Loading reference checkpoint to obtain target shapes:', name)
+        dims, state = load_reference_state(name)
+        return dims, {k: tuple(v.shape) for k, v in state.items()}, state
+
+    cache = model_dir_for(name) / 'ref_shape_map.json'
+    try:
+        cached = json.loads(cache.read_text(encoding='utf-8'))
+        shapes = {k: tuple(v[0]) for k, v in cached['params'].items()}
+        print('Using cached reference shape map:', cache)
+        return cached['dims'], shapes, None
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        pass
+
+    print('Loading reference whisper model:', name)
+    print('Loading reference to obtain target shapes')
+    dims, state = load_reference_state(name)
+    shapes = {k: tuple(v.shape) for k, v in state.items()}
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        cache.write_text(
+            json.dumps({
+                'dims': dims,
+                'params': {
+                    k: [list(v.shape), str(v.dtype)] for k, v in state.items()
+                },
+            }),
+            encoding='utf-8',
+        )
+    except OSError as e:
+        print('Could not write reference shape cache:', e)
+    return dims, shapes, state
+
+
+class _SuffixShapeIndex:
+    """Unmapped transformer names bucketed by (shape, trailing tokens).
+
+    Replaces the nested ``for r ... for t in unmapped_t`` suffix scans with
+    a dict lookup per suffix length; mapped names are dropped via remove().
+    """
+
+    def __init__(self, names, shape_of, tokens_of, lengths=(4, 3, 2)):
+        self.lengths = lengths
+        self._buckets = defaultdict(dict)  # key -> insertion-ordered names
+        self._keys = {}
+        for name in names:
+            toks = tokens_of(name)
+            shape = shape_of(name)
+            keys = [
+                (shape, n, tuple(toks[-n:])) for n in lengths if len(toks) >= n
+            ]
+            self._keys[name] = keys
+            for key in keys:
+                self._buckets[key][name] = None
+
+    def find(self, shape, toks):
+        """Return a name with this shape sharing the longest suffix, or None."""
+        for n in self.lengths:
+            if len(toks) >= n:
+                bucket = self._buckets.get((shape, n, tuple(toks[-n:])))
+                if bucket:
+                    return next(iter(bucket))
+        return None
+
+    def remove(self, name):
+        for key in self._keys.pop(name, ()):
+            self._buckets[key].pop(name, None)
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -45,6 +210,25 @@ def main():
         help='Whisper reference model name',
         default='large-v2',
     )
+    parser.add_argument(
+        '--format',
+        choices=('pt', 'safetensors'),
+        default='pt',
+        help=(
+            'pt: whisper.load_model-compatible checkpoint; safetensors: '
+            'model_converted.safetensors plus a model_converted.dims.json '
+            'sidecar, loadable lazily via mmap'
+        ),
+    )
+    parser.add_argument(
+        '--skip-empty-passes',
+        action='store_true',
+        help=(
+            'skip heuristic passes that mapped nothing according to the '
+            'pass_hits of an existing mapping_report.json in --local-dir '
+            '(run once without it to refresh the profile)'
+        ),
+    )
     args = parser.parse_args()
 
     local = Path(args.local_dir)
@@ -58,75 +242,98 @@ def main():
     except Exception as e:
         print('transformers not available:', e)
         return 3
+    if args.format == 'safetensors':
+        try:
+            from safetensors.torch import save_file
+        except ImportError as e:
+            print('safetensors not available:', e)
+            return 4
 
     tmodel = AutoModelForSpeechSeq2Seq.from_pretrained(str(local))
-    t_state = {k: v.cpu() for k, v in tmodel.state_dict().items()}
-
-    print('Loading reference whisper model:', args.whisper_ref)
-    print('Loading reference to obtain target shapes')
-    import whisper
+    t_state = cpu_state_dict(tmodel)
+    # Shapes as plain tuples, computed once: the passes compare them in
+    # their inner loops, where tuple equality is cheaper than building a
+    # tuple or comparing torch.Size each time
+    t_shape = {k: tuple(v.shape) for k, v in t_state.items()}
 
-    # Load reference whisper model (may download if needed)
-    ref = whisper.load_model(args.whisper_ref, device='cpu')
-    ref_state = {k: v.cpu() for k, v in ref.state_dict().items()}
+    # The mapping passes only need reference names and shapes; those come
+    # from a small per-reference cache, and weights load only if still needed
+    ref_dims, ref_shapes, ref_state = load_reference_shapes(args.whisper_ref)
 
     mapped = {}
     mapping_reasons = {}
-    unmapped_ref = set(ref_state.keys())
+    unmapped_ref = set(ref_shapes.keys())
+    # Passes walk this fixed order and skip names already in `mapped`,
+    # instead of copying the shrinking unmapped_ref set each time
+    ref_order = list(ref_shapes)
     unmapped_t = set(t_state.keys())
 
     # 1) exact name matches
-    for name in list(unmapped_ref):
-        if name in t_state and ref_state[name].shape == t_state[name].shape:
+    for name in ref_order:
+        if name in mapped:
+            continue
+        if name in t_state and ref_shapes[name] == t_shape[name]:
             mapped[name] = t_state[name]
             mapping_reasons[name] = {'reason': 'exact_name'}
             unmapped_ref.remove(name)
             unmapped_t.remove(name)
 
+    # Split every name into its dotted parts once; the suffix passes, their
+    # alias-normalized variants and the token-presence set all reuse these.
+    name_parts = {n: tuple(n.split('.')) for n in (*ref_shapes, *t_state)}
+
+    parts = name_parts.__getitem__
+
+    shape_of_t = t_shape.__getitem__
+
+    def unmapped_t_by_shape():
+        # Unmapped transformer names grouped by shape; the passes keep the
+        # buckets in sync as they map names, so a ref whose shape has no
+        # bucket skips candidate generation and candidates are probed in
+        # the bucket alone.
+        by_shape = defaultdict(set)
+        for t in unmapped_t:
+            by_shape[shape_of_t(t)].add(t)
+        return by_shape
+
     # 2) suffix-based heuristic: try to match by last N parts
-    def parts(name):
-        return name.split('.')
-
-    for r in list(unmapped_ref):
-        rparts = parts(r)
-        found = None
-        # prefer longer suffix matches
-        for t in list(unmapped_t):
-            tparts = parts(t)
-            # try matching trailing 4 parts, then 3, then 2
-            for n in (4, 3, 2):
-                if (
-                    len(rparts) >= n
-                    and len(tparts) >= n
-                    and rparts[-n:] == tparts[-n:]
-                ):
-                    if ref_state[r].shape == t_state[t].shape:
-                        found = t
-                        break
-            if found:
+    def pass_suffix():
+        # prefer longer suffix matches: trailing 4 parts, then 3, then 2
+        suffix_idx = _SuffixShapeIndex(unmapped_t, shape_of_t, parts)
+        for r in ref_order:
+            if not unmapped_t:
                 break
-        if found:
-            mapped[r] = t_state[found]
-            mapping_reasons[r] = {'reason': 'suffix_match', 'mapped_to': found}
-            unmapped_ref.remove(r)
-            unmapped_t.remove(found)
+            if r in mapped:
+                continue
+            found = suffix_idx.find(ref_shapes[r], parts(r))
+            if found:
+                mapped[r] = t_state[found]
+                mapping_reasons[r] = {'reason': 'suffix_match', 'mapped_to': found}
+                unmapped_ref.remove(r)
+                unmapped_t.remove(found)
+                suffix_idx.remove(found)
 
     # 3) unique-shape heuristic
-    shape_to_tnames = {}
-    for t in unmapped_t:
-        s = tuple(t_state[t].shape)
-        shape_to_tnames.setdefault(s, []).append(t)
-
-    for r in list(unmapped_ref):
-        s = tuple(ref_state[r].shape)
-        candidates = shape_to_tnames.get(s, [])
-        if len(candidates) == 1:
-            tname = candidates[0]
-            mapped[r] = t_state[tname]
-            mapping_reasons[r] = {'reason': 'unique_shape', 'mapped_to': tname}
-            unmapped_ref.remove(r)
-            unmapped_t.remove(tname)
-            shape_to_tnames[s].remove(tname)
+    def pass_unique_shape():
+        shape_to_tnames = {}
+        for t in unmapped_t:
+            s = t_shape[t]
+            shape_to_tnames.setdefault(s, []).append(t)
+
+        for r in ref_order:
+            if not unmapped_t:
+                break
+            if r in mapped:
+                continue
+            s = ref_shapes[r]
+            candidates = shape_to_tnames.get(s, [])
+            if len(candidates) == 1:
+                tname = candidates[0]
+                mapped[r] = t_state[tname]
+                mapping_reasons[r] = {'reason': 'unique_shape', 'mapped_to': tname}
+                unmapped_ref.remove(r)
+                unmapped_t.remove(tname)
+                shape_to_tnames[s].remove(tname)
 
     # 4) prefix normalization heuristics - strip common wrappers like
     # 'model.' or 'base_model.' from transformers names and try matching
@@ -137,19 +344,24 @@ def main():
                 return name[len(p):]
         return name
 
-    norm_t_map = {normalize(t): t for t in unmapped_t}
-    for r in list(unmapped_ref):
-        nr = normalize(r)
-        if nr in norm_t_map:
-            t = norm_t_map[nr]
-            if ref_state[r].shape == t_state[t].shape:
-                mapped[r] = t_state[t]
-                mapping_reasons[r] = {
-                    'reason': 'normalized_name',
-                    'mapped_to': t,
-                }
-                unmapped_ref.remove(r)
-                unmapped_t.remove(t)
+    def pass_normalize_prefix():
+        norm_t_map = {normalize(t): t for t in unmapped_t}
+        for r in ref_order:
+            if not unmapped_t:
+                break
+            if r in mapped:
+                continue
+            nr = normalize(r)
+            if nr in norm_t_map:
+                t = norm_t_map[nr]
+                if ref_shapes[r] == t_shape[t]:
+                    mapped[r] = t_state[t]
+                    mapping_reasons[r] = {
+                        'reason': 'normalized_name',
+                        'mapped_to': t,
+                    }
+                    unmapped_ref.remove(r)
+                    unmapped_t.remove(t)
 
     # 5) alias and token-normalized suffix matching
     # Build a small alias map for common transformer->whisper token differences
@@ -168,36 +380,27 @@ def main():
     }
 
     def normalize_tokens(name):
-        # split, replace aliases, and return token list
-        toks = name.split('.')
-        out = []
-        for t in toks:
-            out.append(alias_tokens.get(t, t))
-        return out
-
-    # try normalized suffix matches (4..2 tokens) using token aliasing
-    # (norm_tokens_map not needed; we iterate directly over unmapped_t)
-    for r in list(unmapped_ref):
-        r_toks = normalize_tokens(r)
-        found = None
-        for t in list(unmapped_t):
-            t_toks = normalize_tokens(t)
-            for n in (4, 3, 2):
-                if len(r_toks) >= n and len(t_toks) >= n:
-                    if r_toks[-n:] == t_toks[-n:]:
-                        if ref_state[r].shape == t_state[t].shape:
-                            found = t
-                            break
-            if found:
+        # replace aliases in the pre-split name and return the token tuple
+        return tuple(alias_tokens.get(t, t) for t in name_parts[name])
+
+    def pass_alias():
+        # try normalized suffix matches (4..2 tokens) using token aliasing
+        token_idx = _SuffixShapeIndex(unmapped_t, shape_of_t, normalize_tokens)
+        for r in ref_order:
+            if not unmapped_t:
                 break
-        if found:
-            mapped[r] = t_state[found]
-            mapping_reasons[r] = {
-                'reason': 'token_normalized_suffix',
-                'mapped_to': found,
-            }
-            unmapped_ref.remove(r)
-            unmapped_t.remove(found)
+            if r in mapped:
+                continue
+            found = token_idx.find(ref_shapes[r], normalize_tokens(r))
+            if found:
+                mapped[r] = t_state[found]
+                mapping_reasons[r] = {
+                    'reason': 'token_normalized_suffix',
+                    'mapped_to': found,
+                }
+                unmapped_ref.remove(r)
+                unmapped_t.remove(found)
+                token_idx.remove(found)
 
     # 6) inverse-alias full-name substitution
     # For remaining unmapped refs, try to generate candidate transformer names
@@ -217,53 +420,59 @@ def main():
         ],
     }
 
-    from itertools import product
-
-    def gen_candidates(rname):
-        toks = rname.split('.')
-        pools = []
-        for tok in toks:
-            # handle numbered mlp tokens like 'mlp', '0' -> 'mlp0'
-            if tok.isdigit() and pools:
-                # keep digits as their own token
-                pools.append([tok])
+    from itertools import islice, product
+
+    def pass_inverse_alias():
+        shape_to_unmapped_t = unmapped_t_by_shape()
+
+        # Drop alias options made of tokens that appear in no unmapped
+        # transformer name; no candidate built from them can match, so they
+        # would only spend the combination budget.
+        token_presence = {tok for t in unmapped_t for tok in name_parts[t]}
+        live_alias = {
+            key: [
+                opt for opt in opts
+                if all(tok in token_presence for tok in opt.split('.'))
+            ] or opts
+            for key, opts in inverse_alias.items()
+        }
+
+        def gen_candidates(rname):
+            pools = []
+            for tok in rname.split('.'):
+                # keep digits (layer indices) as their own token
+                if tok.isdigit() and pools:
+                    pools.append([tok])
+                else:
+                    pools.append(live_alias.get(tok, [tok]))
+            # Limit combinatorial explosion; generated lazily so an early
+            # hit does not build the remaining names
+            max_comb = 256
+            for comb in islice(product(*pools), max_comb):
+                yield '.'.join(comb)
+
+        for r in ref_order:
+            if not unmapped_t:
+                break
+            if r in mapped:
                 continue
-                # attach digit to previous token key
-                # signal by using e.g. 'mlp0'
-                # we'll just keep digit as-is and handle in candidates
-                pools.append([tok])
+            same_shape = shape_to_unmapped_t.get(ref_shapes[r])
+            if not same_shape:
                 continue
-            low = tok
-            if low in inverse_alias:
-                pools.append(inverse_alias[low])
-            else:
-                pools.append([tok])
-        # Limit combinatorial explosion
-        max_comb = 256
-        candidates = []
-        for comb in product(*pools):
-            cand = '.'.join(comb)
-            candidates.append(cand)
-            if len(candidates) >= max_comb:
-                break
-        return candidates
-
-    for r in list(unmapped_ref):
-        found = None
-        candidates = gen_candidates(r)
-        for cand in candidates:
-            if cand in unmapped_t:
-                if ref_state[r].shape == t_state[cand].shape:
+            found = None
+            for cand in gen_candidates(r):
+                if cand in same_shape:
                     found = cand
                     break
-        if found:
-            mapped[r] = t_state[found]
-            mapping_reasons[r] = {
-                'reason': 'inverse_alias',
-                'mapped_to': found,
-            }
-            unmapped_ref.remove(r)
-            unmapped_t.remove(found)
+            if found:
+                mapped[r] = t_state[found]
+                mapping_reasons[r] = {
+                    'reason': 'inverse_alias',
+                    'mapped_to': found,
+                }
+                unmapped_ref.remove(r)
+                unmapped_t.remove(found)
+                same_shape.discard(found)
 
     # 6.5) deterministic substring substitution pass
     # Handle common differences in encoder/decoder block naming between
@@ -302,22 +511,30 @@ def main():
                 break
         return parts
 
-    for r in list(unmapped_ref):
-        found = None
-        candidates = gen_subst_candidates(r)
-        for cand in candidates:
-            if cand in unmapped_t:
-                if ref_state[r].shape == t_state[cand].shape:
+    def pass_substr():
+        shape_to_unmapped_t = unmapped_t_by_shape()
+        for r in ref_order:
+            if not unmapped_t:
+                break
+            if r in mapped:
+                continue
+            same_shape = shape_to_unmapped_t.get(ref_shapes[r])
+            if not same_shape:
+                continue
+            found = None
+            for cand in gen_subst_candidates(r):
+                if cand in same_shape:
                     found = cand
                     break
-        if found:
-            mapped[r] = t_state[found]
-            mapping_reasons[r] = {
-                'reason': 'substr_replace',
-                'mapped_to': found,
-            }
-            unmapped_ref.remove(r)
-            unmapped_t.remove(found)
+            if found:
+                mapped[r] = t_state[found]
+                mapping_reasons[r] = {
+                    'reason': 'substr_replace',
+                    'mapped_to': found,
+                }
+                unmapped_ref.remove(r)
+                unmapped_t.remove(found)
+                same_shape.discard(found)
 
     # 6.75) canonicalize transformer names and match to ref names
     # Build a map of normalized transformer names -> original name
@@ -328,117 +545,181 @@ def main():
             t = tname[len('model.'):]
         else:
             t = tname
-        # common replacements to align with whisper ref naming
-        subs = [
-            ('layers.', 'blocks.'),
-            ('self_attn.', 'attn.'),
-            ('self_attn_layer_norm', 'attn_ln'),
-            # transformers use 'encoder_attn_layer_norm' names for cross-attn
-            # layer norms; normalize them to whisper's 'cross_attn_ln'
-            ('encoder_attn_layer_norm', 'cross_attn_ln'),
-            ('final_layer_norm', 'mlp_ln'),
-            ('fc1.', 'mlp.0.'),
-            ('fc2.', 'mlp.2.'),
-            ('fc1', 'mlp.0'),
-            ('fc2', 'mlp.2'),
-            ('encoder_attn', 'cross_attn'),
-            ('out_proj', 'out'),
-            ('embed_positions', 'positional_embedding'),
-            ('embed_tokens', 'token_embedding'),
-            ('self_attn_layer_norm.weight', 'attn_ln.weight'),
-            # map whisper 'ln_post' to transformer 'final_layer_norm'
-            ('ln_post', 'final_layer_norm'),
-        ]
-        out = t
-        for a, b in subs:
-            out = out.replace(a, b)
+        # common replacements to align with whisper ref naming, in one pass
+        out = _TRANSFORMER_NAME_RE.sub(_transformer_name_sub, t)
         # remove repeated 'model.' if still present
         if out.startswith('model.'):
             out = out[len('model.'):]
         return out
 
-    norm_map = {}
-    for t in list(unmapped_t):
-        nt = normalize_transformer_name(t)
-        # store only first occurrence, but prefer exact shape matches later
-        norm_map.setdefault(nt, []).append(t)
-
-    for r in list(unmapped_ref):
-        if r in norm_map:
-            # try any candidate with same shape
-            cand_list = norm_map[r]
-            chosen = None
-            for cand in cand_list:
-                if ref_state[r].shape == t_state[cand].shape:
-                    chosen = cand
-                    break
-            if chosen:
-                mapped[r] = t_state[chosen]
-                mapping_reasons[r] = {
-                    'reason': 'transformer_canonicalized',
-                    'mapped_to': chosen,
-                }
-                unmapped_ref.remove(r)
-                unmapped_t.remove(chosen)
+    def pass_canonical():
+        norm_map = {}
+        for t in unmapped_t:
+            nt = normalize_transformer_name(t)
+            # store only first occurrence, but prefer exact shape matches later
+            norm_map.setdefault(nt, []).append(t)
+
+        for r in ref_order:
+            if not unmapped_t:
+                break
+            if r in mapped:
+                continue
+            if r in norm_map:
+                # try any candidate with same shape
+                cand_list = norm_map[r]
+                chosen = None
+                for cand in cand_list:
+                    if ref_shapes[r] == t_shape[cand]:
+                        chosen = cand
+                        break
+                if chosen:
+                    mapped[r] = t_state[chosen]
+                    mapping_reasons[r] = {
+                        'reason': 'transformer_canonicalized',
+                        'mapped_to': chosen,
+                    }
+                    unmapped_ref.remove(r)
+                    unmapped_t.remove(chosen)
 
     # Final deterministic special-cases:
     # map encoder.ln_post -> model.encoder.final_layer_norm
     # Some transformer checkpoints use final_layer_norm naming for the
     # encoder post-norm; handle that here.
-    for r in list(unmapped_ref):
-        if r.startswith('encoder.ln_post.'):
-            suffix = r.split('encoder.ln_post.')[1]
-            candidate = f'model.encoder.final_layer_norm.{suffix}'
-            if candidate in unmapped_t and (
-                ref_state[r].shape == t_state[candidate].shape
-            ):
-                mapped[r] = t_state[candidate]
-                mapping_reasons[r] = {
-                    'reason': 'special_ln_post',
-                    'mapped_to': candidate,
-                }
-                unmapped_ref.remove(r)
-                unmapped_t.remove(candidate)
+    def pass_ln_post():
+        for r in ref_order:
+            if not unmapped_t:
+                break
+            if r in mapped:
+                continue
+            if r.startswith('encoder.ln_post.'):
+                suffix = r.split('encoder.ln_post.')[1]
+                candidate = f'model.encoder.final_layer_norm.{suffix}'
+                if candidate in unmapped_t and (
+                    ref_shapes[r] == t_shape[candidate]
+                ):
+                    mapped[r] = t_state[candidate]
+                    mapping_reasons[r] = {
+                        'reason': 'special_ln_post',
+                        'mapped_to': candidate,
+                    }
+                    unmapped_ref.remove(r)
+                    unmapped_t.remove(candidate)
+
+    # Passes that mapped nothing on a previous conversion of this dir are
+    # very likely to map nothing again; skip them on request.
+    skip = set()
+    if args.skip_empty_passes:
+        try:
+            prior = json.loads(
+                (local / 'mapping_report.json').read_text(encoding='utf-8')
+            )
+            skip = {n for n, c in prior['pass_hits'].items() if c == 0}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            print('No usable pass_hits in mapping_report.json; running all')
+        if skip:
+            print('Skipping passes with no prior hits:', ', '.join(sorted(skip)))
+
+    # Run the heuristics in order, stopping once every reference name is
+    # mapped or no transformer names are left to assign; for small
+    # variants the exact-name pass alone often covers everything.
+    passes = [
+        pass_suffix,
+        pass_unique_shape,
+        pass_normalize_prefix,
+        pass_alias,
+        pass_inverse_alias,
+        pass_substr,
+        pass_canonical,
+        pass_ln_post,
+    ]
+    pass_hits = Counter({'pass_exact': len(mapped)})
+    for run_pass in passes:
+        if not unmapped_ref or not unmapped_t:
+            break
+        name = run_pass.__name__
+        if name in skip:
+            # keep the zero so the next profiled run skips it as well
+            pass_hits[name] = 0
+            continue
+        before = len(mapped)
+        run_pass()
+        pass_hits[name] = len(mapped) - before
 
     # Log mapping summary
     print('Mapping summary:')
-    print('  total ref params:', len(ref_state))
+    print('  total ref params:', len(ref_shapes))
     print('  mapped params   :', len(mapped))
     print('  unmapped ref    :', len(unmapped_ref))
 
     if unmapped_ref:
         print('Sample unmapped reference params:')
         for i, n in enumerate(list(unmapped_ref)[:20]):
-            print('   ', n, 'shape=', tuple(ref_state[n].shape))
+            print('   ', n, 'shape=', ref_shapes[n])
         print('---')
 
-    # Build final state dict: start from ref_state and replace mapped tensors
-    final_state = {}
-    for k, v in ref_state.items():
-        if k in mapped:
-            final_state[k] = mapped[k]
-        else:
-            final_state[k] = v
+    # Build final state dict in reference order: mapped tensors, plus the
+    # reference's own weights for any slot left unmapped
+    if unmapped_ref and ref_state is None:
+        print('Loading reference weights for unmapped params')
+        _, ref_state = load_reference_state(args.whisper_ref)
+    # reference checkpoints are stored in fp16; cast their floating-point
+    # fill-ins to the mapped tensors' dtype so the checkpoint is uniform
+    mapped_dtype = next(iter(mapped.values())).dtype if mapped else None
+
+    def _ref_tensor(k):
+        t = ref_state[k]
+        if mapped_dtype is not None and t.is_floating_point():
+            t = t.to(mapped_dtype)
+        return t
+
+    final_state = {
+        k: mapped[k] if k in mapped else _ref_tensor(k) for k in ref_shapes
+    }
 
-    dims = serialize_dims(ref.dims)
+    dims = ref_dims
 
     out = local / 'model_converted.pt'
-    print('Saving whisper-compatible checkpoint to', out)
-    torch.save({'dims': dims, 'model_state_dict': final_state}, str(out))
+    if args.format == 'safetensors':
+        out = out.with_suffix('.safetensors')
+        print('Saving safetensors weights to', out)
+        # safetensors writes raw contiguous buffers and cannot carry dims,
+        # which go to a JSON sidecar next to the weights
+        save_file(
+            {k: v.contiguous() for k, v in final_state.items()}, str(out)
+        )
+        out.with_suffix('.dims.json').write_text(json.dumps(dims))
+    else:
+        print('Saving whisper-compatible checkpoint to', out)
+        # zipfile format stores each tensor as its own record; protocol 5
+        # keeps the pickled metadata between them compact
+        torch.save(
+            {'dims': dims, 'model_state_dict': final_state},
+            str(out),
+            pickle_protocol=5,
+            _use_new_zipfile_serialization=True,
+        )
 
     # Emit a mapping report for diagnostics (write before final silence)
-    import json
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
 
     report = {
-        'total_ref_params': len(ref_state),
+        'total_ref_params': len(ref_shapes),
         'mapped_params': len(mapped),
         'unmapped_ref': list(unmapped_ref),
         'mapping_reasons': mapping_reasons,
+        'pass_hits': dict(pass_hits),
     }
     try:
-        (local / 'mapping_report.json').write_text(
-            json.dumps(report, indent=2)
-        )
+        report_path = local / 'mapping_report.json'
+        if orjson is not None:
+            report_path.write_bytes(
+                orjson.dumps(report, option=orjson.OPT_INDENT_2)
+            )
+        else:
+            report_path.write_text(json.dumps(report, indent=2))
         print('Wrote mapping_report.json')
     except Exception as e:
         print('Failed to write mapping_report.json:', e)
@@ -451,7 +732,10 @@ def main():
     except Exception:
         pass
 
-    print('Conversion done. You can try: whisper.load_model(str(out))')
+    if args.format == 'pt':
+        print('Conversion done. You can try: whisper.load_model(str(out))')
+    else:
+        print('Conversion done. Load with safetensors.torch.load_file(out)')
     return 0
 
 
@@ -1,41 +1,123 @@
 """Dataset inventory scanner.
 
-Scans `uploads/` and writes `manifests/dataset_inventory.csv` with columns:
+Scans the audio files in `uploads/` and writes
+`manifests/dataset_inventory.csv` with columns:
     filename,size_bytes,duration_seconds,transcript_present,
-    transcript_path,sha256,language_guess,duplicate_of
+    transcript_path,content_hash,language_guess,duplicate_of
 
 Usage:
         python server/scripts/dataset_inventory.py
 
+content_hash is only computed for files whose size matches another file's
+(anything else cannot be a duplicate) and is blank otherwise.
+
 Tries to read audio duration via soundfile (pysoundfile) or wave. If neither
 is available the duration field will be left blank.
 """
 from __future__ import annotations
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import csv
 import hashlib
+import mmap
+import os
+import re
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Set, Tuple
 
 try:
     import soundfile as sf
 except Exception:
     sf = None
 
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+from wav_header import wav_duration
+
 UPLOADS = Path(__file__).resolve().parents[2] / "uploads"
 MANIFESTS = Path(__file__).resolve().parents[2] / "manifests"
 
 MANIFESTS.mkdir(parents=True, exist_ok=True)
 
+AUDIO_EXTS = {".wav", ".mp3", ".flac", ".m4a", ".ogg", ".opus", ".aac"}
+# transcript names tried next to an audio file, in order, then any sibling
+# sharing its stem with one of the second set of extensions
+_TRANSCRIPT_EXTS = (".txt", ".norm.txt", ".trans.txt", ".json")
+_SIBLING_TRANSCRIPT_EXTS = (".txt", ".json")
+
+CSV_HEADER = (
+    "filename",
+    "size_bytes",
+    "duration_seconds",
+    "transcript_present",
+    "transcript_path",
+    "content_hash",
+    "language_guess",
+    "duplicate_of",
+)
+CSV_BATCH_ROWS = 1024
+
+# transcript marker -> language guess; "bs/cs/hr-south" is generic B/C/S
+_LANG_MARKERS = {
+    "hvala": "bs/cs/hr-south",
+    "molim": "bs/cs/hr-south",
+    "dobar": "bs/cs/hr-south",
+    "dobro": "bs/cs/hr-south",
+    "ђ": "sr-cyrillic",
+}
+_LANG_RE = re.compile("|".join(_LANG_MARKERS), re.IGNORECASE)
 
-def sha256_of_file(p: Path) -> str:
-    h = hashlib.sha256()
+
+def file_digest(p: Path) -> str:
+    """Return a hex digest of the file contents, used for duplicate detection.
+
+    BLAKE3 when the ``blake3`` package is installed, otherwise SHA-256 via
+    ``hashlib.file_digest`` (3.11+) or a single update over an mmap of the
+    file, so the C hash sees the whole buffer instead of 8 KiB chunks.
+    """
     with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
+        if blake3 is None and hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = blake3() if blake3 is not None else hashlib.sha256()
+        if os.fstat(f.fileno()).st_size:  # mmap rejects empty files
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
     return h.hexdigest()
 
 
+def _flac_duration_from_header(p: Path) -> Optional[float]:
+    """Duration of a FLAC file from its STREAMINFO block, else None."""
+    try:
+        with p.open("rb") as f:
+            head = f.read(42)  # "fLaC" + block header + 34-byte STREAMINFO
+    except OSError:
+        return None
+    # STREAMINFO is always the first metadata block (type 0)
+    if len(head) < 42 or head[:4] != b"fLaC" or head[4] & 0x7F != 0:
+        return None
+    # 20-bit sample rate, 3-bit channels, 5-bit depth, 36-bit total samples
+    bits = int.from_bytes(head[18:26], "big")
+    rate = bits >> 44
+    total = bits & ((1 << 36) - 1)
+    if not rate or not total:  # total 0 means unknown
+        return None
+    return float(total) / float(rate)
+
+
 def get_duration_seconds(p: Path) -> Optional[float]:
+    # WAV and FLAC headers carry the length; read it without a decoder
+    suffix = p.suffix.lower()
+    if suffix == ".wav":
+        duration = wav_duration(p)
+        if duration is not None:
+            return duration
+    elif suffix == ".flac":
+        duration = _flac_duration_from_header(p)
+        if duration is not None:
+            return duration
     # Try soundfile
     try:
         if sf:
@@ -62,80 +144,129 @@ def get_duration_seconds(p: Path) -> Optional[float]:
 def guess_language_from_transcript(p: Path) -> Optional[str]:
     # Very small heuristic: check for presence of specific characters or common words
     try:
-        text = p.read_text(encoding="utf-8", errors="ignore").lower()
+        text = p.read_text(encoding="utf-8", errors="ignore")
     except Exception:
         return None
-    # simple keyword checks
-    if any(w in text for w in ["hvala", "molim", "dobar", "dobro"]):
-        return "bs/cs/hr-south"  # generic B/C/S
-    if any(ch in text for ch in ["ђ", "ђ"]):
-        return "sr-cyrillic"
-    return None
+    # one case-insensitive scan for all markers; a B/C/S keyword anywhere
+    # wins over the Cyrillic letter, as when they were checked in turn
+    found = None
+    for m in _LANG_RE.finditer(text):
+        found = _LANG_MARKERS[m.group(0).lower()]
+        if found == "bs/cs/hr-south":
+            break
+    return found
 
 
-def find_transcript_for_audio(p: Path) -> Optional[Path]:
+def find_transcript_for_audio(
+    p: Path, dir_names: Optional[Set[str]] = None
+) -> Optional[Path]:
+    # dir_names: names in p's directory, when the caller already listed it;
+    # lookups are then set membership instead of a stat per candidate
+    if dir_names is None:
+        try:
+            dir_names = set(os.listdir(p.parent))
+        except OSError:
+            return None
     # look for same-name.txt or same-name.norm.txt or same-name.json
-    base = p.with_suffix("")
-    for ext in [".txt", ".norm.txt", ".trans.txt", ".json"]:
-        candidate = base.with_suffix(ext)
-        if candidate.exists():
-            return candidate
+    stem = p.stem
+    for ext in _TRANSCRIPT_EXTS:
+        if stem + ext in dir_names:
+            return p.parent / (stem + ext)
     # also try sibling transcripts with same stem
-    for other in p.parent.glob(base.name + "*"):
-        if other.suffix.lower() in [".txt", ".json"] and other.exists():
-            return other
+    for name in sorted(dir_names):
+        if name.startswith(stem) and (
+            os.path.splitext(name)[1].lower() in _SIBLING_TRANSCRIPT_EXTS
+        ):
+            return p.parent / name
     return None
 
 
+def scan_files(root: Path) -> Iterator[Tuple[Path, int, Set[str]]]:
+    """Yield (path, size, names in its directory) for every file under root.
+
+    One os.scandir per directory: the listing gives the file sizes (via the
+    entry's cached stat) and the sibling-name set shared by the files there.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        names = {e.name for e in entries}
+        for e in entries:
+            if e.is_dir(follow_symlinks=False):
+                stack.append(Path(e.path))
+            elif e.is_file():
+                yield Path(e.path), e.stat().st_size, names
+
+
+def hash_and_stat(
+    p: Path, size: int, hash_it: bool
+) -> Tuple[Path, int, str, Optional[float]]:
+    """Return (path, size, content hash, duration) for one file.
+
+    Pure per-file work, so run() can spread it over a process pool. The
+    hash is "" when ``hash_it`` is false (no other file has this size).
+    """
+    sha = file_digest(p) if hash_it else ""
+    return p, size, sha, get_duration_seconds(p)
+
+
 def run():
-    rows = []
     hash_map = {}
     if not UPLOADS.exists():
         print("No uploads/ directory found at", UPLOADS)
         return
 
-    for p in UPLOADS.rglob("*"):
-        if p.is_file():
+    # Sorted so the first file of a duplicate set (the one others point
+    # to in duplicate_of) does not depend on directory listing order
+    # Only audio files are inventoried (and hashed); transcripts and other
+    # sidecars are still found through each audio file's directory listing
+    files = sorted(
+        (f for f in scan_files(UPLOADS) if f[0].suffix.lower() in AUDIO_EXTS),
+        key=lambda f: f[0],
+    )
+    paths = [f[0] for f in files]
+    sizes = [f[1] for f in files]
+    # Duplicates must have equal sizes, so only files sharing their size
+    # with another file are hashed; unique sizes get an empty hash.
+    size_counts = Counter(sizes)
+    ambiguous = [size_counts[n] > 1 for n in sizes]
+    out_csv = MANIFESTS / "dataset_inventory.csv"
+    # Rows are written as results arrive, CSV_BATCH_ROWS at a time through
+    # one writerows call; only hash_map and the pending batch stay in memory
+    with out_csv.open("w", newline="", encoding="utf-8") as fh, \
+            ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        writer = csv.writer(fh)
+        writer.writerow(CSV_HEADER)
+        batch = []
+        results = ex.map(hash_and_stat, paths, sizes, ambiguous, chunksize=16)
+        for (p, size, sha, duration), (_, _, dir_names) in zip(results, files):
             rel = p.relative_to(UPLOADS)
-            size = p.stat().st_size
-            sha = sha256_of_file(p)
-            duration = get_duration_seconds(p)
-            transcript = find_transcript_for_audio(p)
-            transcript_present = bool(transcript)
-            transcript_path = str(transcript) if transcript else ""
+            transcript = find_transcript_for_audio(p, dir_names)
             lang = guess_language_from_transcript(transcript) if transcript else ""
             duplicate_of = ""
             if sha in hash_map:
                 duplicate_of = hash_map[sha]
-            else:
+            elif sha:
                 hash_map[sha] = str(rel)
 
-            rows.append({
-                "filename": str(rel).replace("\\", "/"),
-                "size_bytes": size,
-                "duration_seconds": "{:.3f}".format(duration) if duration else "",
-                "transcript_present": str(transcript_present),
-                "transcript_path": transcript_path,
-                "sha256": sha,
-                "language_guess": lang or "",
-                "duplicate_of": duplicate_of,
-            })
-
-    out_csv = MANIFESTS / "dataset_inventory.csv"
-    with out_csv.open("w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=[
-            "filename",
-            "size_bytes",
-            "duration_seconds",
-            "transcript_present",
-            "transcript_path",
-            "sha256",
-            "language_guess",
-            "duplicate_of",
-        ])
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+            batch.append((
+                str(rel).replace("\\", "/"),
+                size,
+                f"{duration:.3f}" if duration else "",
+                str(bool(transcript)),
+                str(transcript) if transcript else "",
+                sha,
+                lang or "",
+                duplicate_of,
+            ))
+            if len(batch) >= CSV_BATCH_ROWS:
+                writer.writerows(batch)
+                batch.clear()
+        writer.writerows(batch)
 
     print("Wrote", out_csv)
 
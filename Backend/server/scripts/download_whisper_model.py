@@ -5,10 +5,39 @@ separated so we can mock network activity in tests. It supports model
 names like "openai/whisper-large-v2" or local paths. The script writes
 model marker files into `models/whisper/{model_name}`.
 """
+import os
+import shutil
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Collection, Dict, Optional
 
-MODELS_DIR = Path(__file__).resolve().parents[2] / "models" / "whisper"
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+MODELS_DIR = _REPO_ROOT / "models" / "whisper"
+
+# Optional-dependency probes, resolved on first use and then reused by every
+# downloader call (``import torch`` alone can take seconds). None means not
+# probed yet, False means unavailable; tests may assign these directly.
+_TORCH = None
+_HAVE_SAFETENSORS = None
+
+
+def _get_torch():
+    global _TORCH
+    if _TORCH is None:
+        try:
+            import torch
+            _TORCH = torch
+        except Exception:
+            _TORCH = False
+    return _TORCH or None
+
+
+def _get_safetensors() -> bool:
+    global _HAVE_SAFETENSORS
+    if _HAVE_SAFETENSORS is None:
+        import importlib.util
+
+        _HAVE_SAFETENSORS = importlib.util.find_spec('safetensors') is not None
+    return _HAVE_SAFETENSORS
 
 
 def model_dir_for(name: str) -> Path:
@@ -67,6 +96,79 @@ def ensure_model(name: str, *, downloader=None) -> Path:
     return download_model(name, downloader=downloader)
 
 
+# Tokenizer artifacts whisper's loader expects at the model directory root
+TOKENIZER_CANDIDATES = (
+    'tokenizer.json',
+    'tokenizer_config.json',
+    'vocab.json',
+    'merges.txt',
+    'tokenizer.model',
+    'sentencepiece.bpe.model',
+    'spiece.model',
+    'vocab.txt',
+    'added_tokens.json',
+)
+
+
+def _copy_file(src: str, dst: str) -> None:
+    """Copy file contents in the kernel where possible.
+
+    ``os.copy_file_range`` avoids a userspace round trip and lets
+    reflink-capable filesystems (btrfs, xfs) share extents instead of
+    copying bytes; falls back to ``shutil.copyfileobj`` when unavailable
+    or refused (e.g. across filesystems on older kernels).
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if hasattr(os, 'copy_file_range'):
+            try:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(
+                        fsrc.fileno(), fdst.fileno(), remaining
+                    )
+                    if n == 0:
+                        break
+                    remaining -= n
+                return
+            except OSError:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+
+def _copy_tree(
+    src: Path, dst: Path, wanted: Collection[str]
+) -> Dict[str, Path]:
+    """Copy ``src`` into ``dst`` in one os.scandir walk.
+
+    Symlinks are followed, as ``shutil.copytree`` does by default (HF
+    snapshot files are symlinks into the blob cache). Returns the first
+    copied path for each file name in ``wanted``, outside ``.git*``
+    directories, visiting a directory's files before its subdirectories.
+    """
+    found = {}
+    pending = [(str(src), str(dst), False)]
+    while pending:
+        s, d, in_git = pending.pop(0)
+        os.makedirs(d, exist_ok=True)
+        with os.scandir(s) as it:
+            entries = list(it)
+        subdirs = []
+        for e in entries:
+            target = os.path.join(d, e.name)
+            if e.is_dir():
+                subdirs.append(
+                    (e.path, target, in_git or e.name.startswith('.git'))
+                )
+                continue
+            _copy_file(e.path, target)
+            if e.name in wanted and not in_git and e.name not in found:
+                found[e.name] = Path(target)
+        pending[:0] = subdirs
+    return found
+
+
 def hf_downloader_factory(
     repo: Optional[str] = None,
 ) -> Callable[[str, Path], bool]:
@@ -82,7 +184,6 @@ def hf_downloader_factory(
         try:
             # Import here so tests can mock huggingface_hub
             from huggingface_hub import snapshot_download
-            import shutil
 
             repo_id = repo or name
             # snapshot_download returns a local folder path in HF cache.
@@ -100,48 +201,29 @@ def hf_downloader_factory(
                 except Exception:
                     pass
 
-            shutil.copytree(str(out), str(dest), dirs_exist_ok=True)
+            # The copy walk also records where tokenizer files landed, so
+            # no second pass over the tree is needed to find them.
+            found_tokenizers = _copy_tree(
+                Path(out), dest, TOKENIZER_CANDIDATES
+            )
 
             # Ensure tokenizer files are present at the dest root. Some HF
             # snapshots place tokenizer files in subfolders (eg.
             # `tokenizer/*`). Whisper's loading code expects tokenizer
-            # artifacts at the model directory root, so search recursively
-            # and copy common tokenizer files into `dest/` if missing.
+            # artifacts at the model directory root, so copy common
+            # tokenizer files found deeper into `dest/` if missing.
             try:
                 from shutil import copy2
 
-                tokenizer_candidates = [
-                    'tokenizer.json',
-                    'tokenizer_config.json',
-                    'vocab.json',
-                    'merges.txt',
-                    'tokenizer.model',
-                    'sentencepiece.bpe.model',
-                    'spiece.model',
-                    'vocab.txt',
-                    'added_tokens.json',
-                ]
-
-                for name in tokenizer_candidates:
+                for name, found in found_tokenizers.items():
                     # If already present at root, skip
-                    if (dest / name).exists():
+                    if found.parent == dest or (dest / name).exists():
                         continue
-
-                    # Search the whole snapshot for this filename
-                    found = None
-                    for p in dest.rglob(name):
-                        # prefer files that are not inside .git directories
-                        if any(part.startswith('.git') for part in p.parts):
-                            continue
-                        found = p
-                        break
-
-                    if found is not None:
-                        try:
-                            copy2(str(found), str(dest / name))
-                        except Exception:
-                            # Non-fatal; continue with other files
-                            pass
+                    try:
+                        copy2(str(found), str(dest / name))
+                    except Exception:
+                        # Non-fatal; continue with other files
+                        pass
             except Exception:
                 # Non-fatal tokenizer copying; proceed regardless
                 pass
@@ -163,7 +245,7 @@ def hf_downloader_factory(
                     if not (dest / c).exists()
                 ]
                 if missing_critical:
-                    repo_root = Path(__file__).resolve().parents[2]
+                    repo_root = _REPO_ROOT
                     # ensure copy2 is available in this scope
                     from shutil import copy2
                     # Common locations to look for fallback tokenizers
@@ -208,22 +290,15 @@ def hf_downloader_factory(
             (dest / "hf_source.txt").write_text(str(out))
             # Best-effort: try to make a whisper-loadable torch file.
             try:
-                import importlib
-                import importlib.util as _il_util
-
-                try:
-                    torch = importlib.import_module('torch')
-                except Exception:
-                    torch = None
-
-                safetensors_spec = _il_util.find_spec('safetensors')
+                torch = _get_torch()
+                have_safetensors = _get_safetensors()
                 converted = False
 
                 # If safetensors present, try to convert it first.
                 safetensors_path = dest / 'model.safetensors'
                 if (
                     safetensors_path.exists()
-                    and safetensors_spec is not None
+                    and have_safetensors
                     and torch is not None
                 ):
                     try:
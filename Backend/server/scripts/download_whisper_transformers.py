@@ -14,10 +14,13 @@ import argparse
 import os
 import sys
 
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_MODELS_DIR = _REPO_ROOT / 'models' / 'whisper'
+
 
 def model_dir_for(name: str) -> Path:
     safe = name.replace('/', '_').replace(':', '_')
-    return Path(__file__).resolve().parents[2] / 'models' / 'whisper' / safe
+    return _MODELS_DIR / safe
 
 
 def main():
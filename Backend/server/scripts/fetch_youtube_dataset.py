@@ -21,6 +21,7 @@ or success:true. The downloader in the backend typically saves downloads to
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import subprocess
 import sys
@@ -32,6 +33,11 @@ try:
 except Exception:  # pragma: no cover - best-effort import
     requests = None
 
+try:  # optional: concurrent downloads
+    import httpx
+except ImportError:  # pragma: no cover - best-effort import
+    httpx = None
+
 
 DEFAULT_BACKEND = "http://127.0.0.1:5000"
 DOWNLOAD_ENDPOINT = "/download-youtube"
@@ -59,6 +65,43 @@ def call_backend_download(url: str, backend: str) -> dict:
         return {"http_status": resp.status_code, "text": resp.text}
 
 
+async def _fetch(client, url: str, endpoint: str, sem) -> dict:
+    async with sem:
+        resp = await client.post(endpoint, json={"url": url})
+    try:
+        return resp.json()
+    except Exception:
+        return {"http_status": resp.status_code, "text": resp.text}
+
+
+async def _run_all(urls: List[str], backend: str, concurrency: int) -> list:
+    """POST every URL to the backend, at most ``concurrency`` at a time.
+
+    Returns one reply dict (or the exception raised) per URL, in order.
+    """
+    endpoint = backend.rstrip("/") + DOWNLOAD_ENDPOINT
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=300, limits=limits) as client:
+        return await asyncio.gather(
+            *(_fetch(client, url, endpoint, sem) for url in urls),
+            return_exceptions=True,
+        )
+
+
+def interpret_response(url: str, resp) -> dict:
+    # Best-effort interpretation of backend reply
+    out = {"url": url, "response": resp}
+    if isinstance(resp, dict):
+        if resp.get("file_path"):
+            out["file_path"] = resp.get("file_path")
+        if resp.get("file_id"):
+            out["file_id"] = resp.get("file_id")
+        if resp.get("success") is True:
+            out["downloaded"] = True
+    return out
+
+
 def refresh_inventory(repo_root: Path) -> None:
     script = repo_root / "server" / "scripts" / "generate_dataset_inventory.py"
     if not script.exists():
@@ -89,6 +132,17 @@ def main(argv: List[str] | None = None) -> int:
         action="store_true",
         help="Do not call the backend; just show planned actions",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum downloads in flight at once",
+    )
+    parser.add_argument(
+        "--no-async",
+        action="store_true",
+        help="Send the downloads one at a time with requests",
+    )
     parser.add_argument(
         "--sample",
         action="store_true",
@@ -117,35 +171,40 @@ def main(argv: List[str] | None = None) -> int:
 
     print(f"Found {len(urls)} URLs. Dry-run={args.dry_run}")
 
+    # Each download blocks on the backend for seconds to minutes, so fan
+    # them out concurrently unless asked not to (or httpx is missing)
     results = []
-    for i, url in enumerate(urls, start=1):
-        print(f"[{i}/{len(urls)}] Processing: {url}")
-        if args.dry_run:
-            print(
-                "  Dry-run: would POST to "
-                + args.backend.rstrip("/")
-                + DOWNLOAD_ENDPOINT
-            )
-            results.append({"url": url, "action": "dry-run"})
-            continue
-
-        try:
-            resp = call_backend_download(url, args.backend)
-        except Exception as e:  # pragma: no cover - runtime behavior
-            print(f"  Error calling backend for {url}: {e}")
-            results.append({"url": url, "error": str(e)})
-            continue
-
-        # Best-effort interpretation of backend reply
-        out = {"url": url, "response": resp}
-        if isinstance(resp, dict):
-            if resp.get("file_path"):
-                out["file_path"] = resp.get("file_path")
-            if resp.get("file_id"):
-                out["file_id"] = resp.get("file_id")
-            if resp.get("success") is True:
-                out["downloaded"] = True
-        results.append(out)
+    if not args.dry_run and not args.no_async and httpx is not None:
+        print(f"Sending up to {args.concurrency} downloads at a time")
+        replies = asyncio.run(
+            _run_all(urls, args.backend, max(1, args.concurrency))
+        )
+        for url, resp in zip(urls, replies):
+            if isinstance(resp, Exception):
+                print(f"  Error calling backend for {url}: {resp}")
+                results.append({"url": url, "error": str(resp)})
+            else:
+                results.append(interpret_response(url, resp))
+    else:
+        for i, url in enumerate(urls, start=1):
+            print(f"[{i}/{len(urls)}] Processing: {url}")
+            if args.dry_run:
+                print(
+                    "  Dry-run: would POST to "
+                    + args.backend.rstrip("/")
+                    + DOWNLOAD_ENDPOINT
+                )
+                results.append({"url": url, "action": "dry-run"})
+                continue
+
+            try:
+                resp = call_backend_download(url, args.backend)
+            except Exception as e:  # pragma: no cover - runtime behavior
+                print(f"  Error calling backend for {url}: {e}")
+                results.append({"url": url, "error": str(e)})
+                continue
+
+            results.append(interpret_response(url, resp))
 
     # Write a summary JSON next to manifests folder
     manifests = repo_root / "manifests"
@@ -1,26 +1,48 @@
 #!/usr/bin/env python3
 """Generate dataset inventory for Whisper training.
 
-Scans `uploads/` and `outputs/` for audio files, computes size and SHA256, attempts to read duration via ffprobe if available, detects transcripts, and writes:
+Scans `uploads/` and `outputs/` for audio files, computes size and a content hash (BLAKE3 or SHA-256), attempts to read duration via PyAV or ffprobe if available, detects transcripts, and writes:
 - manifests/dataset_inventory.csv
 - manifests/dataset_inventory_summary.json
+- manifests/hash_cache.sqlite (hashes reused for unchanged files)
 
 Usage: python server/scripts/generate_dataset_inventory.py
 """
+from concurrent.futures import ProcessPoolExecutor
 import csv
+import functools
 import hashlib
 import json
+import mmap
 import os
 import shutil
+import sqlite3
 import subprocess
 from pathlib import Path
 
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+HASH_ALGO = 'blake3' if blake3 is not None else 'sha256'
+
+try:  # optional: read durations in-process instead of spawning ffprobe
+    import av
+except ImportError:
+    av = None
+
 ROOT = Path(__file__).resolve().parents[2]
 UPLOADS = ROOT / 'uploads'
 OUTPUTS = ROOT / 'outputs'
 MANIFESTS = ROOT / 'manifests'
 
-EXTS = {'.mp3', '.wav', '.flac', '.m4a', '.ogg', '.aac', '.wav', '.opus'}
+FFPROBE_AVAILABLE = shutil.which('ffprobe') is not None
+
+EXTS = frozenset({'.mp3', '.wav', '.flac', '.m4a', '.ogg', '.aac', '.opus'})
+CSV_BATCH_ROWS = 1024
+# transcript extensions tried next to an audio file, in order
+_TRANSCRIPT_EXTS = ('.txt', '.norm.txt', '.json')
 
 
 def find_audio_files(paths):
@@ -33,18 +55,45 @@ def find_audio_files(paths):
                     yield Path(dirpath) / fn
 
 
-def sha256_file(path, block_size=65536):
-    h = hashlib.sha256()
+def file_digest(path):
+    """Return a hex digest of the file contents, or None if unreadable.
+
+    Only used for duplicate detection: BLAKE3 when installed, else SHA-256
+    through hashlib.file_digest (3.11+) or one update over an mmap view.
+    """
     try:
         with open(path, 'rb') as f:
-            for block in iter(lambda: f.read(block_size), b''):
-                h.update(block)
+            if blake3 is None and hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            h = blake3() if blake3 is not None else hashlib.sha256()
+            if os.fstat(f.fileno()).st_size:  # mmap rejects empty files
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm)
     except Exception:
         return None
     return h.hexdigest()
 
 
+def _duration_pyav(path):
+    try:
+        with av.open(str(path)) as container:
+            if container.duration is not None:
+                return float(container.duration) / av.time_base
+    except Exception:
+        return None
+    return None
+
+
 def get_duration_ffprobe(path):
+    """Return the duration of ``path`` in seconds, or None.
+
+    Uses PyAV (libav in-process) when installed and falls back to one
+    ffprobe subprocess per file otherwise, or when PyAV reports none.
+    """
+    if av is not None:
+        duration = _duration_pyav(path)
+        if duration is not None or not FFPROBE_AVAILABLE:
+            return duration
     try:
         # ffprobe example:
         # ffprobe -v error -show_entries format=duration \
@@ -70,6 +119,39 @@ def get_duration_ffprobe(path):
     return None
 
 
+def hash_and_stat(path, known_hash=None, probe_duration=False):
+    """Return (path, size, content hash, duration) for one file.
+
+    Pure per-file work so main() can run it in a process pool; size is ''
+    when the file cannot be stat'ed and the hash None when it cannot be read.
+    ``known_hash`` (from the hash cache) is returned instead of re-hashing.
+    """
+    try:
+        size = path.stat().st_size
+    except Exception:
+        size = ''
+    duration = get_duration_ffprobe(path) if probe_duration else None
+    return path, size, known_hash or file_digest(path), duration
+
+
+def open_hash_cache():
+    """Open ``manifests/hash_cache.sqlite`` and return (conn, cache).
+
+    ``cache`` maps path -> (mtime_ns, size, hash) for hashes computed with
+    the current algorithm, so a blake3 install does not reuse SHA-256 rows.
+    """
+    conn = sqlite3.connect(str(MANIFESTS / 'hash_cache.sqlite'))
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS h('
+        'path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, '
+        'algo TEXT, sha TEXT)'
+    )
+    rows = conn.execute(
+        'SELECT path, mtime, size, sha FROM h WHERE algo = ?', (HASH_ALGO,)
+    )
+    return conn, {path: (mtime, size, sha) for path, mtime, size, sha in rows}
+
+
 def simple_language_guess(filename: str):
     s = filename.lower()
     if any(x in s for x in ['bos', 'bs', 'bosnian', 'bosanski']):
@@ -82,20 +164,19 @@ def simple_language_guess(filename: str):
 
 
 def find_transcript(path: Path):
-    # check same dir for .txt/.json
-    for ext in ('.txt', '.norm.txt', '.json'):
-        p = path.with_suffix(ext)
-        if p.exists():
-            return str(p)
+    # check same dir for .txt/.json; plain string joins rather than a new
+    # Path per candidate
+    stem_str = str(path.with_suffix(''))
+    for ext in _TRANSCRIPT_EXTS:
+        cand = stem_str + ext
+        if os.path.exists(cand):
+            return cand
 
     # check outputs/<basename>/transcription_base.txt or .json
-    candidate = OUTPUTS / path.stem / 'transcription_base.txt'
-    if candidate.exists():
-        return str(candidate)
-
-    candidatej = OUTPUTS / path.stem / 'transcription_base.json'
-    if candidatej.exists():
-        return str(candidatej)
+    out_base = os.path.join(str(OUTPUTS), path.stem, 'transcription_base')
+    for ext in ('.txt', '.json'):
+        if os.path.exists(out_base + ext):
+            return out_base + ext
 
     return ''
 
@@ -106,80 +187,106 @@ def ensure_manifests_dir():
 
 def main():
     ensure_manifests_dir()
-    files = list(find_audio_files([UPLOADS, OUTPUTS]))
+    # sorted so which copy of a duplicate counts as the original does not
+    # depend on os.walk order
+    files = sorted(find_audio_files([UPLOADS, OUTPUTS]))
     print(f'Found {len(files)} audio files to inventory.')
 
-    rows = []
     hash_map = {}
     unreadable = []
 
-    ffprobe_available = shutil.which('ffprobe') is not None
-    if not ffprobe_available:
+    ffprobe_available = FFPROBE_AVAILABLE
+    if not ffprobe_available and av is None:
         print('ffprobe not found in PATH — durations will be blank.')
 
+    # Reuse hashes of files whose mtime and size match the last run, so an
+    # incremental run only hashes new or changed files
+    conn, cache = open_hash_cache()
+    stats = []
+    known_hashes = []
     for p in files:
         try:
-            size = p.stat().st_size
-        except Exception:
-            size = ''
-        duration = None
-        if ffprobe_available:
-            duration = get_duration_ffprobe(p)
-        file_hash = sha256_file(p)
-        if file_hash is None:
-            unreadable.append(str(p))
-        duplicate = False
-        if file_hash:
-            if file_hash in hash_map:
-                duplicate = True
-            else:
-                hash_map[file_hash] = str(p)
-
-        transcript = find_transcript(p)
-        lang = simple_language_guess(p.name)
-
-        rows.append({
-            'filename': p.name,
-            'path': str(p.relative_to(ROOT)),
-            'size_bytes': size,
-            'duration_seconds': '' if duration is None else round(duration, 3),
-            'sha256': file_hash or '',
-            'transcript_path': transcript,
-            'language_guess': lang,
-            'duplicate': duplicate,
-        })
-
+            st = p.stat()
+            key = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+        hit = cache.get(str(p))
+        stats.append(key)
+        known_hashes.append(hit[2] if hit and key == hit[:2] else None)
+    fresh = []
+
+    # hashing (and ffprobe) dominate; spread files over all cores and keep
+    # the dedup below in this process, in file order
+    work = functools.partial(
+        hash_and_stat, probe_duration=ffprobe_available or av is not None
+    )
     csv_path = MANIFESTS / 'dataset_inventory.csv'
     json_summary = MANIFESTS / 'dataset_inventory_summary.json'
 
-    fieldnames = [
+    fieldnames = (
         'filename',
         'path',
         'size_bytes',
         'duration_seconds',
-        'sha256',
+        'content_hash',
         'transcript_path',
         'language_guess',
         'duplicate',
-    ]
-
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
-
-    total_bytes = sum(
-        r['size_bytes'] for r in rows if isinstance(r['size_bytes'], int)
     )
-    duplicates_found = sum(1 for r in rows if r['duplicate'])
+
+    # rows go to the CSV as results arrive, CSV_BATCH_ROWS per writerows
+    # call, instead of being collected; the summary needs running totals
+    total_files = total_bytes = duplicates_found = 0
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f, \
+            ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        batch = []
+        results = ex.map(work, files, known_hashes, chunksize=16)
+        for (p, size, file_hash, duration), key, known in zip(
+            results, stats, known_hashes
+        ):
+            if file_hash and known is None and key is not None:
+                fresh.append((str(p), key[0], key[1], HASH_ALGO, file_hash))
+            if file_hash is None:
+                unreadable.append(str(p))
+            duplicate = False
+            if file_hash:
+                if file_hash in hash_map:
+                    duplicate = True
+                else:
+                    hash_map[file_hash] = str(p)
+
+            batch.append((
+                p.name,
+                str(p.relative_to(ROOT)),
+                size,
+                '' if duration is None else round(duration, 3),
+                file_hash or '',
+                find_transcript(p),
+                simple_language_guess(p.name),
+                duplicate,
+            ))
+            total_files += 1
+            if isinstance(size, int):
+                total_bytes += size
+            duplicates_found += duplicate
+            if len(batch) >= CSV_BATCH_ROWS:
+                writer.writerows(batch)
+                batch.clear()
+        writer.writerows(batch)
+
+    with conn:
+        conn.executemany('INSERT OR REPLACE INTO h VALUES (?, ?, ?, ?, ?)', fresh)
+    conn.close()
 
     summary = {
-        'total_files': len(rows),
+        'total_files': total_files,
         'total_bytes': total_bytes,
         'unreadable_files': unreadable,
         'duplicates_found': duplicates_found,
         'ffprobe_available': ffprobe_available,
+        'pyav_available': av is not None,
     }
 
     with open(json_summary, 'w', encoding='utf-8') as f:
@@ -0,0 +1,88 @@
+"""RIFF/WAVE header reader shared by the dataset scripts.
+
+Usage:
+    from wav_header import read_wav_info
+
+``read_wav_info(path)`` returns the sample rate, channels, frame count and
+soundfile-style subtype of an uncompressed WAV without opening a decoder,
+or None for anything it does not understand so callers can fall back to
+soundfile.
+"""
+from collections import namedtuple
+import os
+import struct
+
+WavInfo = namedtuple("WavInfo", "samplerate channels frames subtype")
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format tag, bits per sample) -> subtype name as soundfile reports it
+_SUBTYPES = {
+    (_WAVE_FORMAT_PCM, 8): "PCM_U8",
+    (_WAVE_FORMAT_PCM, 16): "PCM_16",
+    (_WAVE_FORMAT_PCM, 24): "PCM_24",
+    (_WAVE_FORMAT_PCM, 32): "PCM_32",
+    (_WAVE_FORMAT_IEEE_FLOAT, 32): "FLOAT",
+    (_WAVE_FORMAT_IEEE_FLOAT, 64): "DOUBLE",
+}
+
+
+def _parse_fmt(body):
+    """Return (rate, channels, block_align, subtype) from a fmt chunk body."""
+    if len(body) < 16:
+        return None
+    tag, channels, rate, _, block_align, bits = struct.unpack("<HHIIHH", body[:16])
+    if tag == _WAVE_FORMAT_EXTENSIBLE:
+        # the real format tag leads the SubFormat GUID at offset 24
+        if len(body) < 26:
+            return None
+        (tag,) = struct.unpack("<H", body[24:26])
+    subtype = _SUBTYPES.get((tag, bits))
+    if subtype is None or not rate or not channels or not block_align:
+        return None
+    return rate, channels, block_align, subtype
+
+
+def read_wav_info(path):
+    """Read a WavInfo from an integer PCM or IEEE float WAV header, else None.
+
+    Walks the chunk headers to ``data`` (LIST/fact chunks may precede it).
+    """
+    try:
+        with open(path, "rb") as f:
+            riff = f.read(12)
+            if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+                return None
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                chunk_id, size = struct.unpack("<4sI", header)
+                if chunk_id == b"fmt ":
+                    fmt = _parse_fmt(f.read(size + (size & 1)))
+                    if fmt is None:
+                        return None
+                elif chunk_id == b"data":
+                    if fmt is None:
+                        return None
+                    rate, channels, block_align, subtype = fmt
+                    # truncated or streamed files overstate the data size
+                    size = min(size, os.fstat(f.fileno()).st_size - f.tell())
+                    # whole frames only, as soundfile reports them
+                    return WavInfo(rate, channels, size // block_align, subtype)
+                else:
+                    # chunks are word-aligned
+                    f.seek(size + (size & 1), 1)
+    except OSError:
+        return None
+
+
+def wav_duration(path):
+    """Duration in seconds of an uncompressed WAV from its header, else None."""
+    info = read_wav_info(path)
+    if info is None:
+        return None
+    return float(info.frames) / float(info.samplerate)
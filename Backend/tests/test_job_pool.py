@@ -0,0 +1,48 @@
+# test_job_pool.py
+# A job started through /process runs on the spawned process pool and its
+# terminal status is visible through /status.
+import io
+import time
+
+import pytest
+from server import backend_skeleton
+from server.backend_skeleton import app, init_db
+
+
+@pytest.fixture(scope="module")
+def client():
+    init_db()
+    app.config["TESTING"] = True
+    with app.test_client() as c:
+        yield c
+
+
+def test_process_job_completes_on_pool(client, monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    rv = client.post(
+        "/upload",
+        data={"file": (io.BytesIO(b"fake-audio"), "pool.wav")},
+        content_type="multipart/form-data",
+    )
+    assert rv.status_code == 201
+    file_id = rv.get_json()["file_id"]
+
+    rv = client.post(f"/process/demo/{file_id}")
+    assert rv.status_code == 202
+    job_id = rv.get_json()["job_id"]
+
+    executor = backend_skeleton._job_executor
+    assert executor is not None
+    assert executor._mp_context.get_start_method() == "spawn"
+
+    deadline = time.monotonic() + 120
+    status = None
+    while time.monotonic() < deadline:
+        status = client.get(f"/status/{job_id}").get_json()
+        if status["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.2)
+    assert status is not None
+    assert status["status"] == "completed", status
+    assert status["progress"] == 1.0
+    assert (backend_skeleton.OUTPUTS_DIR / file_id / "instrumental.wav").exists()
@@ -1,6 +1,10 @@
 # test_resumable.py
 # Minimal placeholder — tests for resumable uploads are optional in this cleanup batch
+import io
+import multiprocessing
+
 import pytest
+from server import backend_skeleton
 from server.backend_skeleton import app, init_db
 
 
@@ -39,3 +43,79 @@ def test_resumable_single_chunk(client):
     rv = client.get(f"/download/{file_id}")
     assert rv.status_code == 200
     assert rv.data == data
+
+
+def test_resumable_offset_chunks(client):
+    rv = client.post("/uploads", json={"filename": "offsets.wav"})
+    assert rv.status_code == 201
+    upload_id = rv.get_json()["upload_id"]
+
+    # chunks may arrive out of order; each lands at its byte offset
+    chunks = [b"first-", b"second-", b"third"]
+    offsets = [0, len(chunks[0]), len(chunks[0]) + len(chunks[1])]
+    for idx in (2, 0, 1):
+        rv = client.post(
+            f"/uploads/{upload_id}/chunk",
+            data=chunks[idx],
+            headers={"X-Chunk-Index": str(idx), "X-Chunk-Offset": str(offsets[idx])},
+        )
+        assert rv.status_code == 204
+
+    rv = client.post(f"/uploads/{upload_id}/complete")
+    assert rv.status_code == 201
+    file_id = rv.get_json()["file_id"]
+
+    rv = client.get(f"/download/{file_id}")
+    assert rv.status_code == 200
+    assert rv.data == b"".join(chunks)
+
+
+def test_resumable_offset_chunks_incomplete(client):
+    rv = client.post("/uploads", json={"filename": "gap.wav"})
+    upload_id = rv.get_json()["upload_id"]
+
+    rv = client.post(
+        f"/uploads/{upload_id}/chunk",
+        data=b"tail",
+        headers={"X-Chunk-Index": "1", "X-Chunk-Offset": "4"},
+    )
+    assert rv.status_code == 204
+
+    rv = client.post(f"/uploads/{upload_id}/complete")
+    assert rv.status_code == 400
+
+
+def _write_chunk(upload_dir, idx, offset, data):
+    """What upload_chunk does for an offset chunk, minus the request."""
+    data_path = upload_dir / backend_skeleton.UPLOAD_DATA_NAME
+    length = backend_skeleton._write_stream_at(data_path, io.BytesIO(data), offset)
+    backend_skeleton._record_chunk(upload_dir, idx, offset, length)
+
+
+def test_resumable_offset_chunks_from_separate_processes(client):
+    # gunicorn workers share the upload directory but no in-process lock
+    rv = client.post("/uploads", json={"filename": "workers.wav"})
+    upload_id = rv.get_json()["upload_id"]
+    upload_dir = backend_skeleton.UPLOADS_DIR / upload_id
+
+    chunks = [bytes([65 + i]) * (i + 1) for i in range(8)]
+    offsets = [sum(len(c) for c in chunks[:i]) for i in range(len(chunks))]
+    workers = [
+        multiprocessing.Process(
+            target=_write_chunk, args=(upload_dir, i, offsets[i], chunks[i])
+        )
+        for i in range(len(chunks))
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+        assert w.exitcode == 0
+
+    rv = client.post(f"/uploads/{upload_id}/complete")
+    assert rv.status_code == 201
+    file_id = rv.get_json()["file_id"]
+
+    rv = client.get(f"/download/{file_id}")
+    assert rv.status_code == 200
+    assert rv.data == b"".join(chunks)
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sf = pytest.importorskip("soundfile")
+
+# server/scripts are standalone scripts, not a package
+SCRIPTS = Path(__file__).resolve().parents[2] / "server" / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import align_transcripts as at
+
+
+@pytest.fixture(autouse=True)
+def no_external_aligner(monkeypatch):
+    # None in sys.modules makes the import fail, forcing the fallback
+    monkeypatch.setitem(sys.modules, "whisper_timestamped", None)
+
+
+def test_align_one_skips_missing_transcript():
+    file_id, aln, skipped = at._align_one({"id": "x", "transcript": "  "})
+    assert (file_id, aln) == ("x", None)
+    assert skipped == "Skipping x: no transcript"
+
+
+def test_align_one_uses_manifest_duration():
+    text = "Hello there. How are you today?"
+    file_id, aln, skipped = at._align_one(
+        {"id": "x", "transcript": text, "duration": 4.0}
+    )
+    assert file_id == "x" and skipped is None
+    assert aln == at.approx_align(text, 4.0)
+    segs = aln["segments"]
+    assert [s["text"] for s in segs] == ["Hello there.", "How are you today?"]
+    assert segs[0]["start"] == 0.0 and segs[-1]["end"] == 4.0
+    assert [w["word"] for w in segs[1]["words"]] == ["How", "are", "you", "today?"]
+
+
+def test_align_one_reads_duration_from_processed_wav(tmp_path, monkeypatch):
+    monkeypatch.setattr(at, "ROOT", tmp_path)
+    processed = tmp_path / "data" / "processed"
+    processed.mkdir(parents=True)
+    sf.write(str(processed / "x.wav"), np.zeros(8000, dtype="float32"), 16000)
+
+    _, aln, skipped = at._align_one({"id": "x", "transcript": "one two"})
+    assert skipped is None
+    assert aln["segments"][0]["end"] == 0.5
+
+    _, aln, skipped = at._align_one({"id": "y", "transcript": "one two"})
+    assert aln is None
+    assert skipped == "No duration for y; cannot align. Skipping."
@@ -0,0 +1,132 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("torch")
+
+# server/scripts are standalone scripts, not a package
+SCRIPTS = Path(__file__).resolve().parents[2] / "server" / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import convert_transformers_to_whisper as conv
+
+
+def _parts(name):
+    return name.split(".")
+
+
+def _longest_suffix_match(shapes, r, r_shape, lengths=(4, 3, 2)):
+    """Brute force: first name (in order) with the longest shared suffix."""
+    rparts = _parts(r)
+    for n in lengths:
+        if len(rparts) < n:
+            continue
+        for t, shape in shapes.items():
+            tparts = _parts(t)
+            if shape == r_shape and len(tparts) >= n and tparts[-n:] == rparts[-n:]:
+                return t
+    return None
+
+
+def test_suffix_index_prefers_longest_suffix_with_same_shape():
+    shapes = {
+        "model.encoder.x.attn.k.weight": (4, 4),
+        "model.decoder.blocks.0.attn.k.weight": (4, 4),
+        "model.decoder.blocks.0.attn.q.weight": (8, 4),
+    }
+    idx = conv._SuffixShapeIndex(shapes, shapes.__getitem__, _parts)
+
+    assert idx.find((4, 4), _parts("decoder.blocks.0.attn.k.weight")) == (
+        "model.decoder.blocks.0.attn.k.weight"
+    )
+    # a matching suffix with the wrong shape is not a candidate
+    assert idx.find((4, 4), _parts("attn.q.weight")) is None
+    assert idx.find((8, 4), _parts("y.attn.q.weight")) == (
+        "model.decoder.blocks.0.attn.q.weight"
+    )
+    # one-token names have no suffix to match on
+    assert idx.find((4, 4), ["weight"]) is None
+
+
+def test_suffix_index_remove_falls_back_to_next_candidate():
+    shapes = {"a.attn.k.weight": (2,), "b.attn.k.weight": (2,)}
+    idx = conv._SuffixShapeIndex(shapes, shapes.__getitem__, _parts)
+    toks = _parts("c.attn.k.weight")
+    assert idx.find((2,), toks) == "a.attn.k.weight"
+    idx.remove("a.attn.k.weight")
+    assert idx.find((2,), toks) == "b.attn.k.weight"
+    idx.remove("b.attn.k.weight")
+    idx.remove("never.indexed")
+    assert idx.find((2,), toks) is None
+
+
+def test_suffix_index_matches_brute_force_scan():
+    rng = random.Random(0)
+    tokens = ["enc", "dec", "blocks", "0", "1", "attn", "mlp", "k", "q", "weight", "bias"]
+    for _ in range(200):
+        shapes = {}
+        for _ in range(rng.randint(1, 15)):
+            name = ".".join(rng.choice(tokens) for _ in range(rng.randint(1, 6)))
+            shapes.setdefault(name, (rng.randint(1, 2),))
+        idx = conv._SuffixShapeIndex(shapes, shapes.__getitem__, _parts)
+        for _ in range(10):
+            r = ".".join(rng.choice(tokens) for _ in range(rng.randint(1, 6)))
+            shape = (rng.randint(1, 2),)
+            assert idx.find(shape, _parts(r)) == _longest_suffix_match(
+                shapes, r, shape
+            ), (r, shapes)
+
+
+def _sequential_canonical(name):
+    """The str.replace chain _TRANSFORMER_NAME_RE replaced."""
+    for a, b in conv.TRANSFORMER_NAME_SUBS:
+        name = name.replace(a, b)
+    return name
+
+
+def _hf_whisper_names(layers=2):
+    names = [
+        "encoder.conv1.weight",
+        "encoder.conv2.bias",
+        "encoder.embed_positions.weight",
+        "encoder.layer_norm.weight",
+        "decoder.embed_tokens.weight",
+        "decoder.embed_positions.weight",
+        "decoder.layer_norm.bias",
+    ]
+    for side in ("encoder", "decoder"):
+        for i in range(layers):
+            pre = f"{side}.layers.{i}."
+            blocks = ["self_attn"] + (["encoder_attn"] if side == "decoder" else [])
+            for attn in blocks:
+                for proj in ("k_proj", "q_proj", "v_proj", "out_proj"):
+                    names.append(f"{pre}{attn}.{proj}.weight")
+                names.append(f"{pre}{attn}_layer_norm.weight")
+            for tail in ("fc1.weight", "fc2.bias", "final_layer_norm.weight"):
+                names.append(pre + tail)
+    return names
+
+
+def test_canonical_regex_matches_sequential_replaces():
+    for name in _hf_whisper_names():
+        got = conv._TRANSFORMER_NAME_RE.sub(conv._transformer_name_sub, name)
+        assert got == _sequential_canonical(name), name
+
+    assert conv._TRANSFORMER_NAME_RE.sub(
+        conv._transformer_name_sub, "decoder.layers.1.encoder_attn_layer_norm.weight"
+    ) == "decoder.blocks.1.cross_attn_ln.weight"
+    assert conv._TRANSFORMER_NAME_RE.sub(
+        conv._transformer_name_sub, "encoder.ln_post.bias"
+    ) == "encoder.final_layer_norm.bias"
+
+
+def test_canonical_regex_matches_sequential_replaces_on_joined_patterns():
+    rng = random.Random(0)
+    pieces = [a for a, _ in conv.TRANSFORMER_NAME_SUBS] + ["0.", "weight", "x."]
+    for _ in range(500):
+        name = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 5)))
+        got = conv._TRANSFORMER_NAME_RE.sub(conv._transformer_name_sub, name)
+        assert got == _sequential_canonical(name), name
@@ -0,0 +1,116 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# server/scripts are standalone scripts, not a package
+SCRIPTS = Path(__file__).resolve().parents[2] / "server" / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import dataset_inventory as inv
+
+
+def _touch(directory, *names):
+    for name in names:
+        (directory / name).write_text("x", encoding="utf-8")
+
+
+@pytest.mark.parametrize("listed", [False, True])
+def test_find_transcript_prefers_exact_names_in_order(tmp_path, listed):
+    _touch(tmp_path, "song.wav", "song.json", "song.norm.txt", "song.txt")
+    audio = tmp_path / "song.wav"
+    names = set(os.listdir(tmp_path)) if listed else None
+    assert inv.find_transcript_for_audio(audio, names) == tmp_path / "song.txt"
+    (tmp_path / "song.txt").unlink()
+    names = set(os.listdir(tmp_path)) if listed else None
+    assert inv.find_transcript_for_audio(audio, names) == tmp_path / "song.norm.txt"
+
+
+def test_find_transcript_falls_back_to_sibling_with_stem(tmp_path):
+    _touch(tmp_path, "song.wav", "song_v2.TXT", "song_a.json", "song.lrc", "other.txt")
+    audio = tmp_path / "song.wav"
+    names = set(os.listdir(tmp_path))
+    # siblings are tried in sorted order, case-insensitively by extension
+    assert inv.find_transcript_for_audio(audio, names) == tmp_path / "song_a.json"
+    assert inv.find_transcript_for_audio(audio) == tmp_path / "song_a.json"
+
+
+def test_find_transcript_uses_only_the_given_listing(tmp_path):
+    _touch(tmp_path, "song.wav", "song.txt")
+    audio = tmp_path / "song.wav"
+    # a caller-supplied listing is trusted; nothing is stat'ed
+    assert inv.find_transcript_for_audio(audio, {"song.wav"}) is None
+    assert inv.find_transcript_for_audio(audio, {"song.wav", "song.txt"}) == (
+        tmp_path / "song.txt"
+    )
+    assert inv.find_transcript_for_audio(tmp_path / "missing" / "a.wav") is None
+
+
+def _old_guess_language(text):
+    """The sequential keyword checks _LANG_RE replaced."""
+    text = text.lower()
+    if any(w in text for w in ["hvala", "molim", "dobar", "dobro"]):
+        return "bs/cs/hr-south"
+    if "ђ" in text:
+        return "sr-cyrillic"
+    return None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "hello world",
+        "Hvala lijepa",
+        "ђак па DOBRO",
+        "Ђорђе",
+        "ђ first, molim later",
+        "dobrodošli (substring of dobro)",
+    ],
+)
+def test_guess_language_matches_sequential_checks(tmp_path, text):
+    p = tmp_path / "t.txt"
+    p.write_text(text, encoding="utf-8")
+    assert inv.guess_language_from_transcript(p) == _old_guess_language(text)
+
+
+def test_guess_language_unreadable_file(tmp_path):
+    assert inv.guess_language_from_transcript(tmp_path / "missing.txt") is None
+
+
+@pytest.mark.parametrize("rate, frames", [(8000, 1), (44100, 44100 * 3 + 17), (96000, 12345)])
+def test_flac_duration_matches_soundfile(tmp_path, rate, frames):
+    sf = pytest.importorskip("soundfile")
+    np = pytest.importorskip("numpy")
+    p = tmp_path / "a.flac"
+    sf.write(str(p), np.zeros((frames, 2), dtype="float32"), rate, format="FLAC")
+    info = sf.info(str(p))
+    assert inv._flac_duration_from_header(p) == pytest.approx(info.frames / info.samplerate)
+    assert inv.get_duration_seconds(p) == pytest.approx(info.frames / info.samplerate)
+
+
+def test_flac_duration_rejects_unknown_or_foreign_headers(tmp_path):
+    sf = pytest.importorskip("soundfile")
+    np = pytest.importorskip("numpy")
+    p = tmp_path / "a.flac"
+    sf.write(str(p), np.zeros(1000, dtype="float32"), 16000, format="FLAC")
+    raw = bytearray(p.read_bytes())
+
+    # total samples 0 means "unknown" in STREAMINFO
+    unknown = bytearray(raw)
+    unknown[21] &= 0xF0
+    unknown[22:26] = b"\x00\x00\x00\x00"
+    (tmp_path / "unknown.flac").write_bytes(unknown)
+    assert inv._flac_duration_from_header(tmp_path / "unknown.flac") is None
+
+    # the first metadata block must be STREAMINFO (type 0)
+    other = bytearray(raw)
+    other[4] = (other[4] & 0x80) | 4
+    (tmp_path / "other.flac").write_bytes(other)
+    assert inv._flac_duration_from_header(tmp_path / "other.flac") is None
+
+    (tmp_path / "short.flac").write_bytes(raw[:20])
+    assert inv._flac_duration_from_header(tmp_path / "short.flac") is None
+    assert inv._flac_duration_from_header(tmp_path / "missing.flac") is None
@@ -0,0 +1,79 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# server/scripts are standalone scripts, not a package
+SCRIPTS = Path(__file__).resolve().parents[2] / "server" / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import download_whisper_model as dwm
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    src = tmp_path / "snapshot"
+    blobs = tmp_path / "blobs"
+    _write(src / "config.json", "{}")
+    _write(src / "vocab.json", "root-vocab")
+    _write(src / "tokenizer.model", "root-spm")
+    _write(src / "tokenizer" / "tokenizer.model", "nested-spm")
+    _write(src / ".git" / "merges.txt", "git-merges")
+    _write(src / "tokenizer" / "vocab.json", "nested-vocab")
+    _write(src / "tokenizer" / "deeper" / "merges.txt", "nested-merges")
+    # HF snapshot files are symlinks into the blob cache
+    _write(blobs / "abc123", "blob-tokenizer")
+    os.symlink(blobs / "abc123", src / "tokenizer" / "tokenizer.json")
+    return src
+
+
+def test_copy_tree_copies_everything_and_finds_tokenizers(tmp_path, snapshot):
+    dst = tmp_path / "dest"
+    found = dwm._copy_tree(snapshot, dst, dwm.TOKENIZER_CANDIDATES)
+
+    copied = sorted(
+        p.relative_to(dst).as_posix() for p in dst.rglob("*") if p.is_file()
+    )
+    assert copied == [
+        ".git/merges.txt",
+        "config.json",
+        "tokenizer.model",
+        "tokenizer/deeper/merges.txt",
+        "tokenizer/tokenizer.json",
+        "tokenizer/tokenizer.model",
+        "tokenizer/vocab.json",
+        "vocab.json",
+    ]
+    # symlinks are followed into regular files
+    link = dst / "tokenizer" / "tokenizer.json"
+    assert not link.is_symlink()
+    assert link.read_text(encoding="utf-8") == "blob-tokenizer"
+
+    # root files win over nested ones, and .git* directories are skipped
+    assert found == {
+        "vocab.json": dst / "vocab.json",
+        "tokenizer.model": dst / "tokenizer.model",
+        "tokenizer.json": dst / "tokenizer" / "tokenizer.json",
+        "merges.txt": dst / "tokenizer" / "deeper" / "merges.txt",
+    }
+
+
+def test_hf_downloader_lifts_nested_tokenizers_to_root(tmp_path, snapshot, monkeypatch):
+    hub = type(sys)("huggingface_hub")
+    hub.snapshot_download = lambda repo_id: str(snapshot)
+    monkeypatch.setitem(sys.modules, "huggingface_hub", hub)
+
+    dest = tmp_path / "models" / "openai_whisper-tiny"
+    assert dwm.hf_downloader_factory()("openai/whisper-tiny", dest)
+
+    assert (dest / "tokenizer.json").read_text(encoding="utf-8") == "blob-tokenizer"
+    assert (dest / "merges.txt").read_text(encoding="utf-8") == "nested-merges"
+    # an existing root copy is not replaced by a nested one
+    assert (dest / "tokenizer.model").read_text(encoding="utf-8") == "root-spm"
@@ -0,0 +1,88 @@
+import csv
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# server/scripts are standalone scripts, not a package
+SCRIPTS = Path(__file__).resolve().parents[2] / "server" / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import generate_dataset_inventory as gdi
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.setattr(gdi, "ROOT", tmp_path)
+    monkeypatch.setattr(gdi, "UPLOADS", tmp_path / "uploads")
+    monkeypatch.setattr(gdi, "OUTPUTS", tmp_path / "outputs")
+    monkeypatch.setattr(gdi, "MANIFESTS", tmp_path / "manifests")
+    monkeypatch.setattr(gdi, "FFPROBE_AVAILABLE", False)
+    monkeypatch.setattr(gdi, "av", None)
+    uploads = tmp_path / "uploads"
+    uploads.mkdir()
+    (uploads / "a.wav").write_bytes(b"aaaa")
+    (uploads / "b.wav").write_bytes(b"bbbb")
+    return tmp_path
+
+
+def _hashes(root):
+    with open(root / "manifests" / "dataset_inventory.csv", encoding="utf-8") as f:
+        return {row["filename"]: row["content_hash"] for row in csv.DictReader(f)}
+
+
+def _db(root):
+    return sqlite3.connect(str(root / "manifests" / "hash_cache.sqlite"))
+
+
+def test_hash_cache_hit_and_miss(tree):
+    gdi.main()
+    first = _hashes(tree)
+    assert first["a.wav"] == gdi.file_digest(tree / "uploads" / "a.wav")
+    with _db(tree) as conn:
+        rows = conn.execute("SELECT path, algo FROM h ORDER BY path").fetchall()
+    assert rows == [
+        (str(tree / "uploads" / "a.wav"), gdi.HASH_ALGO),
+        (str(tree / "uploads" / "b.wav"), gdi.HASH_ALGO),
+    ]
+
+    # plant a marker: a hit returns the cached value without re-hashing
+    with _db(tree) as conn:
+        conn.execute("UPDATE h SET sha = 'cached'")
+    gdi.main()
+    assert _hashes(tree) == {"a.wav": "cached", "b.wav": "cached"}
+
+    # a size or mtime change is a miss and refreshes the row
+    a = tree / "uploads" / "a.wav"
+    a.write_bytes(b"changed")
+    st = a.stat()
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    gdi.main()
+    second = _hashes(tree)
+    assert second["a.wav"] == gdi.file_digest(a) != first["a.wav"]
+    assert second["b.wav"] == "cached"
+    with _db(tree) as conn:
+        (sha,) = conn.execute("SELECT sha FROM h WHERE path = ?", (str(a),)).fetchone()
+    assert sha == second["a.wav"]
+
+
+def test_hash_cache_ignores_rows_from_another_algorithm(tree):
+    gdi.ensure_manifests_dir()
+    conn, _ = gdi.open_hash_cache()
+    b = tree / "uploads" / "b.wav"
+    st = b.stat()
+    with conn:
+        conn.execute(
+            "INSERT INTO h VALUES (?, ?, ?, ?, ?)",
+            (str(b), st.st_mtime_ns, st.st_size, "other-algo", "stale"),
+        )
+    conn.close()
+    conn, cache = gdi.open_hash_cache()
+    conn.close()
+    assert str(b) not in cache
+
+    gdi.main()
+    assert _hashes(tree)["b.wav"] == gdi.file_digest(b)
@@ -33,3 +33,30 @@ def test_models_endpoints():
 
     r3 = client.get("/models/missing")
     assert r3.status_code == 404
+
+
+def test_models_list_rebuilt_when_config_replaced():
+    app = create_app()
+    app.config["MODELS"] = {"first": {"file_types": {"wav"}}}
+    client = app.test_client()
+
+    assert list(client.get("/models").get_json()["models"]) == ["first"]
+
+    app.config["MODELS"] = {"second": {"available_models": ("base",)}}
+    data = client.get("/models").get_json()
+    assert list(data["models"]) == ["second"]
+    assert data["models"]["second"]["available_models"] == ["base"]
+
+
+def test_model_info_rebuilt_when_config_replaced():
+    app = create_app()
+    app.config["MODELS"] = {"first": {"file_types": {"wav"}}}
+    client = app.test_client()
+
+    data = client.get("/models/first").get_json()
+    assert data["config"]["file_types"] == ["wav"]
+    assert data["config"]["available_models"] == []
+
+    app.config["MODELS"] = {"second": {}}
+    assert client.get("/models/first").status_code == 404
+    assert client.get("/models/second").status_code == 200
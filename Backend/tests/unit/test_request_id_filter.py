@@ -0,0 +1,88 @@
+import logging
+import sys
+import threading
+from pathlib import Path
+
+from flask import Flask, jsonify
+
+# Ensure Backend is importable
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from server import logging_utils
+from server.logging_utils import RequestIDFilter, add_request_id_hooks
+
+
+def _record(**extra):
+    record = logging.LogRecord("t", logging.INFO, "", 0, "msg", (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_filter_reads_request_id_inside_request():
+    app = Flask(__name__)
+    add_request_id_hooks(app)
+    seen = {}
+
+    @app.route("/")
+    def index():
+        record = _record(request_id="stale")
+        RequestIDFilter().filter(record)
+        seen["id"] = record.request_id
+        return jsonify({})
+
+    rv = app.test_client().get("/", headers={"X-Request-ID": "req-1"})
+    assert rv.headers["X-Request-ID"] == "req-1"
+    # the ContextVar wins over an explicit extra inside a request
+    assert seen["id"] == "req-1"
+    # teardown resets the ContextVar
+    assert logging_utils._REQ_ID.get() == ""
+
+
+def test_filter_outside_request_keeps_explicit_extra():
+    record = _record(request_id="startup")
+    assert RequestIDFilter().filter(record) is True
+    assert record.request_id == "startup"
+
+    record = _record()
+    RequestIDFilter().filter(record)
+    assert record.request_id == ""
+
+
+def test_request_id_is_per_thread():
+    token = logging_utils._REQ_ID.set("main")
+    try:
+        seen = []
+        worker = threading.Thread(
+            target=lambda: seen.append(logging_utils._REQ_ID.get())
+        )
+        worker.start()
+        worker.join()
+        assert seen == [""]
+        assert logging_utils._REQ_ID.get() == "main"
+    finally:
+        logging_utils._REQ_ID.reset(token)
+
+
+def test_setup_app_logging_keeps_console_output(tmp_path, capsys, monkeypatch):
+    from flask.logging import default_handler
+
+    root = logging.getLogger()
+    # start from an unconfigured root like a real process (pytest adds its
+    # own capture handlers, which would also suppress Flask's)
+    monkeypatch.setattr(root, "handlers", [])
+    app = Flask(__name__)
+    try:
+        logging_utils.setup_app_logging(app, log_dir=str(tmp_path))
+        assert default_handler in app.logger.handlers
+        app.logger.warning("to the console")
+        assert "to the console" in capsys.readouterr().err
+        # and still to the file, once, through the root handlers
+        for h in root.handlers:
+            h.flush()
+        text = (tmp_path / "app.log").read_text(encoding="utf-8")
+        assert text.count("to the console") == 1
+    finally:
+        for h in root.handlers:
+            h.close()
@@ -0,0 +1,59 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure Backend is importable
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from server import backend_skeleton as bs
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # a private database, so the rows below are the only ones listed
+    monkeypatch.setattr(bs, "DB_PATH", tmp_path / "songs.db")
+    monkeypatch.setattr(bs._db_local, "conn", None, raising=False)
+    bs.init_db()
+    bs.app.config["TESTING"] = True
+    with bs.app.test_client() as c:
+        yield c
+    bs._db_local.conn.close()
+
+
+def test_songs_splices_stored_metadata(client):
+    rows = [
+        ("a", "Pjesma", "Đorđe", "a.wav", 1.5, {"lyrics": "hvala \"ti\"", "n": [1, {"x": None}]}),
+        ("b", None, None, "b.mp3", None, {}),
+        ("c", "No meta", "x", "c.wav", None, None),
+    ]
+    conn = bs.get_db()
+    for id_, title, artist, filename, duration, meta in rows:
+        conn.execute(
+            bs.INSERT_SONG_SQL,
+            (
+                id_, title, artist, filename, duration,
+                None if meta is None else json.dumps(meta), 1.0,
+            ),
+        )
+
+    rv = client.get("/songs")
+    assert rv.status_code == 200
+    assert rv.mimetype == "application/json"
+    songs = {s["id"]: s for s in json.loads(rv.get_data(as_text=True))["songs"]}
+
+    assert sorted(songs) == ["a", "b", "c"]
+    for id_, title, artist, filename, duration, meta in rows:
+        # same objects GET /songs/<id> returns
+        assert songs[id_] == client.get(f"/songs/{id_}").get_json()
+        assert songs[id_]["metadata"] == (meta or {})
+        assert songs[id_]["url"] == f"/download/{id_}"
+        assert songs[id_]["artist"] == artist
+
+
+def test_songs_empty_list(client):
+    rv = client.get("/songs")
+    assert json.loads(rv.get_data(as_text=True)) == {"songs": []}
@@ -0,0 +1,79 @@
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sf = pytest.importorskip("soundfile")
+
+# server/scripts are standalone scripts, not a package
+SCRIPTS = Path(__file__).resolve().parents[2] / "server" / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from wav_header import read_wav_info, wav_duration
+
+
+def _write(path, subtype, fmt="WAV", frames=1234, channels=2, rate=22050):
+    data = np.random.default_rng(0).uniform(-0.5, 0.5, (frames, channels))
+    sf.write(str(path), data, rate, subtype=subtype, format=fmt)
+    return path
+
+
+def _assert_matches_soundfile(path):
+    info = read_wav_info(path)
+    ref = sf.info(str(path))
+    assert info is not None
+    assert info.samplerate == ref.samplerate
+    assert info.channels == ref.channels
+    assert info.frames == ref.frames
+    assert info.subtype == ref.subtype
+    assert wav_duration(path) == pytest.approx(ref.frames / ref.samplerate)
+
+
+@pytest.mark.parametrize(
+    "subtype", ["PCM_U8", "PCM_16", "PCM_24", "PCM_32", "FLOAT", "DOUBLE"]
+)
+def test_matches_soundfile(tmp_path, subtype):
+    _assert_matches_soundfile(_write(tmp_path / "a.wav", subtype))
+
+
+@pytest.mark.parametrize("subtype", ["PCM_16", "FLOAT"])
+def test_extensible_matches_soundfile(tmp_path, subtype):
+    path = _write(tmp_path / "a.wav", subtype, fmt="WAVEX", channels=3)
+    with open(path, "rb") as f:
+        assert struct.unpack("<H", f.read(22)[20:22])[0] == 0xFFFE
+    _assert_matches_soundfile(path)
+
+
+def test_skips_chunks_before_data(tmp_path):
+    path = _write(tmp_path / "a.wav", "PCM_16", channels=1)
+    raw = path.read_bytes()
+    data_at = raw.index(b"data")
+    # odd-sized LIST chunk, padded to a word boundary
+    extra = b"LIST" + struct.pack("<I", 5) + b"INFOx\x00"
+    body = raw[12:data_at] + extra + raw[data_at:]
+    path.write_bytes(b"RIFF" + struct.pack("<I", 4 + len(body)) + b"WAVE" + body)
+    _assert_matches_soundfile(path)
+
+
+def test_truncated_data_counts_whole_frames_present(tmp_path):
+    path = _write(tmp_path / "a.wav", "PCM_16", frames=1000, channels=2)
+    raw = path.read_bytes()
+    path.write_bytes(raw[:-401])
+    info = read_wav_info(path)
+    assert info is not None
+    assert info.frames == (1000 * 4 - 401) // 4
+
+
+def test_unsupported_returns_none(tmp_path):
+    flac = _write(tmp_path / "a.flac", "PCM_16", fmt="FLAC")
+    adpcm = _write(tmp_path / "b.wav", "IMA_ADPCM", channels=1)
+    empty = tmp_path / "c.wav"
+    empty.write_bytes(b"")
+    assert read_wav_info(flac) is None
+    assert read_wav_info(adpcm) is None
+    assert read_wav_info(empty) is None
+    assert read_wav_info(tmp_path / "missing.wav") is None
+    assert wav_duration(adpcm) is None
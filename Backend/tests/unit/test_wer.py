@@ -0,0 +1,62 @@
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# server/scripts are standalone scripts, not a package
+SCRIPTS = Path(__file__).resolve().parents[2] / "server" / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import compare_transformers_vs_whisper as cmp
+
+
+def _reference_distance(r, h):
+    """The full-matrix DP wer() used before it was vectorized."""
+    d = np.zeros((len(r) + 1, len(h) + 1), dtype=int)
+    for i in range(len(r) + 1):
+        d[i, 0] = i
+    for j in range(len(h) + 1):
+        d[0, j] = j
+    for i in range(1, len(r) + 1):
+        for j in range(1, len(h) + 1):
+            if r[i - 1] == h[j - 1]:
+                d[i, j] = d[i - 1, j - 1]
+            else:
+                d[i, j] = min(d[i - 1, j - 1], d[i, j - 1], d[i - 1, j]) + 1
+    return int(d[len(r), len(h)])
+
+
+@pytest.mark.parametrize(
+    "r, h",
+    [
+        ([], []),
+        ([], ["a"]),
+        (["a", "b"], []),
+        (["a", "b", "c"], ["a", "b", "c"]),
+        (["a", "b", "c"], ["c", "b", "a"]),
+        (["the", "cat", "sat"], ["the", "the", "cat", "sat", "down"]),
+    ],
+)
+def test_edit_distance_edge_cases(r, h):
+    assert cmp._edit_distance(r, h) == _reference_distance(r, h)
+
+
+def test_edit_distance_matches_reference_dp():
+    rng = random.Random(0)
+    vocab = ["a", "b", "c", "d", "hello", "world"]
+    for _ in range(300):
+        r = [rng.choice(vocab) for _ in range(rng.randint(0, 12))]
+        h = [rng.choice(vocab) for _ in range(rng.randint(0, 12))]
+        assert cmp._edit_distance(r, h) == _reference_distance(r, h), (r, h)
+
+
+def test_wer_normalizes_case_and_empty_reference(monkeypatch):
+    # exercise the NumPy path even when rapidfuzz is installed
+    monkeypatch.setattr(cmp, "Levenshtein", None)
+    assert cmp.wer("Hello World", "hello world") == 0.0
+    assert cmp.wer("a b c d", "a x c") == 0.5
+    assert cmp.wer("", "") == 0.0
+    assert cmp.wer("", "extra") == 1.0
@@ -0,0 +1,160 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# youtube_downloader lives in Backend/scripts and is imported top-level
+SCRIPTS = Path(__file__).resolve().parents[2] / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import youtube_downloader as ytd
+
+
+@pytest.fixture(autouse=True)
+def clear_info_cache():
+    ytd._info_cache.clear()
+    yield
+    ytd._info_cache.clear()
+
+
+def test_info_cache_expires_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ytd.time, "time", lambda: now[0])
+    ytd._cache_put_info("u", {"title": "t"})
+    now[0] += ytd.INFO_CACHE_TTL - 1
+    assert ytd._cache_get_info("u") == {"title": "t"}
+    now[0] += 1
+    assert ytd._cache_get_info("u") is None
+    assert "u" not in ytd._info_cache
+
+
+def test_info_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(ytd, "INFO_CACHE_MAXSIZE", 2)
+    ytd._cache_put_info("a", {"title": "a"})
+    ytd._cache_put_info("b", {"title": "b"})
+    ytd._cache_get_info("a")  # refresh a, so b is the oldest
+    ytd._cache_put_info("c", {"title": "c"})
+    assert list(ytd._info_cache) == ["a", "c"]
+
+
+def test_probe_info_fetches_once_per_url(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_extract(self, url):
+        calls.append(url)
+        return {"title": "Song", "duration": 12}
+
+    monkeypatch.setattr(ytd.YouTubeDownloader, "_extract_info", fake_extract)
+    downloader = ytd.YouTubeDownloader(str(tmp_path))
+    first = downloader.get_video_info("https://y/1")
+    second = ytd.YouTubeDownloader(str(tmp_path)).get_video_info("https://y/1")
+    assert first == second
+    assert first["title"] == "Song"
+    assert calls == ["https://y/1"]
+
+
+class _DownloadError(Exception):
+    pass
+
+
+class _FakeYoutubeDL:
+    """Stands in for yt_dlp.YoutubeDL; writes one file per extracted URL."""
+
+    sessions = []
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.urls = []
+        _FakeYoutubeDL.sessions.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False):
+        self.urls.append(url)
+        if "bad" in url:
+            raise _DownloadError("ERROR: HTTP Error 403: Forbidden")
+        title = url.rsplit("/", 1)[-1]
+        path = Path(self.opts["outtmpl"]).parent / f"{title}.mp3"
+        if download:
+            path.write_bytes(b"x")
+        return {"title": title, "requested_downloads": [{"filepath": str(path)}]}
+
+
+@pytest.fixture
+def fake_yt_dlp(monkeypatch):
+    _FakeYoutubeDL.sessions = []
+    fake = type(sys)("yt_dlp")
+    fake.YoutubeDL = _FakeYoutubeDL
+    fake.utils = type(sys)("yt_dlp.utils")
+    fake.utils.DownloadError = _DownloadError
+    monkeypatch.setattr(ytd, "yt_dlp", fake)
+    return fake
+
+
+def test_download_many_reuses_one_session(tmp_path, fake_yt_dlp):
+    urls = ["https://y/one", "https://y/bad", "https://y/two"]
+    results = ytd.YouTubeDownloader(str(tmp_path)).download_many(urls)
+
+    assert len(_FakeYoutubeDL.sessions) == 1
+    assert _FakeYoutubeDL.sessions[0].urls == urls
+    assert [r["success"] for r in results] == [True, False, True]
+    assert [r.get("title") for r in results] == ["one", None, "two"]
+    assert "403" in results[1]["error"]
+    # successful extractions seed the metadata cache
+    assert ytd._cache_get_info("https://y/two")["title"] == "two"
+    assert ytd.YouTubeDownloader(str(tmp_path)).download_many([]) == []
+
+
+def test_download_many_cli_fallback_parses_printed_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(ytd, "yt_dlp", None)
+    (tmp_path / "one.mp3").write_bytes(b"x")
+    seen = {}
+
+    def fake_run(cmd, timeout, stdout_lines=None):
+        seen["cmd"] = cmd
+        stdout_lines.append(f"one\t{tmp_path / 'one.mp3'}\n")
+        return 1, "ERROR: unavailable"
+
+    monkeypatch.setattr(ytd, "_run_streaming", fake_run)
+    urls = ["https://y/one", "https://y/two"]
+    results = ytd.YouTubeDownloader(str(tmp_path)).download_many(urls)
+
+    assert all(url in seen["cmd"] for url in urls)
+    assert results[0]["success"] and results[0]["filename"] == "one.mp3"
+    assert results[1] == {
+        "success": False,
+        "error": "Download failed: ERROR: unavailable",
+    }
+
+
+def test_download_parallel_keeps_input_order(tmp_path, monkeypatch):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_download(self, url, format_type="mp3", quality="high"):
+        with lock:
+            active.append(url)
+            peak.append(len(active))
+        # later URLs finish first
+        time.sleep(0.05 * (3 - int(url[-1])))
+        with lock:
+            active.remove(url)
+        return {"success": True, "title": url, "format": format_type}
+
+    monkeypatch.setattr(ytd.YouTubeDownloader, "download", fake_download)
+    urls = ["https://y/0", "https://y/1", "https://y/2"]
+    downloader = ytd.YouTubeDownloader(str(tmp_path))
+    results = downloader.download_parallel(urls, "wav", max_workers=3)
+
+    assert [r["title"] for r in results] == urls
+    assert all(r["format"] == "wav" for r in results)
+    assert max(peak) > 1
+    assert downloader.download_parallel([]) == []